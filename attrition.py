@@ -0,0 +1,275 @@
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# naikkan kalau fitur / model berubah supaya model lama di disk tidak dipakai
+MODEL_FORMAT = 1
+NUMERIC_FEATURES = ["TenureYears", "PayRate", "PerformanceScore", "EngagementSurvey", "EmpSatisfaction",
+                    "SpecialProjectsCount"]
+CATEGORICAL_FEATURES = ["Department", "ManagerName"]
+# training dibatasi sejumlah baris (sampel acak) supaya waktu training tetap terkendali
+MAX_TRAIN_ROWS = 200_000
+HIGH_RISK = 0.5
+RISK_COLUMN = "AttritionRisk"
+
+
+# ===============================
+# FEATURES & LABEL
+# ===============================
+def feature_frame(df):
+    features = pd.DataFrame(index=df.index)
+    for col in NUMERIC_FEATURES:
+        values = df[col] if col in df.columns else pd.Series(np.nan, index=df.index)
+        features[col] = pd.to_numeric(values, errors="coerce").astype("float64")
+    for col in CATEGORICAL_FEATURES:
+        values = df[col] if col in df.columns else pd.Series("", index=df.index)
+        features[col] = values.astype(object).where(values.notna(), "")
+    return features
+
+
+# label historis: karyawan yang sudah keluar (punya tanggal terminasi)
+def attrition_label(df):
+    return df["DateofTermination"].notna().to_numpy(dtype="int8")
+
+
+# karyawan yang masih bekerja = yang di-skor
+def current_mask(df):
+    return df["DateofTermination"].isna().to_numpy()
+
+
+# ===============================
+# TRAIN & SCORE
+# ===============================
+# one-hot (sparse) untuk department & manager, skala standar untuk fitur numerik,
+# lalu logistic regression: skor satu batch = satu perkalian matriks sparse
+def build_pipeline():
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline, make_pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    columns = ColumnTransformer([
+        ("numeric", make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), NUMERIC_FEATURES),
+        ("category", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES),
+    ])
+    return Pipeline([("features", columns), ("model", LogisticRegression(max_iter=1000, class_weight="balanced"))])
+
+
+def train(df, version=None, max_rows=MAX_TRAIN_ROWS, seed=0):
+    from sklearn.metrics import roc_auc_score
+    from sklearn.model_selection import train_test_split
+
+    start = time.perf_counter()
+    data = df[df["DateofHire"].notna()]
+    if len(data) > max_rows:
+        data = data.sample(max_rows, random_state=seed)
+    X, y = feature_frame(data), attrition_label(data)
+    if len(np.unique(y)) < 2:
+        raise ValueError("attrition model needs both terminated and current employees")
+
+    # AUC di data hold-out, lalu model final dilatih ulang di semua baris
+    stratify = y if np.bincount(y).min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=seed, stratify=stratify)
+    auc = None
+    if len(np.unique(y_train)) == 2 and len(np.unique(y_test)) == 2:
+        auc = roc_auc_score(y_test, build_pipeline().fit(X_train, y_train).predict_proba(X_test)[:, 1])
+    pipeline = build_pipeline().fit(X, y)
+    return {
+        "pipeline": pipeline,
+        "version": version,
+        "format": MODEL_FORMAT,
+        "trained_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "metrics": {
+            "rows": len(data),
+            "positive_rate": round(float(y.mean()), 4),
+            "auc": None if auc is None else round(float(auc), 4),
+            "seconds": round(time.perf_counter() - start, 3),
+        },
+    }
+
+
+# probabilitas keluar untuk setiap karyawan yang masih bekerja (satu batch),
+# Series sejajar dengan df; baris yang sudah keluar = NaN
+def score(model, df):
+    risk = np.full(len(df), np.nan)
+    mask = current_mask(df)
+    if mask.any():
+        risk[mask] = model["pipeline"].predict_proba(feature_frame(df[mask]))[:, 1]
+    return pd.Series(risk, index=df.index, name=RISK_COLUMN)
+
+
+# ringkasan risiko per department (karyawan yang di-skor saja)
+def department_risk(df, risk, high=HIGH_RISK):
+    scored = pd.DataFrame({"Department": df["Department"].astype(str), "Risk": risk}).dropna(subset=["Risk"])
+    summary = scored.groupby("Department", observed=True)["Risk"].agg(
+        Employees="size", AvgRisk="mean", HighRisk=lambda r: int((r >= high).sum()))
+    summary["HighRiskPct"] = summary["HighRisk"] / summary["Employees"] * 100
+    return summary.reset_index().sort_values("AvgRisk", ascending=False, ignore_index=True)
+
+
+# ===============================
+# PERSISTENCE
+# ===============================
+# satu file joblib per versi dataset, disimpan di folder cache yang sama dengan snapshot
+def model_path(model_dir, version):
+    return os.path.join(model_dir, f"attrition-{version}-v{MODEL_FORMAT}.joblib")
+
+
+def save_model(model, model_dir, version):
+    import joblib
+
+    os.makedirs(model_dir, exist_ok=True)
+    path = model_path(model_dir, version)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+    for other in glob.glob(os.path.join(model_dir, "attrition-*.joblib")):
+        if os.path.abspath(other) != os.path.abspath(path):
+            try:
+                os.remove(other)
+            except OSError:
+                pass
+    return path
+
+
+def load_model(model_dir, version):
+    path = model_path(model_dir, version)
+    if not os.path.exists(path):
+        return None
+    import joblib
+
+    try:
+        return joblib.load(path)
+    except Exception:
+        return None
+
+
+# ===============================
+# RISK MODELS
+# ===============================
+# model per versi dataset. get() tidak pernah melatih di request path: kalau model belum
+# ada (memori / disk), training dijalankan di thread latar dan get() mengembalikan None
+# sampai selesai. Skor satu versi dihitung sekali lalu dipakai semua session.
+class RiskModels:
+    def __init__(self, model_dir=None, retry_after=600):
+        self.model_dir = model_dir
+        self.retry_after = retry_after
+        self.model = None
+        self.scores = None
+        self.error = None
+        self._scored_version = None
+        # versi yang gagal dilatih tidak dicoba ulang tiap rerun, baru setelah retry_after detik
+        self._failed_version = None
+        self._failed_at = 0.0
+        self._training = set()
+        self._lock = threading.Lock()
+        self.stats = {"trained": 0, "loaded": 0, "score_seconds": 0.0}
+
+    def _ensure_model(self, version):
+        if self.model is not None and self.model["version"] == version:
+            return self.model
+        model = load_model(self.model_dir, version) if self.model_dir else None
+        if model is not None:
+            self.model = model
+            self.stats["loaded"] += 1
+        return model
+
+    def _train(self, df, version):
+        model, error = None, None
+        try:
+            model = train(df, version)
+            if self.model_dir:
+                save_model(model, self.model_dir, version)
+        except Exception as exc:
+            model, error = None, f"{version}: {exc}"
+        with self._lock:
+            if model is not None:
+                self.model = model
+                self.error = None
+                self._failed_version = None
+                self.stats["trained"] += 1
+            else:
+                self.error = error
+                self._failed_version, self._failed_at = version, time.monotonic()
+            self._training.discard(version)
+        return model
+
+    def train_async(self, df, version):
+        with self._lock:
+            if version in self._training:
+                return None
+            if version == self._failed_version and time.monotonic() - self._failed_at < self.retry_after:
+                return None
+            self._training.add(version)
+        thread = threading.Thread(target=self._train, args=(df, version), daemon=True)
+        thread.start()
+        return thread
+
+    def training(self):
+        return bool(self._training)
+
+    # pesan error training terakhir kalau versi ini gagal dilatih, selain itu None
+    def failed(self, version):
+        with self._lock:
+            return self.error if version == self._failed_version else None
+
+    # Series risiko sejajar dengan df, atau None selama model masih dilatih
+    def get(self, df, version):
+        with self._lock:
+            if self._scored_version == version:
+                return self.scores
+            model = self._ensure_model(version)
+        if model is None:
+            self.train_async(df, version)
+            return None
+        start = time.perf_counter()
+        scores = score(model, df)
+        with self._lock:
+            self.scores, self._scored_version = scores, version
+            self.stats["score_seconds"] = round(time.perf_counter() - start, 4)
+        return scores
+
+    def summary(self):
+        model = self.model or {}
+        return {**self.stats, "version": model.get("version"), "trained_at": model.get("trained_at"),
+                "metrics": model.get("metrics"), "training": self.training(), "error": self.error}
+
+
+def main():
+    from data_loader import CSV_URL, DataLoader, make_source
+    from snapshot import DEFAULT_SNAPSHOT_DIR
+
+    parser = argparse.ArgumentParser(description="Train the attrition-risk model and score current employees")
+    parser.add_argument("--source", default=os.environ.get("HR_DATA_SOURCE", CSV_URL))
+    parser.add_argument("--dir", default=os.environ.get("HR_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR),
+                        help="folder for the persisted model")
+    args = parser.parse_args()
+
+    loader = DataLoader(make_source(args.source))
+    df = loader.get()
+    model = train(df, loader.version)
+    path = save_model(model, args.dir, loader.version)
+
+    start = time.perf_counter()
+    risk = score(model, df)
+    score_seconds = time.perf_counter() - start
+    print(json.dumps({
+        "version": loader.version,
+        "model": path,
+        "train": model["metrics"],
+        "scored": int(risk.notna().sum()),
+        "score_seconds": round(score_seconds, 4),
+        "high_risk": int((risk >= HIGH_RISK).sum()),
+        "departments": department_risk(df, risk).round(4).to_dict(orient="records"),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
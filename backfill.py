@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from hr_metrics import active_mask, active_tenure, avg_monthly_pay, calc_turnover, data_years
+
+ALL_LABEL = "(All)"
+KPI_COLUMNS = ["ActiveEmployees", "Leavers", "Headcount", "TurnoverRate", "AvgTenure", "AvgMonthlyPay"]
+
+
+# lima KPI scorecard untuk satu tahun, pakai fungsi serial yang sama dengan dashboard
+def kpi_row(df, year, is_active):
+    leavers, headcount, rate = calc_turnover(df, year)
+    return {
+        "ActiveEmployees": int((active_mask(df, year).to_numpy() & is_active).sum()),
+        "Leavers": leavers,
+        "Headcount": headcount,
+        "TurnoverRate": rate,
+        "AvgTenure": active_tenure(df, year),
+        "AvgMonthlyPay": avg_monthly_pay(df, year),
+    }
+
+
+def _is_active(df):
+    return (df["EmploymentStatus"].astype(str).str.lower() == "active").to_numpy()
+
+
+def _history_frame(rows, by):
+    frame = pd.DataFrame(rows, columns=["Year", by] + KPI_COLUMNS)
+    return frame.sort_values(["Year", by], kind="stable").reset_index(drop=True)
+
+
+# ===============================
+# SERIAL
+# ===============================
+# referensi: per departemen (plus total perusahaan) x per tahun
+def backfill_serial(df, years=None, by="Department"):
+    years = data_years(df) if years is None else years
+    groups = [(ALL_LABEL, df)] + [(str(key), part) for key, part in df.groupby(by, observed=True, sort=True)]
+    rows = []
+    for key, part in groups:
+        is_active = _is_active(part)
+        rows.extend({"Year": int(year), by: key, **kpi_row(part, year, is_active)} for year in years)
+    return _history_frame(rows, by)
+
+
+# ===============================
+# SHARED MEMORY
+# ===============================
+# kolom tanggal, gaji dan status disalin sekali ke shared memory, ditambah urutan baris
+# per grup (order). Worker membaca lewat view numpy tanpa copy, yang dikirim per task
+# cuma (grup, start, stop, tahun). Urutan baris di dalam grup sama dengan frame asli
+# supaya rata-rata floating point identik dengan jalur serial.
+def _share_arrays(arrays):
+    blocks, spec = [], {}
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = values
+        blocks.append(block)
+        spec[name] = (block.name, values.shape, values.dtype.str)
+    return blocks, spec
+
+
+_WORKER = {}
+
+
+def _attach(spec):
+    _WORKER["blocks"] = [shared_memory.SharedMemory(name=block_name) for block_name, _, _ in spec.values()]
+    _WORKER["arrays"] = {
+        name: np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        for (name, (_, shape, dtype)), block in zip(spec.items(), _WORKER["blocks"])
+    }
+    _WORKER["frame"] = None
+
+
+# start/stop None = seluruh frame (total perusahaan)
+def _slice_frame(start, stop):
+    cached = _WORKER.get("frame")
+    if cached is not None and cached[0] == (start, stop):
+        return cached[1], cached[2]
+    arrays = _WORKER["arrays"]
+    rows = slice(None) if start is None else arrays["order"][start:stop]
+    hire = pd.Series(arrays["hire"][rows].view("datetime64[ns]"))
+    term = pd.Series(arrays["term"][rows].view("datetime64[ns]"))
+    df = pd.DataFrame({
+        "DateofHire": hire,
+        "DateofTermination": term,
+        "HireYear": hire.dt.year,
+        "TermYear": term.dt.year,
+        "MonthlyPay": arrays["pay"][rows],
+    })
+    is_active = arrays["active"][rows]
+    # task berurutan per grup, jadi frame grup terakhir dipakai ulang
+    _WORKER["frame"] = ((start, stop), df, is_active)
+    return df, is_active
+
+
+def _run_task(task):
+    key, start, stop, years = task
+    df, is_active = _slice_frame(start, stop)
+    return [{"Year": int(year), "Key": key, **kpi_row(df, year, is_active)} for year in years]
+
+
+# ===============================
+# PARALLEL
+# ===============================
+def backfill(df, years=None, by="Department", workers=None, years_per_task=1):
+    years = data_years(df) if years is None else list(years)
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1:
+        return backfill_serial(df, years, by)
+
+    codes, keys = pd.factorize(df[by], sort=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(-1, len(keys) + 1))
+    arrays = {
+        "hire": df["DateofHire"].to_numpy(dtype="datetime64[ns]").view("int64"),
+        "term": df["DateofTermination"].to_numpy(dtype="datetime64[ns]").view("int64"),
+        "pay": df["MonthlyPay"].to_numpy(dtype="float64"),
+        "active": _is_active(df),
+        "order": order,
+    }
+    # grup = seluruh frame (total perusahaan) + tiap departemen; baris tanpa departemen
+    # (kode -1) ada di depan order dan hanya ikut total
+    groups = [(ALL_LABEL, None, None)] + [(str(key), int(bounds[k + 1]), int(bounds[k + 2]))
+                                          for k, key in enumerate(keys)]
+    tasks = [(key, start, stop, years[i:i + years_per_task])
+             for key, start, stop in groups for i in range(0, len(years), years_per_task)]
+
+    blocks, spec = _share_arrays(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(spec,)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(_run_task, tasks, chunksize=chunksize))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    rows = [{**row, by: row.pop("Key")} for part in results for row in part]
+    return _history_frame(rows, by)
+
+
+def main():
+    from data_loader import CSV_URL, DataLoader, make_source
+
+    parser = argparse.ArgumentParser(description="KPI history per year and department across a process pool")
+    parser.add_argument("--source", default=os.environ.get("HR_DATA_SOURCE", CSV_URL))
+    parser.add_argument("--years", type=int, nargs=2, metavar=("FROM", "TO"),
+                        help="year range (default: every year in the data)")
+    parser.add_argument("--by", default="Department")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores, 1 = serial)")
+    parser.add_argument("--out", default="kpi_history.csv", help="output file (.csv or .parquet)")
+    parser.add_argument("--check", action="store_true", help="also run the serial path and compare")
+    args = parser.parse_args()
+
+    df = DataLoader(make_source(args.source), snapshot_dir=os.environ.get("HR_SNAPSHOT_DIR") or None).get()
+    years = list(range(args.years[0], args.years[1] + 1)) if args.years else None
+
+    start = time.perf_counter()
+    history = backfill(df, years, by=args.by, workers=args.workers)
+    report = {"rows": len(history), "workers": args.workers or os.cpu_count(),
+              "seconds": round(time.perf_counter() - start, 3)}
+    if args.check:
+        start = time.perf_counter()
+        serial = backfill_serial(df, years, by=args.by)
+        report["serial_seconds"] = round(time.perf_counter() - start, 3)
+        pd.testing.assert_frame_equal(history, serial, check_exact=True)
+        report["identical"] = True
+
+    if args.out.endswith(".parquet"):
+        history.to_parquet(args.out, index=False)
+    else:
+        history.to_csv(args.out, index=False)
+    report["out"] = args.out
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
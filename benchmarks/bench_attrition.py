@@ -0,0 +1,41 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from attrition import score, train  # noqa: E402
+from data_loader import prepare_data  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attrition model: training time and batch scoring time per size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for n_rows in args.sizes:
+        df = prepare_data(make_hr_frame(n_rows, seed=0))
+        model = train(df, "bench")
+        runs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            risk = score(model, df)
+            runs.append(time.perf_counter() - start)
+        results.append({
+            "rows": n_rows,
+            "train_rows": model["metrics"]["rows"],
+            "train_seconds": model["metrics"]["seconds"],
+            "auc": model["metrics"]["auc"],
+            "scored": int(risk.notna().sum()),
+            "score_seconds": round(min(runs), 4),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from bench_sql import peak_mb  # noqa: E402
+from data_loader import prepare_data  # noqa: E402
+from export import DEFAULT_CHUNKSIZE, FORMATS, export, frame_chunks  # noqa: E402
+from sql_backend import SQLEngine, build  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+# kolom yang sama dengan tabel Employee Directory
+COLUMNS = [
+    "EmpID", "Employee_Name", "Position", "Department", "Age", "Sex", "MaritalDesc", "RaceDesc", "State",
+    "TenureYears", "DateofHire", "DateofTermination", "MonthlyPay", "ManagerName", "PerformanceScore",
+    "EngagementSurvey", "EmpSatisfaction"]
+WHOLE_WRITERS = {
+    "xlsx": lambda df, path: df.to_excel(path, index=False),
+    "csv": lambda df, path: df.to_csv(path, index=False),
+    "parquet": lambda df, path: df.to_parquet(path, index=False),
+}
+
+
+# satu mode per proses supaya peak RSS tidak tercampur; baseline = peak setelah data dimuat
+def run_child(mode, fmt, tmp, n_rows, chunksize):
+    csv_path, db_path = os.path.join(tmp, "hr.csv"), os.path.join(tmp, "hr.sqlite")
+    frame_path, out = os.path.join(tmp, "hr.pkl"), os.path.join(tmp, f"out-{mode}.{fmt}")
+    report = {"mode": mode, "format": fmt}
+    if mode == "prepare":
+        make_hr_frame(n_rows, seed=0).to_csv(csv_path, index=False)
+        prepare_data(pd.read_csv(csv_path)).to_pickle(frame_path)
+        report.update(build(csv_path, db_path, chunksize))
+        report.pop("peak_rss_mb")
+        print(json.dumps(report))
+        return
+    if mode == "sql":
+        engine = SQLEngine(db_path)
+        report["baseline_mb"] = peak_mb()
+        report.update(export(engine.directory_chunks({}, columns=COLUMNS, chunksize=chunksize), fmt, out))
+    else:
+        df = pd.read_pickle(frame_path)[COLUMNS]
+        report["baseline_mb"] = peak_mb()
+        if mode == "frame":
+            report.update(export(frame_chunks(df, chunksize), fmt, out))
+        else:
+            start = time.perf_counter()
+            WHOLE_WRITERS[fmt](df, out)
+            seconds = time.perf_counter() - start
+            report.update({"rows": len(df), "seconds": round(seconds, 3), "rows_per_sec": round(len(df) / seconds),
+                           "file_mb": round(os.path.getsize(out) / 2**20, 2)})
+    report["peak_rss_mb"] = peak_mb()
+    report["export_mb"] = round(report["peak_rss_mb"] - report["baseline_mb"], 1)
+    for key in ["path", "rss_before_mb"]:
+        report.pop(key, None)
+    print(json.dumps(report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming export (SQLite cursor / frame chunks) vs whole-frame "
+                                                 "pandas writers: rows/sec and peak RSS")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    # df.to_excel menyimpan semua sel di memori: di 500k baris butuh beberapa GB
+    parser.add_argument("--whole-xlsx", action="store_true", help="also run df.to_excel")
+    parser.add_argument("--child", choices=["prepare", "sql", "frame", "whole"], help=argparse.SUPPRESS)
+    parser.add_argument("--format", choices=list(FORMATS), default="csv", help=argparse.SUPPRESS)
+    parser.add_argument("--tmp", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args.child, args.format, args.tmp, args.rows, args.chunksize)
+
+    def child(mode, fmt="csv"):
+        out = subprocess.run([sys.executable, __file__, "--child", mode, "--format", fmt, "--tmp", tmp,
+                              "--rows", str(args.rows), "--chunksize", str(args.chunksize)],
+                             capture_output=True, text=True, check=True)
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {"rows": args.rows, "chunksize": args.chunksize, "build": child("prepare"), "formats": {}}
+        for fmt in args.formats:
+            modes = ["sql", "frame"] + (["whole"] if fmt != "xlsx" or args.whole_xlsx else [])
+            results["formats"][fmt] = {mode: child(mode, fmt) for mode in modes}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import plotly.io as pio
+import plotly.tools
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from charts import FigureCache  # noqa: E402
+from data_loader import prepare_data  # noqa: E402
+from hr_engine import MetricsEngine  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+# yang dikerjakan st.plotly_chart untuk sebuah Figure sebelum dikirim ke browser
+def serialize(fig):
+    return pio.to_json(plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True), validate=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart time per rerun: building with plotly.express vs the figure cache")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = prepare_data(make_hr_frame(args.rows, seed=0))
+    engine = MetricsEngine(df, "bench")
+
+    # cold: cache kosong tiap run = px.* + to_json seperti sebelum ada cache
+    cold = []
+    for _ in range(args.repeat):
+        cache = FigureCache()
+        start = time.perf_counter()
+        cache.prewarm(engine, "bench", engine.years()[:1])
+        cold.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    cache.prewarm(engine, "bench")
+    prewarm_all = time.perf_counter() - start
+
+    # warm: semua chart satu tahun diambil dari cache lalu diserialisasi untuk Streamlit
+    year = engine.years()[0]
+    keys = [key for key in cache.cache._entries if key[1] in (year, None)]
+    warm = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for version, key_year, (chart_id, period) in keys:
+            serialize(cache.get(version, chart_id, None, key_year, period))
+        warm.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "charts_per_rerun": len(keys),
+        "cold_build_seconds": round(min(cold), 3),
+        "warm_seconds": round(min(warm), 3),
+        "prewarm_all_years_seconds": round(prewarm_all, 3),
+        "years": len(engine.years()),
+        "cache": cache.summary(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_loader import prepare_data  # noqa: E402
+from hr_metrics import active_mask  # noqa: E402
+from manager_index import ManagerIndex  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+# cara lama: filter karyawan aktif tahun tsb lalu groupby ManagerName tiap ganti tahun
+def team_table_scan(df, year):
+    active = df[active_mask(df, year)]
+    return active.groupby("ManagerName", observed=True).agg(
+        Headcount=("EmpID", "size"), AvgMonthlyPay=("MonthlyPay", "mean"),
+        AvgPerformance=("PerformanceScore", "mean"))
+
+
+def timed(func, *args, repeat=5):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        runs.append(time.perf_counter() - start)
+    return result, min(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manager index: build once vs groupby scan per year switch")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--year", type=int, default=2020)
+    args = parser.parse_args()
+
+    results = []
+    for n_rows in args.sizes:
+        df = prepare_data(make_hr_frame(n_rows, seed=0))
+        index, t_build = timed(ManagerIndex.from_frame, df, repeat=1)
+        manager = index.managers[len(index) // 2]
+        _, t_year = timed(index.year_table, args.year)
+        _, t_rank = timed(index.ranking, args.year)
+        _, t_team = timed(lambda: df.iloc[index.team_rows(manager)])
+        _, t_scan = timed(team_table_scan, df, args.year)
+        results.append({
+            "rows": n_rows,
+            "managers": len(index),
+            "build_seconds": round(t_build, 3),
+            "year_switch_ms": round(t_year * 1000, 4),
+            "ranking_ms": round(t_rank * 1000, 3),
+            "team_lookup_ms": round(t_team * 1000, 3),
+            "groupby_scan_ms": round(t_scan * 1000, 2),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
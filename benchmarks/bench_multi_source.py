@@ -0,0 +1,110 @@
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_loader import DataLoader, UrlSource  # noqa: E402
+from multi_source import MultiSource  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+# ===============================
+# LOCAL HTTP STAND-IN
+# ===============================
+# /unitN.csv dengan delay per unit, ETag + 304, dan /flaky.csv yang gagal sekali dulu
+def make_server(payloads, delays):
+    failures = {"flaky": 1}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.strip("/").split(".")[0]
+            if name == "flaky":
+                with lock:
+                    fail, failures["flaky"] = failures["flaky"] > 0, failures["flaky"] - 1
+                if fail:
+                    self.send_error(503)
+                    return
+                name = "unit0"
+            if name not in payloads:
+                self.send_error(404)
+                return
+            body = payloads[name]
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            time.sleep(delays[name])
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent vs sequential loading of several HR sheets")
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=50_000, help="rows per source")
+    parser.add_argument("--delay", type=float, default=0.5, help="server delay of the slowest source (s)")
+    args = parser.parse_args()
+
+    payloads, delays = {}, {}
+    for i in range(args.sources):
+        payloads[f"unit{i}"] = make_hr_frame(args.rows, seed=i, dates_as_text=True).to_csv(index=False).encode()
+        delays[f"unit{i}"] = args.delay * (i + 1) / args.sources
+    server = make_server(payloads, delays)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = {f"Unit {i}": f"{base}/unit{i}.csv" for i in range(args.sources)}
+
+    start = time.perf_counter()
+    for url in urls.values():
+        DataLoader(UrlSource(url)).get()
+    sequential = time.perf_counter() - start
+
+    # ttl=0: get() berikutnya langsung revalidasi
+    loader = DataLoader(MultiSource(urls), ttl=0)
+    start = time.perf_counter()
+    df = loader.get()
+    concurrent = time.perf_counter() - start
+
+    # semua source dijawab 304, frame lama dipakai lagi
+    start = time.perf_counter()
+    loader.get()
+    revalidate = time.perf_counter() - start
+
+    flaky = MultiSource({"Flaky": f"{base}/flaky.csv"}, backoff=0.05)
+    DataLoader(flaky).get()
+
+    server.shutdown()
+    print(json.dumps({
+        "sources": args.sources,
+        "rows": len(df),
+        "per_source": df["Source"].value_counts().sort_index().to_dict(),
+        "sum_of_delays": round(sum(delays.values()), 3),
+        "slowest_delay": round(max(delays.values()), 3),
+        "sequential_seconds": round(sequential, 3),
+        "concurrent_seconds": round(concurrent, 3),
+        "revalidate_seconds": round(revalidate, 3),
+        "revalidations": loader.stats["revalidations"],
+        "flaky_attempts": flaky.report["Flaky"]["attempts"],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
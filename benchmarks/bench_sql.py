@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from data_loader import prepare_data  # noqa: E402
+from directory import FilterIndex, page_slice  # noqa: E402
+from hr_engine import MetricsEngine  # noqa: E402
+from ingest import peak_rss_mb  # noqa: E402
+from sql_backend import SQLEngine, build  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+FILTERS = {"EmploymentStatus": "Active", "Department": "Production"}
+
+
+# ru_maxrss ikut diwarisi proses anak di Linux; VmHWM dihitung ulang setelah exec
+def peak_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, round(time.perf_counter() - start, 4)
+
+
+# satu mode per proses supaya peak RSS tidak tercampur
+def run_child(mode, csv_path, db_path, year, n_rows=None, chunksize=None):
+    report = {"mode": mode}
+    if mode == "prepare":
+        make_hr_frame(n_rows, seed=0).to_csv(csv_path, index=False)
+        report.update(build(csv_path, db_path, chunksize))
+        report.pop("peak_rss_mb")
+    elif mode == "sql":
+        engine, report["load_seconds"] = timed(lambda: SQLEngine(db_path))
+        _, report["kpis_seconds"] = timed(lambda: engine.kpis(year))
+        _, report["tab1_seconds"] = timed(lambda: (engine.demographics(year), engine.departments(year),
+                                                   engine.scores(year)))
+        _, report["directory_page_seconds"] = timed(
+            lambda: engine.directory_rows(FILTERS, "", "MonthlyPay", False, limit=24))
+    else:
+        df, report["load_seconds"] = timed(lambda: prepare_data(pd.read_csv(csv_path)))
+        engine = MetricsEngine(df)
+        _, report["kpis_seconds"] = timed(lambda: engine.kpis(year))
+        active = engine.active_employees(year)
+        _, report["tab1_seconds"] = timed(lambda: (engine.demographics(year, active),
+                                                   engine.departments(year, active), engine.scores(year, active)))
+
+        def page():
+            index = FilterIndex(df, list(FILTERS))
+            rows = df.iloc[index.select(FILTERS)]
+            return page_slice(rows.sort_values("MonthlyPay", ascending=False, kind="stable"), 1, 24)
+
+        _, report["directory_page_seconds"] = timed(page)
+    report["peak_rss_mb"] = peak_mb()
+    print(json.dumps(report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite backend vs in-memory pandas: latency and peak RSS")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--year", type=int, default=2020)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--child", choices=["prepare", "sql", "pandas"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args.child, args.csv, args.db, args.year, args.sizes[0], args.chunksize)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.sizes:
+            csv_path, db_path = os.path.join(tmp, f"hr-{n_rows}.csv"), os.path.join(tmp, f"hr-{n_rows}.sqlite")
+            result = {"rows": n_rows}
+            for mode in ["prepare", "sql", "pandas"]:
+                out = subprocess.run([sys.executable, __file__, "--child", mode, "--csv", csv_path, "--db", db_path,
+                                      "--year", str(args.year), "--sizes", str(n_rows),
+                                      "--chunksize", str(args.chunksize)],
+                                     capture_output=True, text=True, check=True)
+                result["build" if mode == "prepare" else mode] = json.loads(out.stdout.strip().splitlines()[-1])
+            results.append(result)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
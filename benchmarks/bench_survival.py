@@ -0,0 +1,71 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_loader import prepare_data  # noqa: E402
+from hr_engine import MetricsEngine  # noqa: E402
+from survival import months_between  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+# cara lama: groupby per cohort lalu loop per bulan sejak hire sebagai pembanding
+def cohort_retention_loop(df, as_of):
+    left = df["DateofTermination"].notna() & (df["DateofTermination"] <= as_of)
+    end = df["DateofTermination"].where(left, as_of)
+    frame = pd.DataFrame({"HireYear": df["HireYear"].astype("Int64"), "Months": months_between(df["DateofHire"], end),
+                          "Left": left.to_numpy()})
+    frame = frame[frame["Months"] >= 0]
+    width = int(frame["Months"].max()) + 1
+    rows = {}
+    for cohort, group in frame.groupby("HireYear"):
+        survival, curve = 1.0, []
+        for month in range(width):
+            at_risk = (group["Months"] >= month).sum()
+            if not at_risk:
+                curve.append(np.nan)
+                continue
+            survival *= 1 - ((group["Months"] == month) & group["Left"]).sum() / at_risk
+            curve.append(survival)
+        rows[cohort] = curve
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cohort retention / survival: per-cohort loop vs vectorized engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-loop-above", type=int, default=10_000,
+                        help="skip the (slow) loop version for larger sizes")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'loop (s)':>9} {'cohorts (s)':>12} {'speedup':>8} {'dept+pos (s)':>13} {'matrix':>10}")
+    for n_rows in args.sizes:
+        df = prepare_data(make_hr_frame(n_rows))
+        engine = MetricsEngine(df)
+        # durasi & event dihitung sekali per frame (ikut diukur di cohort pertama)
+        cohorts, t_fast = timed(engine.cohort_retention)
+        _, t_dept = timed(lambda: (engine.survival_curves("Department"), engine.survival_curves("Position")))
+        shape = f"{cohorts.shape[0]}x{cohorts.shape[1]}"
+
+        if n_rows > args.skip_loop_above:
+            print(f"{n_rows:>10,} {'-':>9} {t_fast:>12.4f} {'-':>8} {t_dept:>13.4f} {shape:>10}")
+            continue
+
+        slow, t_slow = timed(cohort_retention_loop, df, engine.survival.as_of)
+        assert np.allclose(slow.to_numpy(dtype="float64"), cohorts.to_numpy(), equal_nan=True)
+        print(f"{n_rows:>10,} {t_slow:>9.3f} {t_fast:>12.4f} {t_slow / t_fast:>7.0f}x {t_dept:>13.4f} {shape:>10}")
+
+
+if __name__ == "__main__":
+    main()
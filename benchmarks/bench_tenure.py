@@ -0,0 +1,55 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_loader import prepare_data  # noqa: E402
+from hr_metrics import active_tenure, avg_tenure_by_year, data_years  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+# implementasi lama (row-wise apply) sebagai pembanding
+def active_tenure_apply(df, year):
+    aktif = df[(df["HireYear"] <= year) & ((df["TermYear"].isna()) | (df["TermYear"] >= year))].copy()
+    aktif["TenureYears"] = aktif.apply(
+        lambda row: ((min(pd.Timestamp(year=year, month=12, day=31), row["DateofTermination"] if pd.notna(row["DateofTermination"]) else pd.Timestamp(year=year, month=12, day=31)) - row["DateofHire"]).days) / 365.25, axis=1)
+    return aktif["TenureYears"].mean() if not aktif.empty else 0
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tenure: row-wise apply vs vectorized engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--skip-apply-above", type=int, default=None,
+                        help="skip the (slow) apply version for larger sizes")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'apply (s)':>10} {'vector (s)':>11} {'speedup':>8} {'all years (s)':>14}")
+    for n_rows in args.sizes:
+        df = prepare_data(make_hr_frame(n_rows))
+        years = data_years(df)
+
+        fast, t_fast = timed(active_tenure, df, args.year)
+        _, t_years = timed(avg_tenure_by_year, df, years)
+
+        if args.skip_apply_above is not None and n_rows > args.skip_apply_above:
+            print(f"{n_rows:>10,} {'-':>10} {t_fast:>11.4f} {'-':>8} {t_years:>14.4f}")
+            continue
+
+        slow, t_slow = timed(active_tenure_apply, df, args.year)
+        assert abs(slow - fast) < 1e-9, (slow, fast)
+        print(f"{n_rows:>10,} {t_slow:>10.3f} {t_fast:>11.4f} {t_slow / t_fast:>7.0f}x {t_years:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data_loader import CATEGORY_COLUMNS, prepare_data, read_raw  # noqa: E402
+from directory import FilterIndex, NameSearchIndex, page_slice, render_cards  # noqa: E402
+from hr_engine import MetricsEngine  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+from turnover_cube import PERIOD_OPTIONS, TurnoverCube  # noqa: E402
+
+STAGES = ["load", "derive", "year_kpis", "tab1_aggregates", "directory_index",
+          "directory_filter", "card_render"]
+RESULT_FORMAT = 1
+
+
+def timed(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - start)
+    return result, min(runs)
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parents[1], check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ===============================
+# STAGES
+# ===============================
+# tiap stage memakai hasil stage sebelumnya, sama seperti urutan di hr-dashboard.py
+def run_size(n_rows, repeat, seed, stages):
+    raw = make_hr_frame(n_rows, seed=seed, dates_as_text=True).to_csv(index=False).encode()
+    timings = {}
+
+    def stage(name, func):
+        # stage yang tidak diminta tetap dijalankan sekali karena hasilnya dipakai stage berikutnya
+        result, seconds = timed(func, repeat if name in stages else 1)
+        if name in stages:
+            timings[name] = round(seconds, 6)
+        return result
+
+    raw_df = stage("load", lambda: read_raw(raw))
+    df = stage("derive", lambda: prepare_data(raw_df))
+
+    # snapshot per tahun dibangun ulang tiap run supaya yang diukur bukan cache
+    def year_kpis():
+        engine = MetricsEngine(df)
+        return engine, [engine.kpis(year) for year in engine.years()]
+    engine, _ = stage("year_kpis", year_kpis)
+    year = engine.years()[0]
+
+    def tab1():
+        active = engine.active_employees(year)
+        cube = TurnoverCube.from_frame(df)
+        return {
+            "demographics": engine.demographics(year, active),
+            "departments": engine.departments(year, active),
+            "scores": engine.scores(year, active),
+            "trend": [cube.trend(option) for option in PERIOD_OPTIONS],
+            "term_reasons": engine.term_reasons(),
+        }
+    stage("tab1_aggregates", tab1)
+
+    filter_index, name_index = stage(
+        "directory_index", lambda: (FilterIndex(df, [col for col in CATEGORY_COLUMNS if col in df.columns]),
+                                    NameSearchIndex.from_frame(df)))
+
+    # kombinasi filter yang umum: satu dropdown, dua dropdown, cari nama, cari nama + dropdown
+    dept = filter_index.options("Department")[0]
+    status = filter_index.options("EmploymentStatus")[0]
+    query = str(df["Employee_Name"].iloc[len(df) // 2]).split(",")[0][:5]
+
+    def directory_filter():
+        selections = [
+            filter_index.select({"Department": dept}),
+            filter_index.select({"Department": dept, "EmploymentStatus": status}),
+            filter_index.select({}, within=name_index.search(query)),
+            filter_index.select({"Department": dept}, within=name_index.search(query)),
+        ]
+        return [df.iloc[rows] for rows in selections]
+    detail_frames = stage("directory_filter", directory_filter)
+
+    detail_df = detail_frames[0].sort_values("Employee_Name")
+    stage("card_render", lambda: [render_cards(page_slice(detail_df, page, 96)) for page in (1, 2, 3)])
+
+    return {"rows": n_rows, "years": len(engine.years()),
+            "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1), "stages": timings}
+
+
+# ===============================
+# COMPARE
+# ===============================
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = {(run["rows"], name): seconds for run in baseline["runs"] for name, seconds in run["stages"].items()}
+    print(f"\n{'rows':>10} {'stage':<18} {'baseline (s)':>13} {'current (s)':>12} {'ratio':>7}")
+    for run in current["runs"]:
+        for name, seconds in run["stages"].items():
+            before = old.get((run["rows"], name))
+            if before is None:
+                continue
+            ratio = seconds / before if before else np.nan
+            print(f"{run['rows']:>10,} {name:<18} {before:>13.4f} {seconds:>12.4f} {ratio:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every dashboard pipeline stage on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results as JSON to this path")
+    parser.add_argument("--compare", metavar="BASELINE", help="print ratios against an earlier results file")
+    args = parser.parse_args()
+
+    results = {
+        "format": RESULT_FORMAT,
+        "commit": git_commit(),
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "repeat": args.repeat,
+        "runs": [],
+    }
+    print(f"{'rows':>10} " + " ".join(f"{name:>16}" for name in args.stages))
+    for n_rows in args.sizes:
+        run = run_size(n_rows, args.repeat, args.seed, args.stages)
+        results["runs"].append(run)
+        print(f"{n_rows:>10,} " + " ".join(f"{run['stages'][name]:>16.4f}" for name in args.stages))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
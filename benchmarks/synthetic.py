@@ -0,0 +1,102 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = ["John", "Amy", "Joanne", "Michael", "Sarah", "David", "Maria", "Kevin", "Linda", "Simon",
+               "Jennifer", "Brandon", "Lisa", "Anthony", "Nicole", "Ricardo", "Mei", "Ahmed", "Olga", "Tuan"]
+LAST_NAMES = ["Smith", "Johnson", "Brown", "Lee", "Garcia", "Nguyen", "Anderson", "Dunn", "Roup", "Miller",
+              "Stanley", "Wang", "Patel", "Khan", "Rossi", "Kowalski", "Silva", "Sato", "Murphy", "Lopez"]
+DEPARTMENTS = {
+    "Production": ["Production Technician I", "Production Technician II", "Production Manager"],
+    "IT/IS": ["IT Support", "Network Engineer", "Database Administrator", "IT Manager - DB"],
+    "Sales": ["Area Sales Manager", "Sales Manager"],
+    "Software Engineering": ["Software Engineer", "Software Engineering Manager"],
+    "Admin Offices": ["Administrative Assistant", "Accountant I", "Sr. Accountant"],
+    "Executive Office": ["President & CEO"],
+}
+TERM_REASONS = ["Another position", "unhappy", "more money", "career change", "hours", "attendance",
+                "relocation out of area", "performance", "no-call, no-show", "retiring"]
+STATES = ["MA", "CT", "TX", "VT", "NY", "CA", "OH", "GA"]
+
+
+# ===============================
+# SYNTHETIC HR DATASET
+# ===============================
+# frame mentah dengan skema yang dipakai hr-dashboard.py (belum lewat prepare_data).
+# dates_as_text=True menulis tanggal sebagai m/d/Y seperti export Google Sheets.
+def make_hr_frame(n_rows, seed=0, start="1990-01-01", end="2024-12-31", dates_as_text=False):
+    rng = np.random.default_rng(seed)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    span = (end - start).days
+
+    hire = start + pd.to_timedelta(rng.integers(0, span, n_rows), unit="D")
+    term = hire + pd.to_timedelta(rng.integers(30, 6000, n_rows), unit="D")
+    term = pd.Series(term).where((rng.random(n_rows) < 0.4) & (term <= end))
+    terminated = term.notna().to_numpy()
+
+    departments = np.array(list(DEPARTMENTS))
+    dept = departments[rng.integers(0, len(departments), n_rows)]
+    position = np.empty(n_rows, dtype=object)
+    for name, positions in DEPARTMENTS.items():
+        mask = dept == name
+        position[mask] = np.array(positions, dtype=object)[rng.integers(0, len(positions), mask.sum())]
+
+    # ~1 manager per 20 karyawan
+    n_managers = max(1, n_rows // 20)
+    managers = (pd.Series(rng.choice(FIRST_NAMES, n_managers)) + " "
+                + pd.Series(rng.choice(LAST_NAMES, n_managers)) + " " + pd.Series(np.arange(n_managers)).astype(str))
+
+    status = np.where(
+        terminated,
+        rng.choice(["Voluntarily Terminated", "Terminated for Cause"], n_rows, p=[0.8, 0.2]),
+        rng.choice(["Active", "Leave of Absence", "Future Start"], n_rows, p=[0.93, 0.05, 0.02]),
+    )
+    dob = start - pd.to_timedelta(rng.integers(18 * 365, 45 * 365, n_rows), unit="D")
+
+    df = pd.DataFrame({
+        "Employee_Name": (pd.Series(rng.choice(LAST_NAMES, n_rows)) + np.arange(n_rows).astype(str)
+                          + ", " + pd.Series(rng.choice(FIRST_NAMES, n_rows))),
+        "EmpID": np.arange(10001, 10001 + n_rows),
+        "Position": position,
+        "Department": dept,
+        "EmploymentStatus": status,
+        "ManagerName": managers.to_numpy()[rng.integers(0, n_managers, n_rows)],
+        "PayRate": rng.uniform(14, 80, n_rows).round(2),
+        "DOB": dob,
+        "Sex": rng.choice(["Male", "Female"], n_rows),
+        "MaritalDesc": rng.choice(["Single", "Married", "Divorced", "Separated", "Widowed"], n_rows,
+                                  p=[0.4, 0.4, 0.1, 0.05, 0.05]),
+        "RaceDesc": rng.choice(["White", "Black or African American", "Asian", "Two or more races",
+                                "American Indian or Alaska Native", "Hispanic"], n_rows),
+        "State": rng.choice(STATES, n_rows),
+        "DateofHire": hire,
+        "DateofTermination": term.to_numpy(),
+        "TermReason": np.where(terminated, rng.choice(TERM_REASONS, n_rows), "N/A-StillEmployed"),
+        "PerformanceScore": rng.choice([1, 2, 3, 4], n_rows, p=[0.05, 0.1, 0.7, 0.15]),
+        "EngagementSurvey": rng.uniform(1, 5, n_rows).round(2),
+        "EmpSatisfaction": rng.integers(1, 6, n_rows),
+        "SpecialProjectsCount": np.where(rng.random(n_rows) < 0.7, 0, rng.integers(1, 9, n_rows)),
+    })
+    if dates_as_text:
+        for col in ["DOB", "DateofHire", "DateofTermination"]:
+            df[col] = pd.to_datetime(df[col]).dt.strftime("%m/%d/%Y")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic HR extract")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("out", help="output path (.csv or .parquet)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_hr_frame(args.rows, seed=args.seed, dates_as_text=True)
+    if args.out.endswith(".parquet"):
+        df.to_parquet(args.out, index=False)
+    else:
+        df.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
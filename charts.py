@@ -0,0 +1,325 @@
+import json
+import threading
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import hr_metrics
+from shared_cache import SharedCache
+from turnover_cube import PERIOD_OPTIONS
+
+DEFAULT_MAX_MB = 128
+
+
+# ===============================
+# FIGURE BUILDERS
+# ===============================
+# satu fungsi per chart dashboard; input = agregat yang sudah dihitung (hr_metrics / engine)
+def gender_figure(gender_counts):
+    fig_gender = px.pie(
+        gender_counts,
+        names="Gender",
+        values="Count",
+        color="Gender",
+        color_discrete_map={"Male":"#1E3A8A","Female":"#3B82F6"},
+        hole=0.4
+    )
+    fig_gender.update_traces(textinfo="percent+label", hovertemplate="%{label}: %{value} employees")
+    fig_gender.update_layout(height=300, margin=dict(t=20,b=20,l=20,r=20))
+    return fig_gender
+
+
+def age_figure(age_dist):
+    fig_age = px.histogram(
+        age_dist["ages"], x="Age", nbins=len(hr_metrics.AGE_BINS)-1, color_discrete_sequence=["#1E3A8A"]
+    )
+    fig_age.update_layout(
+        xaxis_title="Age (Years)",
+        yaxis_title="Number of Employees",
+        height=350,
+        margin=dict(t=20,b=20,l=20,r=20)
+    )
+    return fig_age
+
+
+def marital_figure(marital_counts):
+    palette = ["#1E3A8A", "#1E40AF", "#2563EB", "#3B82F6", "#60A5FA"][:len(marital_counts)]
+
+    fig_marital = px.bar(
+        marital_counts,
+        y="Marital Status",
+        x="Count",
+        color="Marital Status",
+        color_discrete_sequence=palette,
+        text="Count",
+        orientation='h'
+    )
+    fig_marital.update_traces(textposition="outside", width=0.6)
+    fig_marital.update_layout(
+        xaxis_title="Number of Employees",
+        yaxis_title="Marital Status",
+        height=350,
+        margin=dict(t=20,b=40,l=120,r=20),
+        showlegend=False,
+        xaxis=dict(range=[0, marital_counts["Count"].max()*1.2])
+    )
+    return fig_marital
+
+
+def dept_figure(dept_counts):
+    fig_dept = px.bar(
+        dept_counts,
+        x="Count", y="Department",
+        orientation="h",
+        text="Count",
+        color="Count",
+        color_continuous_scale=px.colors.sequential.Blues
+    )
+    fig_dept.update_traces(textposition="outside")
+    fig_dept.update_layout(
+        xaxis_title="Number of Employees",
+        yaxis_title=None,
+        height=350,
+        margin=dict(t=20,b=20,l=20,r=20),
+        coloraxis_showscale=False,
+        xaxis=dict(range=[0, dept_counts["Count"].max()*1.1])
+    )
+    return fig_dept
+
+
+def project_figure(project_counts):
+    fig_project = px.bar(
+        project_counts,
+        x="SpecialProjectsCount", y="Department",
+        orientation="h",
+        text="SpecialProjectsCount",
+        color="SpecialProjectsCount",
+        color_continuous_scale=px.colors.sequential.Blues
+    )
+    fig_project.update_traces(textposition="outside")
+    fig_project.update_layout(
+        xaxis_title="Number of Projects",
+        yaxis_title=None,
+        height=350,
+        margin=dict(t=20,b=20,l=20,r=20),
+        coloraxis_showscale=False,
+        xaxis=dict(range=[0, project_counts["SpecialProjectsCount"].max()*1.1])
+    )
+    return fig_project
+
+
+def turnover_figure(turnover_trend, period_option):
+    # Rata-rata turnover
+    avg_turnover = turnover_trend["Jumlah_Turnover"].mean()
+    fig_turnover = px.line(
+        turnover_trend,
+        x="TermDate" if period_option != "Yearly" else "Year",
+        y="Jumlah_Turnover",
+        line_shape="linear"
+    )
+
+    fig_turnover.add_hline(
+        y=avg_turnover,
+        line_dash="dash",
+        line_color="darkorange",
+        annotation_text=f"Average: {avg_turnover:.2f}",
+        annotation_position="top left"
+    )
+
+    fig_turnover.update_layout(
+        xaxis_title="Date" if period_option != "Yearly" else "Year",
+        yaxis_title="Number of Employees Left",
+        height=400,
+        margin=dict(t=20, b=20, l=60, r=20),
+    )
+    return fig_turnover
+
+
+def term_reason_figure(term_reason_counts):
+    fig_tt = px.treemap(
+        term_reason_counts,
+        path=["Reason"],
+        values="Count",
+        color="Count",
+        color_continuous_scale="Blues",
+        title=""
+    )
+
+    fig_tt.update_layout(
+        width=500,
+        height=300,
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        margin=dict(t=20, b=20, l=20, r=20)
+    )
+    return fig_tt
+
+
+# retensi per cohort hire: heatmap cohort x tahun sejak hire (titik tiap 12 bulan)
+def cohort_figure(cohorts):
+    yearly = cohorts.loc[:, ::12] * 100
+    fig_cohort = px.imshow(
+        yearly.to_numpy(),
+        x=[str(month // 12) for month in yearly.columns],
+        y=yearly.index.astype(str),
+        color_continuous_scale="Blues",
+        zmin=0, zmax=100,
+        aspect="auto",
+        labels=dict(x="Years Since Hire", y="Hire Cohort", color="Retention (%)")
+    )
+    fig_cohort.update_traces(hovertemplate="Cohort %{y}, year %{x}: %{z:.1f}% retained<extra></extra>")
+    fig_cohort.update_layout(height=500, margin=dict(t=20,b=20,l=60,r=20))
+    return fig_cohort
+
+
+# kurva Kaplan-Meier per grup (Department / Position)
+def survival_figure(curves):
+    long = (curves * 100).rename_axis(index="Group").stack().rename("Retention").reset_index()
+    fig_survival = px.line(
+        long,
+        x="Months", y="Retention",
+        color="Group",
+        line_shape="hv",
+        color_discrete_sequence=px.colors.sequential.Blues_r
+    )
+    fig_survival.update_layout(
+        xaxis_title="Months Since Hire",
+        yaxis_title="Still Employed (%)",
+        yaxis=dict(range=[0, 105]),
+        height=450,
+        margin=dict(t=20,b=20,l=60,r=20),
+        legend_title_text=None
+    )
+    return fig_survival
+
+
+# peringkat manager (satu KPI tim), bar horizontal urut sesuai peringkat
+def manager_figure(ranking, column, label):
+    top = ranking.reset_index()
+    fig_manager = px.bar(
+        top,
+        x=column, y="ManagerName",
+        orientation="h",
+        text=top[column].map("{:,.2f}".format),
+        color=column,
+        color_continuous_scale=px.colors.sequential.Blues,
+        hover_data={"Headcount": True, "DirectReports": True}
+    )
+    fig_manager.update_traces(textposition="outside")
+    fig_manager.update_layout(
+        xaxis_title=label,
+        yaxis_title=None,
+        yaxis=dict(autorange="reversed"),
+        height=max(300, 28 * len(top)),
+        margin=dict(t=20,b=20,l=20,r=20),
+        coloraxis_showscale=False
+    )
+    return fig_manager
+
+
+def attrition_figure(dept_risk):
+    fig_risk = px.bar(
+        dept_risk.assign(AvgRiskPct=dept_risk["AvgRisk"] * 100),
+        x="AvgRiskPct", y="Department",
+        orientation="h",
+        text=dept_risk["HighRisk"].map("{:,} high risk".format),
+        color="AvgRiskPct",
+        color_continuous_scale=px.colors.sequential.Blues,
+        hover_data={"Employees": True, "HighRiskPct": ":.1f"}
+    )
+    fig_risk.update_traces(textposition="outside")
+    fig_risk.update_layout(
+        xaxis_title="Average Attrition Risk (%)",
+        yaxis_title=None,
+        height=350,
+        margin=dict(t=20,b=20,l=20,r=20),
+        coloraxis_showscale=False,
+        xaxis=dict(range=[0, min(100, dept_risk["AvgRisk"].max()*100*1.3)])
+    )
+    return fig_risk
+
+
+# distribusi skor (Performance / Engagement / Satisfaction)
+SCORE_CHARTS = {
+    "perf": ("PerformanceScore", 'Performance Score', '#1E3A8A'),
+    "eng": ("EngagementSurvey", 'Engagement Survey', '#3B82F6'),
+    "satis": ("EmpSatisfaction", 'Employee Satisfaction', '#BFDBFE'),
+}
+
+
+def score_figure(counts, label, color):
+    # lewat DataFrame supaya counts kosong (tahun tanpa karyawan aktif) tetap jadi chart
+    return px.bar(
+        pd.DataFrame({'x': counts.index.astype(str), 'y': counts.to_numpy()}),
+        x='x', y='y',
+        labels={'x': label, 'y': 'Number of Employees'},
+        color_discrete_sequence=[color]
+    )
+
+
+# ===============================
+# FIGURE CACHE
+# ===============================
+# figure disimpan sebagai JSON (ukuran jelas untuk batas memori) di SharedCache,
+# kunci = (versi dataset, tahun, (chart id, periode)). Membuka kembali JSON tanpa
+# validasi ulang jauh lebih murah daripada px.* (validasi + template tiap rerun);
+# isinya sudah divalidasi waktu figure pertama kali dibuat.
+def figure_from_json(spec):
+    return go.Figure(json.loads(spec), _validate=False)
+
+
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 2**20):
+        self.cache = SharedCache(max_bytes=max_bytes)
+        self._warming = set()
+        self._lock = threading.Lock()
+
+    # JSON figure; build() hanya dipanggil kalau belum ada di cache
+    def spec(self, version, chart_id, build, year=None, period=None):
+        return self.cache.get_or_compute(version, year, (chart_id, period), lambda: build().to_json())
+
+    def get(self, version, chart_id, build, year=None, period=None):
+        return figure_from_json(self.spec(version, chart_id, build, year, period))
+
+    def summary(self):
+        return self.cache.summary()
+
+    # ===============================
+    # PRE-WARM
+    # ===============================
+    # semua chart untuk setiap tahun (dan setiap periode turnover) dibuat di muka,
+    # sehingga ganti tahun di sidebar langsung kena cache
+    def prewarm(self, engine, version, years=None):
+        years = engine.years() if years is None else years
+        for option in PERIOD_OPTIONS:
+            self.spec(version, "turnover", lambda: turnover_figure(engine.turnover_trend(option), option),
+                      period=option)
+        self.spec(version, "term_reasons", lambda: term_reason_figure(engine.term_reasons()))
+        for year in years:
+            # berhenti kalau dataset sudah berganti versi; tahun yang sudah ada dilewati
+            if self.cache.version != version:
+                return
+            if (version, year, ("gender", None)) in self.cache:
+                continue
+            active = engine.active_employees(year)
+            demographics = engine.demographics(year, active)
+            departments = engine.departments(year, active)
+            scores = engine.scores(year, active)
+            self.spec(version, "gender", lambda: gender_figure(demographics["gender"]), year)
+            self.spec(version, "age", lambda: age_figure(demographics["age"]), year)
+            self.spec(version, "marital", lambda: marital_figure(demographics["marital"]), year)
+            self.spec(version, "dept", lambda: dept_figure(departments["employees"]), year)
+            self.spec(version, "project", lambda: project_figure(departments["projects"]), year)
+            for chart_id, (column, label, color) in SCORE_CHARTS.items():
+                self.spec(version, chart_id, lambda: score_figure(scores[column]["counts"], label, color), year)
+
+    # pre-warm di thread latar, sekali per versi dataset
+    def prewarm_async(self, engine, version, years=None):
+        with self._lock:
+            if version in self._warming:
+                return None
+            self._warming = {version}
+        thread = threading.Thread(target=self.prewarm, args=(engine, version, years), daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,315 @@
+import hashlib
+import io
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import compaction
+from snapshot import DEFAULT_SNAPSHOT_DIR, load_snapshot, save_snapshot
+
+# default sumber data (Google Sheets publish to CSV)
+CSV_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTQyERWzY558YfSVl-9PpWL_EJszeOYxx-aqt2Maav1dQmyKXl3G7wy7SlSk2EMpg/pub?output=csv"
+DEFAULT_TTL = 600
+CHANGELOG_SIZE = 50
+# kolom filter Employee Details disimpan sebagai categorical
+CATEGORY_COLUMNS = ["EmploymentStatus", "Department", "Position", "ManagerName", "Source"]
+
+
+# ===============================
+# DATA SOURCES
+# ===============================
+# setiap source mengembalikan (raw_bytes, etag, last_modified);
+# raw_bytes = None berarti data belum berubah sejak validator terakhir
+class UrlSource:
+    def __init__(self, url, timeout=30, session=None):
+        self.url = url
+        self.timeout = timeout
+        # requests.Session opsional (connection pooling, dipakai MultiSource)
+        self.session = session
+        self.format = "parquet" if url.split("?")[0].endswith(".parquet") else "csv"
+
+    def fetch(self, etag=None, last_modified=None):
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if self.session is not None:
+            resp = self.session.get(self.url, headers=headers, timeout=self.timeout)
+            if resp.status_code == 304:
+                return None, etag, last_modified
+            resp.raise_for_status()
+            return resp.content, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+        request = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+                raw = resp.read()
+                return raw, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, etag, last_modified
+            raise
+
+    def __repr__(self):
+        return f"UrlSource({self.url!r})"
+
+
+class FileSource:
+    def __init__(self, path):
+        self.path = path
+        self.format = "parquet" if str(path).endswith(".parquet") else "csv"
+
+    def fetch(self, etag=None, last_modified=None):
+        # mtime + size dipakai sebagai pengganti ETag
+        stat = os.stat(self.path)
+        file_tag = f"{stat.st_mtime_ns}-{stat.st_size}"
+        if etag == file_tag:
+            return None, etag, last_modified
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        return raw, file_tag, None
+
+    def __repr__(self):
+        return f"FileSource({self.path!r})"
+
+
+def make_source(location):
+    if str(location).startswith(("http://", "https://")):
+        return UrlSource(location)
+    return FileSource(location)
+
+
+# versi dataset = hash isi source; raw dari MultiSource berupa list (nama, bytes)
+def content_version(raw):
+    if isinstance(raw, list):
+        sha = hashlib.sha1()
+        for name, part in raw:
+            sha.update(name.encode())
+            sha.update(hashlib.sha1(part).digest())
+        return sha.hexdigest()[:12]
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def read_raw(raw, fmt="csv"):
+    if fmt == "parquet":
+        return pd.read_parquet(io.BytesIO(raw))
+    return pd.read_csv(io.BytesIO(raw))
+
+
+# ===============================
+# PREPARE DATA
+# ===============================
+def prepare_data(df, today=None, compact=True):
+    df = df.copy()
+    today = pd.to_datetime("today") if today is None else pd.Timestamp(today)
+
+    # konversi kolom
+    df["DateofHire"] = pd.to_datetime(df["DateofHire"], errors="coerce")
+    df["DateofTermination"] = pd.to_datetime(df["DateofTermination"], errors="coerce")
+    # tambahan kolom tahun
+    df["HireYear"] = df["DateofHire"].dt.year
+    df["TermYear"] = df["DateofTermination"].dt.year
+    # masa kerja (tahun)
+    df["TenureYears"] = np.where(
+        df["DateofTermination"].notna(),
+        (df["DateofTermination"] - df["DateofHire"]).dt.days / 365,
+        (today - df["DateofHire"]).dt.days / 365
+    )
+
+    # gaji bulanan 40jam/minggu = 160 jam/bulan
+    df["PayRate"] = df["PayRate"].fillna(0)
+    df["MonthlyPay"] = df["PayRate"] * 160
+
+    # usia karyawan
+    if "Age" not in df.columns:
+        df["Age"] = ((today - pd.to_datetime(df["DOB"], errors="coerce")).dt.days / 365.25).round(1)
+
+    # skema hemat memori (categorical, integer kecil, float32), lihat compaction.py
+    if compact:
+        return compaction.compact(df)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+# ===============================
+# CACHED LOADER
+# ===============================
+# frame disiapkan sekali lalu disimpan di memori; setelah TTL habis
+# source divalidasi ulang (ETag / Last-Modified) dan hanya di-parse
+# ulang kalau isinya berubah
+# Kalau EmpID unik, extract baru di-diff per baris (hash) dengan extract sebelumnya dan
+# hanya baris yang berubah yang disiapkan ulang (lihat incremental.py); last_delta
+# dipakai untuk mem-patch engine & index, changelog mencatat setiap refresh.
+class DataLoader:
+    def __init__(self, source, ttl=DEFAULT_TTL, chunksize=None, snapshot_dir=None, incremental=True):
+        self.source = source
+        self.ttl = ttl
+        # chunksize diisi = parse & prepare per chunk (lihat ingest.py). Memori tidak dibatasi:
+        # raw tetap utuh (hash versi) dan chunk digabung lagi jadi satu frame
+        self.chunksize = chunksize
+        # folder snapshot Arrow dari frame yang sudah disiapkan (lihat snapshot.py)
+        self.snapshot_dir = snapshot_dir
+        self.incremental = incremental
+        self.ingest_report = None
+        # (versi, YearAccumulator) yang dilipat per chunk saat ingest; None di mode lain
+        self._accumulator = None
+        self.df = None
+        self.version = None
+        self.etag = None
+        self.last_modified = None
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        # hash baris mentah, kolom & hari prepare_data dari versi saat ini (untuk diff)
+        self._row_hashes = None
+        self._raw_columns = None
+        self._prepared_day = None
+        self.last_delta = None
+        self.changelog = deque(maxlen=CHANGELOG_SIZE)
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "refreshes": 0,
+            "snapshot_loads": 0,
+            "incremental_refreshes": 0,
+            "last_refresh_seconds": 0.0,
+            "total_refresh_seconds": 0.0,
+        }
+
+    def is_fresh(self):
+        return self.df is not None and (time.monotonic() - self.loaded_at) < self.ttl
+
+    def get(self, force=False):
+        with self._lock:
+            if not force and self.is_fresh():
+                self.stats["hits"] += 1
+                return self.df
+            self.stats["misses"] += 1
+            self._refresh(force)
+            return self.df
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded_at = None
+            self.df = None
+
+    def _refresh(self, force):
+        start = time.perf_counter()
+        etag, last_modified = (None, None) if force or self.df is None else (self.etag, self.last_modified)
+        raw, self.etag, self.last_modified = self.source.fetch(etag, last_modified)
+
+        if raw is None:
+            # 304 / file tidak berubah, pakai frame yang sudah ada
+            self.stats["revalidations"] += 1
+        else:
+            version = content_version(raw)
+            if version != self.version or self.df is None:
+                load_start = time.perf_counter()
+                self.df, mode = self._load(raw, version)
+                self._log(mode, version, time.perf_counter() - load_start)
+                self.version = version
+            self.stats["refreshes"] += 1
+        self.loaded_at = time.monotonic()
+
+        elapsed = time.perf_counter() - start
+        self.stats["last_refresh_seconds"] = elapsed
+        self.stats["total_refresh_seconds"] += elapsed
+
+
+    def _load(self, raw, version):
+        if self.snapshot_dir:
+            df = load_snapshot(self.snapshot_dir, version)
+            if df is not None:
+                self.stats["snapshot_loads"] += 1
+                # baris mentah tidak di-parse, jadi perubahan berikutnya = rebuild penuh
+                self._row_hashes = None
+                self.last_delta = None
+                self._accumulator = None
+                return df, "snapshot"
+        df, mode, accumulator = self._parse(raw, version)
+        self._accumulator = (version, accumulator) if accumulator is not None else None
+        if self.snapshot_dir:
+            try:
+                save_snapshot(df, self.snapshot_dir, version)
+            except OSError:
+                # folder tidak bisa ditulis: tetap jalan tanpa snapshot
+                pass
+        return df, mode
+
+    def _parse(self, raw, version):
+        self.last_delta = None
+        if hasattr(self.source, "parse"):
+            # MultiSource: parse paralel per source + validasi skema + kolom Source
+            raw_df = self.source.parse(raw)
+        elif not self.chunksize:
+            raw_df = read_raw(raw, self.source.format)
+        else:
+            from ingest import ingest
+
+            self._row_hashes = None
+            # satu tanggal untuk semua chunk: TenureYears & Age dihitung terhadap hari yang sama
+            df, accumulator, self.ingest_report = ingest(io.BytesIO(raw), self.chunksize, fmt=self.source.format,
+                                                         today=pd.Timestamp.today())
+            return df, "full", accumulator
+        if not self.incremental:
+            return prepare_data(raw_df), "full", None
+
+        from incremental import patch_frame, row_hashes
+
+        hashes = row_hashes(raw_df)
+        today = pd.Timestamp.today()
+        df = None
+        # masa kerja & usia dihitung terhadap hari ini, jadi patch hanya valid di hari yang sama
+        if (hashes is not None and self._row_hashes is not None and self.df is not None
+                and self._prepared_day == today.normalize() and list(raw_df.columns) == self._raw_columns):
+            df, self.last_delta = patch_frame(self.df, self._row_hashes, raw_df, hashes,
+                                              self.version, version, today=today)
+        self._row_hashes, self._raw_columns, self._prepared_day = hashes, list(raw_df.columns), today.normalize()
+        if df is not None:
+            self.stats["incremental_refreshes"] += 1
+            return df, "incremental", None
+        return prepare_data(raw_df, today), "full", None
+
+    # KPI per tahun yang sudah dilipat saat ingest, hanya kalau milik versi ini
+    def accumulator_for(self, version):
+        if self._accumulator is not None and self._accumulator[0] == version:
+            return self._accumulator[1]
+        return None
+
+    def _log(self, mode, version, seconds):
+        entry = {
+            "time": pd.Timestamp.now().isoformat(timespec="seconds"),
+            "from_version": self.version,
+            "to_version": version,
+            "mode": mode,
+            "rows": len(self.df),
+            "seconds": round(seconds, 3),
+        }
+        if mode == "incremental":
+            entry.update(self.last_delta.summary())
+        self.changelog.append(entry)
+
+
+def loader_from_env():
+    # HR_DATA_SOURCES="North=<url>;South=<path>" = beberapa sheet digabung (lihat multi_source.py)
+    if os.environ.get("HR_DATA_SOURCES"):
+        from multi_source import MultiSource, parse_sources_spec
+
+        source = MultiSource(parse_sources_spec(os.environ["HR_DATA_SOURCES"]),
+                             allow_partial=os.environ.get("HR_DATA_ALLOW_PARTIAL") == "1")
+    else:
+        source = make_source(os.environ.get("HR_DATA_SOURCE", CSV_URL))
+    ttl = float(os.environ.get("HR_DATA_TTL", DEFAULT_TTL))
+    chunksize = int(os.environ.get("HR_DATA_CHUNKSIZE", 0)) or None
+    snapshot_dir = os.environ.get("HR_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR)
+    incremental = os.environ.get("HR_INCREMENTAL", "1") != "0"
+    return DataLoader(source, ttl=ttl, chunksize=chunksize, snapshot_dir=snapshot_dir, incremental=incremental)
@@ -0,0 +1,334 @@
+import bisect
+import copy
+import difflib
+import re
+import string
+
+import numpy as np
+import pandas as pd
+
+from attrition import HIGH_RISK, RISK_COLUMN
+
+# mapping warna berdasarkan EmploymentStatus
+STATUS_COLORS = {
+    "Active": "#2ecc71",
+    "Leave of Absence": "#f6e05e",
+    "Voluntarily Terminated": "#feb2b2",
+    "Terminated for Cause": "#e53e3e",
+    "Future Start": "#63b3ed"}
+DEFAULT_STATUS_COLOR = "#A0AEC0"
+PAGE_SIZES = [12, 24, 48, 96]
+
+
+# ===============================
+# EMPLOYEE PROFILE CARD
+# ===============================
+CARD_TEMPLATE = """
+<div style="
+    border: 1px solid #ddd;
+    border-radius: 15px;
+    padding: 16px;
+    margin-bottom: 15px;
+    background-color: #fafafa;
+    box-shadow: 0px 2px 4px rgba(0,0,0,0.05);
+">
+    <div style="display: flex; justify-content: space-between; align-items: center;">
+        <h4 style="margin: 0;">👤 {Employee_Name}</h4>
+        <span style="color: white; background-color: {status_color};
+            padding: 5px 10px; border-radius: 8px; font-size: 12px;">
+            {EmploymentStatus}
+        </span>
+    </div>
+    <p style="margin: 5px 0 10px 0; font-weight: 500; color: #555;">{Position} - {Department}</p>
+    <div style="display: flex; flex-wrap: wrap; gap: 12px; font-size: 14px; color: #333;">
+        <div>📅 <b>Tenure:</b> {TenureYears} Years</div>
+        <div>💰 <b>Salary:</b> ${MonthlyPay}</div>
+        <div>👨‍💼 <b>Manager:</b> {ManagerName}</div>
+        <div>🎯 <b>Performance:</b> {PerformanceScore}</div>{risk_html}
+    </div>
+    <hr style="margin: 10px 0; border: none; border-top: 1px solid #eee;">
+    <div style="font-size: 13px; color: #555;">
+        🧠 <b>Gender:</b> {Sex} &nbsp;&nbsp;|&nbsp;&nbsp;
+        🎂 <b>Age:</b> {Age} &nbsp;&nbsp;|&nbsp;&nbsp;
+        💍 <b>Marital Status:</b> {MaritalDesc} &nbsp;&nbsp;|&nbsp;&nbsp;
+        🌏 <b>Race:</b> {RaceDesc} &nbsp;&nbsp;|&nbsp;&nbsp;
+        📍 <b>State:</b> {State}
+    </div>
+</div>
+"""
+_TEMPLATE_PARTS = list(string.Formatter().parse(CARD_TEMPLATE))
+
+
+# nilai per kolom yang sudah diformat sebagai string
+def _card_fields(page_df):
+    fields = {}
+    for _, field, _, _ in _TEMPLATE_PARTS:
+        if field and field in page_df.columns:
+            fields[field] = page_df[field].astype(str)
+    fields["TenureYears"] = page_df["TenureYears"].map("{:.1f}".format)
+    fields["MonthlyPay"] = page_df["MonthlyPay"].map("{:,.0f}".format)
+    fields["status_color"] = page_df["EmploymentStatus"].astype(str).map(STATUS_COLORS).fillna(DEFAULT_STATUS_COLOR)
+    fields["risk_html"] = _risk_html(page_df[RISK_COLUMN] if RISK_COLUMN in page_df.columns else None, page_df.index)
+    return fields
+
+
+# badge risiko keluar (kolom AttritionRisk, lihat attrition.py); kosong kalau tidak di-skor
+def _risk_html(risk, index):
+    html = pd.Series("", index=index, dtype=object)
+    if risk is None:
+        return html
+    scored = risk.notna()
+    # halaman tanpa karyawan yang di-skor (mis. semua sudah keluar): np.where kosong jadi float
+    if not scored.any():
+        return html
+    color = np.where(risk[scored] >= HIGH_RISK, "#e53e3e", "#2ecc71")
+    html[scored] = ('<div>⚠️ <b>Attrition Risk:</b> <span style="color: ' + color + ';">'
+                    + risk[scored].map("{:.0%}".format) + "</span></div>")
+    return html
+
+
+# HTML semua card dalam satu halaman, disusun per kolom (tanpa iterrows)
+def render_cards(page_df):
+    if page_df.empty:
+        return ""
+    fields = _card_fields(page_df)
+    html = pd.Series("", index=page_df.index, dtype=object)
+    for literal, field, _, _ in _TEMPLATE_PARTS:
+        html = html + literal
+        if field:
+            html = html + fields[field]
+    return "".join(html)
+
+
+# ===============================
+# PAGINATION
+# ===============================
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
+
+
+def page_slice(df, page, page_size):
+    page = min(max(1, page), page_count(len(df), page_size))
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+
+# ===============================
+# NAME SEARCH INDEX
+# ===============================
+def normalize_name(name):
+    return " ".join(str(name).casefold().split())
+
+
+def _grams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+# postings n-gram (1-3 huruf) atas Employee_Name, disimpan sebagai array slot yang sudah
+# terurut. Query panjang dipecah jadi trigram, postings-nya di-intersect, lalu kandidat
+# dicek ulang dengan substring match (hasil = str.contains case-insensitive).
+# Slot = posisi baris saat index dibangun; patched() menambah slot baru untuk nama yang
+# berubah dan mematikan slot lama, lalu memetakan slot ke posisi baris frame yang baru.
+class NameSearchIndex:
+    def __init__(self, names, ids=None):
+        self.names = [normalize_name(n) if pd.notna(n) else "" for n in names]
+        self.ids = list(ids) if ids is not None else list(range(len(self.names)))
+        self.n_rows = len(self.names)
+
+        # gram disimpan sebagai kode int per blok nama, bukan jutaan string Python sekaligus
+        gram_codes = {}
+        code_blocks, row_blocks = [], []
+        tokens = {}
+        for start in range(0, len(self.names), _BUILD_BLOCK):
+            codes, rows = [], []
+            for pos in range(start, min(start + _BUILD_BLOCK, len(self.names))):
+                name = self.names[pos]
+                name_grams = {name[i:i + k] for k in (1, 2, 3) for i in range(len(name) - k + 1)}
+                codes.extend(gram_codes.setdefault(g, len(gram_codes)) for g in name_grams)
+                rows.extend([pos] * len(name_grams))
+                for token in _tokenize(name):
+                    tokens.setdefault(token, []).append(pos)
+            code_blocks.append(np.asarray(codes, dtype="int32"))
+            row_blocks.append(np.asarray(rows, dtype="int32"))
+
+        self._postings = _build_postings(np.concatenate(code_blocks or [_EMPTY]),
+                                         np.concatenate(row_blocks or [_EMPTY]), list(gram_codes))
+        self._tokens = {token: np.unique(np.asarray(pos, dtype="int64")) for token, pos in tokens.items()}
+        self._sorted_tokens = sorted(self._tokens)
+        # diisi oleh patched(): postings slot tambahan, slot yang masih hidup, slot -> baris
+        self._extra = {}
+        self._alive = None
+        self._slot_rows = None
+
+    @classmethod
+    def from_frame(cls, df, column="Employee_Name", key="EmpID"):
+        ids = df[key] if key in df.columns else None
+        return cls(df[column], ids)
+
+    def __len__(self):
+        return self.n_rows
+
+    def _lookup(self, gram):
+        main = self._postings.get(gram, _EMPTY)
+        extra = self._extra.get(gram)
+        return np.concatenate([main, np.asarray(extra, dtype="int64")]) if extra else main
+
+    # slot hasil pencarian -> posisi baris frame saat ini (terurut)
+    def _rows(self, slots):
+        if self._alive is not None:
+            slots = slots[self._alive[slots]]
+        if self._slot_rows is None:
+            return slots
+        return np.sort(self._slot_rows[slots])
+
+    def _search_slots(self, query):
+        if len(query) <= 3:
+            return self._lookup(query)
+        postings = sorted((self._lookup(g) for g in _grams(query, 3)), key=len)
+        result = postings[0]
+        for other in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, other, assume_unique=True)
+        return np.array([pos for pos in result if query in self.names[pos]], dtype="int64")
+
+    # posisi baris yang namanya mengandung query (substring, case-insensitive)
+    def search(self, query, fuzzy=False):
+        query = normalize_name(query)
+        if not query:
+            return np.arange(self.n_rows)
+        result = self._rows(self._search_slots(query))
+        if fuzzy and not len(result):
+            result = self.fuzzy_search(query)
+        return result
+
+    # semua token query harus cocok sebagai awalan token nama ("joh smi" -> "Smith, John")
+    def prefix_search(self, query):
+        result = None
+        for token in _tokenize(normalize_name(query)):
+            lo = bisect.bisect_left(self._sorted_tokens, token)
+            hi = bisect.bisect_left(self._sorted_tokens, token + "￿")
+            matches = [self._tokens[t] for t in self._sorted_tokens[lo:hi]]
+            rows = np.unique(np.concatenate(matches)) if matches else _EMPTY
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return np.arange(self.n_rows) if result is None else self._rows(result)
+
+    # typo-tolerant: token nama yang mirip (difflib) dengan setiap token query
+    def fuzzy_search(self, query, cutoff=0.8):
+        result = None
+        for token in _tokenize(normalize_name(query)):
+            close = difflib.get_close_matches(token, self._sorted_tokens, n=20, cutoff=cutoff)
+            rows = np.unique(np.concatenate([self._tokens[t] for t in close])) if close else _EMPTY
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return _EMPTY if result is None else self._rows(result)
+
+    def search_ids(self, query, fuzzy=False):
+        ids = np.asarray(self.ids, dtype=object)
+        order = self._slot_rows if self._slot_rows is not None else np.arange(len(self.ids))
+        rows = self.search(query, fuzzy=fuzzy)
+        # baris -> slot hidup lewat lookup balik
+        live = np.flatnonzero(self._alive) if self._alive is not None else np.arange(len(self.ids))
+        slot_of_row = np.empty(self.n_rows, dtype="int64")
+        slot_of_row[order[live]] = live
+        return ids[slot_of_row[rows]].tolist()
+
+    # ===============================
+    # INCREMENTAL PATCH
+    # ===============================
+    # index baru untuk frame df: slot milik stale_ids (diubah/dihapus) dimatikan, nama dari
+    # new_rows (baru/diubah) ditambahkan sebagai slot baru. Biaya sebanding dengan jumlah
+    # perubahan, kecuali pemetaan slot -> baris (satu get_indexer vektor).
+    def patched(self, df, stale_ids, new_rows, column="Employee_Name", key="EmpID"):
+        other = copy.copy(self)
+        other.names, other.ids = list(self.names), list(self.ids)
+        other._extra = {gram: list(slots) for gram, slots in self._extra.items()}
+        other._tokens = dict(self._tokens)
+        other._sorted_tokens = list(self._sorted_tokens)
+
+        alive = np.ones(len(self.names), dtype=bool) if self._alive is None else self._alive.copy()
+        if len(stale_ids):
+            alive &= ~pd.Index(self.ids).isin(list(stale_ids))
+
+        for name, emp_id in zip(new_rows[column], new_rows[key]):
+            name = normalize_name(name) if pd.notna(name) else ""
+            slot = len(other.names)
+            other.names.append(name)
+            other.ids.append(emp_id)
+            for gram in {name[i:i + k] for k in (1, 2, 3) for i in range(len(name) - k + 1)}:
+                other._extra.setdefault(gram, []).append(slot)
+            for token in set(_tokenize(name)):
+                if token not in other._tokens:
+                    bisect.insort(other._sorted_tokens, token)
+                other._tokens[token] = np.append(other._tokens.get(token, _EMPTY), slot)
+
+        other._alive = np.concatenate([alive, np.ones(len(other.names) - len(alive), dtype=bool)])
+        other._slot_rows = pd.Index(df[key]).get_indexer(pd.Index(other.ids))
+        # slot hidup yang id-nya tidak ada lagi di frame ikut dimatikan
+        other._alive &= other._slot_rows >= 0
+        other.n_rows = len(df)
+        return other
+
+
+_EMPTY = np.empty(0, dtype="int64")
+_BUILD_BLOCK = 50_000
+
+
+def _tokenize(name):
+    return [t for t in re.split(r"[^\w]+", name) if t]
+
+
+# codes = kode gram per (nama, gram unik), rows = posisi nama (naik)
+def _build_postings(codes, rows, grams):
+    if not len(codes):
+        return {}
+    # stable sort per gram menjaga urutan posisi baris
+    order = np.argsort(codes, kind="stable")
+    codes, rows = codes[order], rows[order]
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(codes)]])
+    return {grams[codes[s]]: rows[s:e] for s, e in zip(starts, ends)}
+
+
+# ===============================
+# FILTER INDEX
+# ===============================
+# per kolom categorical: codes per baris + array posisi baris per kategori.
+# kombinasi filter dimulai dari array terkecil lalu dicek ke codes kolom lain,
+# jadi biayanya sebanding dengan hasil, bukan dengan jumlah baris frame.
+class FilterIndex:
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.codes = {}
+        self.categories = {}
+        self.rows = {}
+        for col in columns:
+            values = df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype("category")
+            codes = values.cat.codes.to_numpy()
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(values.cat.categories) + 1))
+            self.codes[col] = codes
+            self.categories[col] = values.cat.categories
+            self.rows[col] = [order[bounds[k]:bounds[k + 1]] for k in range(len(values.cat.categories))]
+
+    # daftar pilihan dropdown (kategori yang punya baris)
+    def options(self, column):
+        return [cat for cat, rows in zip(self.categories[column], self.rows[column]) if len(rows)]
+
+    def _code(self, column, value):
+        matches = np.flatnonzero(self.categories[column] == value)
+        return int(matches[0]) if len(matches) else -2
+
+    # posisi baris yang lolos semua filter (None = tidak ada filter sama sekali)
+    def select(self, filters, within=None):
+        filters = {col: self._code(col, value) for col, value in filters.items() if value != "All"}
+        if not filters and within is None:
+            return None
+
+        candidates = [self.rows[col][code] if code >= 0 else _EMPTY for col, code in filters.items()]
+        if within is not None:
+            candidates.append(np.asarray(within, dtype="int64"))
+        rows = min(candidates, key=len)
+        for col, code in filters.items():
+            rows = rows[self.codes[col][rows] == code]
+        return rows
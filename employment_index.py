@@ -0,0 +1,206 @@
+import bisect
+import copy
+
+import numpy as np
+import pandas as pd
+
+# tanggal disimpan sebagai jumlah hari (int64); tanggal kosong = tidak terbatas
+OPEN_END = np.iinfo("int64").max
+FREQS = {"D": "D", "W": "W", "M": "M", "Q": "Q", "Y": "Y"}
+
+
+def to_days(values):
+    days = pd.to_datetime(pd.Series(values), errors="coerce").to_numpy(dtype="datetime64[D]")
+    out = days.astype("int64")
+    out[np.isnat(days)] = OPEN_END
+    return out
+
+
+# batas periode (hari pertama, hari terakhir) untuk tanggal + granularitas
+def period_bounds(date, freq="D"):
+    if freq == "Y" and isinstance(date, (int, np.integer)):
+        date = pd.Timestamp(year=int(date), month=1, day=1)
+    period = pd.Period(pd.Timestamp(date), freq=FREQS[freq])
+    start = period.start_time.to_datetime64().astype("datetime64[D]").astype("int64")
+    end = period.end_time.to_datetime64().astype("datetime64[D]").astype("int64")
+    return int(start), int(end)
+
+
+# ===============================
+# EMPLOYMENT INTERVAL INDEX
+# ===============================
+# karyawan aktif dalam periode [start, end] jika hire <= end dan term >= start, jadi
+#   headcount = #(hire <= end) - #(term < start)
+# dua-duanya dijawab dengan binary search di array hire/term yang sudah diurutkan.
+# termination sebelum hire (data salah) tidak dipotong, sama dengan filter TermYear >= tahun;
+# baris seperti ini dikoreksi terpisah (_reversed), karena rumus di atas mengurangi
+# baris dengan term < start yang belum di-hire (hire > end).
+# update baru ditampung di buffer kecil (sorted list) dan baru digabung ke array
+# utama saat buffer penuh, jadi tidak perlu rebuild setiap ada hire/termination.
+class EmploymentIndex:
+    def __init__(self, keys, hire_days, term_days, buffer_size=4096):
+        self.keys = list(keys)
+        self._hire = np.asarray(hire_days, dtype="int64").copy()
+        self._term = np.asarray(term_days, dtype="int64").copy()
+        self._alive = np.ones(len(self._hire), dtype=bool)
+        self._reversed = set(np.flatnonzero(self._term < self._hire).tolist())
+        self._size = len(self._hire)
+        self.positions = {key: pos for pos, key in enumerate(self.keys)}
+        self.buffer_size = buffer_size
+        self._compact()
+
+    @classmethod
+    def from_frame(cls, df, key="EmpID", **kwargs):
+        keys = df[key] if key in df.columns and df[key].is_unique else range(len(df))
+        return cls(keys, to_days(df["DateofHire"]), to_days(df["DateofTermination"]), **kwargs)
+
+    # salinan independen (array & buffer delta), supaya pembaca index lama tidak terganggu update
+    def copy(self):
+        other = copy.copy(self)
+        other.keys = list(self.keys)
+        other.positions = dict(self.positions)
+        other._hire, other._term, other._alive = self._hire.copy(), self._term.copy(), self._alive.copy()
+        other._reversed = set(self._reversed)
+        other._hire_add, other._hire_del = list(self._hire_add), list(self._hire_del)
+        other._term_add, other._term_del = list(self._term_add), list(self._term_del)
+        return other
+
+    # view ke bagian array yang terisi (array dialokasikan dengan kapasitas lebih)
+    @property
+    def hire(self):
+        return self._hire[:self._size]
+
+    @property
+    def term(self):
+        return self._term[:self._size]
+
+    @property
+    def alive(self):
+        return self._alive[:self._size]
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def _compact(self):
+        self._hire_sorted = np.sort(self.hire[self.alive])
+        self._term_sorted = np.sort(self.term[self.alive])
+        self._hire_order = np.flatnonzero(self.alive)[np.argsort(self.hire[self.alive], kind="stable")]
+        self._compacted_len = self._size
+        # delta sejak compaction terakhir
+        self._hire_add, self._hire_del = [], []
+        self._term_add, self._term_del = [], []
+
+    def _pending(self):
+        return len(self._hire_add) + len(self._hire_del) + len(self._term_add) + len(self._term_del)
+
+    # ===============================
+    # QUERY
+    # ===============================
+    def _count_le(self, main, add, delete, x):
+        return (np.searchsorted(main, x, side="right")
+                + bisect.bisect_right(add, x) - bisect.bisect_right(delete, x))
+
+    # baris term < hire yang terhitung keluar sebelum periode padahal belum di-hire
+    def _reversed_between(self, starts, ends):
+        if not self._reversed:
+            return 0
+        positions = np.fromiter(self._reversed, dtype="int64", count=len(self._reversed))
+        hire, term = self.hire[positions][:, None], self.term[positions][:, None]
+        return ((term < starts) & (hire > ends)).sum(axis=0)
+
+    def headcount_between(self, start, end):
+        hired = self._count_le(self._hire_sorted, self._hire_add, self._hire_del, end)
+        left = self._count_le(self._term_sorted, self._term_add, self._term_del, start - 1)
+        return int(hired - left + np.sum(self._reversed_between(np.array([start]), np.array([end]))))
+
+    def headcount(self, date, freq="D"):
+        return self.headcount_between(*period_bounds(date, freq))
+
+    # headcount untuk banyak periode sekaligus (mis. semua bulan untuk chart)
+    def headcount_series(self, dates, freq="M"):
+        periods = pd.PeriodIndex(pd.to_datetime(pd.Series(dates)).dt.to_period(FREQS[freq]).unique()).sort_values()
+        starts = periods.start_time.to_numpy(dtype="datetime64[D]").astype("int64")
+        ends = periods.end_time.to_numpy(dtype="datetime64[D]").astype("int64")
+        counts = (np.searchsorted(self._hire_sorted, ends, side="right")
+                  - np.searchsorted(self._term_sorted, starts - 1, side="right"))
+        if self._pending():
+            counts = counts + np.array([
+                bisect.bisect_right(self._hire_add, e) - bisect.bisect_right(self._hire_del, e)
+                - bisect.bisect_right(self._term_add, s - 1) + bisect.bisect_right(self._term_del, s - 1)
+                for s, e in zip(starts, ends)
+            ], dtype="int64")
+        counts = counts + self._reversed_between(starts, ends)
+        return pd.Series(counts, index=periods, name="Headcount")
+
+    # posisi baris (urutan saat ditambahkan) yang aktif dalam periode
+    def active_positions(self, date, freq="D"):
+        start, end = period_bounds(date, freq)
+        cand = self._hire_order[:np.searchsorted(self._hire_sorted, end, side="right")]
+        # baris yang ditambahkan setelah compaction terakhir
+        cand = np.concatenate([cand, np.arange(self._compacted_len, self._size)])
+        keep = self.alive[cand] & (self.hire[cand] <= end) & (self.term[cand] >= start)
+        return np.sort(cand[keep])
+
+    def active_keys(self, date, freq="D"):
+        return [self.keys[pos] for pos in self.active_positions(date, freq)]
+
+    def is_active(self, key, date, freq="D"):
+        pos = self.positions.get(key)
+        if pos is None or not self.alive[pos]:
+            return False
+        start, end = period_bounds(date, freq)
+        return bool(self.hire[pos] <= end and self.term[pos] >= start)
+
+    # ===============================
+    # INCREMENTAL UPDATE
+    # ===============================
+    def upsert(self, key, hire, term=None):
+        hire_day = int(to_days([hire])[0])
+        term_day = int(to_days([term])[0])
+        pos = self.positions.get(key)
+
+        if pos is not None and self.alive[pos] and self.hire[pos] == hire_day:
+            # hanya tanggal keluar yang berubah (kasus paling umum)
+            if self.term[pos] != term_day:
+                bisect.insort(self._term_del, int(self.term[pos]))
+                bisect.insort(self._term_add, term_day)
+                self.term[pos] = term_day
+                if term_day < hire_day:
+                    self._reversed.add(pos)
+                else:
+                    self._reversed.discard(pos)
+        else:
+            if pos is not None:
+                self._kill(pos)
+            self._append(key, hire_day, term_day)
+            bisect.insort(self._hire_add, hire_day)
+            bisect.insort(self._term_add, term_day)
+
+        if self._pending() > self.buffer_size:
+            self._compact()
+
+    def remove(self, key):
+        pos = self.positions.pop(key, None)
+        if pos is not None and self.alive[pos]:
+            self._kill(pos)
+
+    def _append(self, key, hire_day, term_day):
+        if self._size == len(self._hire):
+            # kapasitas digandakan supaya append tetap amortized O(1)
+            extra = max(self._size, 16)
+            self._hire = np.concatenate([self._hire, np.zeros(extra, dtype="int64")])
+            self._term = np.concatenate([self._term, np.zeros(extra, dtype="int64")])
+            self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        pos = self._size
+        self._hire[pos], self._term[pos], self._alive[pos] = hire_day, term_day, True
+        if term_day < hire_day:
+            self._reversed.add(pos)
+        self._size += 1
+        self.keys.append(key)
+        self.positions[key] = pos
+
+    def _kill(self, pos):
+        self.alive[pos] = False
+        self._reversed.discard(pos)
+        bisect.insort(self._hire_del, int(self.hire[pos]))
+        bisect.insort(self._term_del, int(self.term[pos]))
@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from ingest import peak_rss_mb
+
+DEFAULT_CHUNKSIZE = 20_000
+FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+# batas baris satu sheet Excel (termasuk header); sisanya lanjut ke sheet berikutnya
+XLSX_MAX_ROWS = 1_048_576
+# file export dashboard di folder temp; yang lebih tua dari ini (session ditinggal) dihapus
+TEMP_PREFIX = "hr-export-"
+STALE_SECONDS = 3600
+
+
+# ===============================
+# CHUNKS
+# ===============================
+# sumber export = iterator frame kecil: potongan frame pandas (iloc, tanpa copy) atau
+# hasil query SQLite per fetchmany (SQLEngine.directory_chunks)
+def frame_chunks(df, chunksize=DEFAULT_CHUNKSIZE):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+# categorical jadi teks biasa supaya tipe kolom sama di semua chunk
+def _plain(chunk):
+    columns = {}
+    for col in chunk.columns:
+        values = chunk[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object).where(values.notna(), None)
+        columns[col] = values
+    return pd.DataFrame(columns, index=chunk.index)
+
+
+# ===============================
+# WRITERS
+# ===============================
+# setiap writer menulis chunk demi chunk ke file dan mengembalikan jumlah baris
+def write_csv(chunks, path):
+    rows, header = 0, True
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in chunks:
+            chunk.to_csv(f, header=header, index=False)
+            rows, header = rows + len(chunk), False
+    return rows
+
+
+def _arrow_schema(chunk):
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+    # kolom teks yang kosong semua di chunk pertama tetap bertipe string
+    return pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in schema],
+                     metadata=schema.metadata)
+
+
+def write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            chunk = _plain(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(path, _arrow_schema(chunk))
+            # satu row group per chunk
+            writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pd.DataFrame().to_parquet(path)
+    return rows
+
+
+# nilai per kolom sebagai objek Python untuk openpyxl: kosong = None, float32 lewat repr
+# terpendek (2747.2, bukan 2747.199951171875), tanggal jadi datetime
+def _xlsx_columns(chunk):
+    columns = []
+    for col in chunk.columns:
+        values = chunk[col]
+        missing = values.isna().to_numpy()
+        if pd.api.types.is_datetime64_dtype(values.dtype):
+            out = np.array(values.dt.to_pydatetime(), dtype=object)
+        elif values.dtype == "float32":
+            out = values.to_numpy().astype(str).astype("float64").astype(object)
+        elif pd.api.types.is_numeric_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+            out = np.array(values.tolist(), dtype=object)
+        else:
+            out = np.array(values.astype(object), dtype=object)
+        out[missing] = None
+        columns.append(out)
+    return columns
+
+
+def write_xlsx(chunks, path, sheet="Data"):
+    from openpyxl import Workbook
+
+    # write-only: baris langsung di-stream ke file sementara openpyxl, tidak disimpan di workbook
+    workbook = Workbook(write_only=True)
+    rows, sheet_rows, worksheet, header = 0, 0, None, None
+    for chunk in chunks:
+        if header is None:
+            header = [str(col) for col in chunk.columns]
+        for row in zip(*_xlsx_columns(chunk)):
+            if worksheet is None or sheet_rows == XLSX_MAX_ROWS:
+                worksheet = workbook.create_sheet(sheet if worksheet is None else f"{sheet} ({len(workbook.worksheets) + 1})")
+                worksheet.append(header)
+                sheet_rows = 1
+            worksheet.append(row)
+            sheet_rows += 1
+        rows += len(chunk)
+    if worksheet is None:
+        workbook.create_sheet(sheet).append(header or [])
+    workbook.save(path)
+    return rows
+
+
+WRITERS = {"xlsx": write_xlsx, "csv": write_csv, "parquet": write_parquet}
+
+
+# tulis semua chunk ke path + laporan throughput (baris/detik) dan memori
+def export(chunks, fmt, path):
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    rows = WRITERS[fmt](chunks, path)
+    seconds = time.perf_counter() - start
+    return {
+        "format": fmt,
+        "path": path,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else None,
+        "file_mb": round(os.path.getsize(path) / 2**20, 2),
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# ===============================
+# TEMP FILES
+# ===============================
+def temp_path(fmt, name="export"):
+    fd, path = tempfile.mkstemp(prefix=f"{TEMP_PREFIX}{name}-", suffix=f".{fmt}")
+    os.close(fd)
+    return path
+
+
+def discard(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# hapus file export lama yang tidak pernah di-download / dibuang oleh session-nya
+def sweep(directory=None, max_age=STALE_SECONDS):
+    directory = directory or tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(directory):
+        try:
+            if entry.name.startswith(TEMP_PREFIX) and entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            # sudah dihapus session / proses lain
+            pass
+    return removed
+
+
+# ===============================
+# CLI
+# ===============================
+def parse_filters(items):
+    filters = {}
+    for item in items or []:
+        column, _, value = item.partition("=")
+        filters[column] = value
+    return filters
+
+
+def main():
+    from data_loader import CSV_URL, DataLoader, make_source
+    from directory import FilterIndex, NameSearchIndex
+
+    parser = argparse.ArgumentParser(description="Export the filtered employee directory or the KPI history")
+    parser.add_argument("table", choices=["directory", "kpis"])
+    parser.add_argument("--source", default=os.environ.get("HR_DATA_SOURCE", CSV_URL))
+    parser.add_argument("--db", default=os.environ.get("HR_SQLITE") or None,
+                        help="SQLite file from sql_backend.py (rows are streamed from a query)")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--out", help="output file (default: <table>.<format>)")
+    parser.add_argument("--filter", action="append", metavar="COLUMN=VALUE", help="directory filter, repeatable")
+    parser.add_argument("--search", default="", help="employee name search")
+    parser.add_argument("--sort", help="sort column")
+    parser.add_argument("--descending", action="store_true")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    out = args.out or f"{args.table}.{args.format}"
+    filters = parse_filters(args.filter)
+    if args.db:
+        from sql_backend import SQLEngine
+
+        engine = SQLEngine(args.db)
+        if args.table == "kpis":
+            chunks = [engine.kpi_table()]
+        else:
+            chunks = engine.directory_chunks(filters, args.search, args.sort, not args.descending,
+                                             chunksize=args.chunksize)
+    else:
+        from hr_engine import MetricsEngine
+
+        df = DataLoader(make_source(args.source)).get()
+        if args.table == "kpis":
+            chunks = [MetricsEngine(df).kpi_table()]
+        else:
+            within = NameSearchIndex.from_frame(df).search(args.search) if args.search else None
+            rows = FilterIndex(df, list(filters)).select(filters, within=within)
+            detail_df = df if rows is None else df.iloc[rows]
+            if args.sort:
+                detail_df = detail_df.sort_values(args.sort, ascending=not args.descending, kind="stable")
+            chunks = frame_chunks(detail_df, args.chunksize)
+    print(json.dumps(export(chunks, args.format, out), indent=2))
+
+
+if __name__ == "__main__":
+    main()
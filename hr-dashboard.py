@@ -1,10 +1,23 @@
+import functools
+import os
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
 import matplotlib as plt
 import seaborn as sns
 
+from attrition import HIGH_RISK, RISK_COLUMN, RiskModels, department_risk
+from data_loader import loader_from_env
+from directory import PAGE_SIZES, page_count, page_slice, render_cards
+import charts
+import export
+from incremental import IndexRegistry
+from profiling import Profiler
+from shared_cache import DEFAULT_MAX_MB, SharedCache
+from sql_backend import MAX_TABLE_ROWS, SQLEngine
+from survival import GROUPINGS
+from turnover_cube import PERIOD_OPTIONS
+
 # ===============================
 # STREAMLIT LAYOUT & TITLE
 # ===============================
@@ -51,52 +64,151 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# LOAD & PREPARE DATA
-csv_url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTQyERWzY558YfSVl-9PpWL_EJszeOYxx-aqt2Maav1dQmyKXl3G7wy7SlSk2EMpg/pub?output=csv"
-df = pd.read_csv(csv_url)
-
-# konversi kolom 
-df["DateofHire"] = pd.to_datetime(df["DateofHire"], errors="coerce")
-df["DateofTermination"] = pd.to_datetime(df["DateofTermination"], errors="coerce")
-# tambahan kolom tahun
-df["HireYear"] = df["DateofHire"].dt.year
-df["TermYear"] = df["DateofTermination"].dt.year
-# masa kerja (tahun)
-df["TenureYears"] = np.where(
-    df["DateofTermination"].notna(),
-    (df["DateofTermination"] - df["DateofHire"]).dt.days / 365,
-    (pd.to_datetime("today") - df["DateofHire"]).dt.days / 365
-)
+# profiling per bagian (HR_PROFILE=1 atau ?debug=1), panel debug di sidebar paling bawah
+profiler = Profiler(enabled=os.environ.get("HR_PROFILE") == "1" or st.query_params.get("debug") == "1")
 
-# gaji bulanan 40jam/minggu = 160 jam/bulan 
-df["PayRate"] = df["PayRate"].fillna(0)
-df["MonthlyPay"] = df["PayRate"] * 160
+# rerun fragment saja tidak sampai ke panel sidebar (profiler run penuh sudah ditutup):
+# rerun itu diukur dengan profiler sendiri dan tabelnya ditampilkan di dalam fragment
+def profiled_fragment(func):
+    @functools.wraps(func)
+    def run():
+        if not profiler.ended:
+            return func(profiler)
+        prof = Profiler(enabled=True)
+        func(prof)
+        prof.end()
+        with st.expander(f"🛠️ Debug: fragment rerun ({prof.total_ms():,.1f} ms)"):
+            st.dataframe(prof.summary().drop(columns="mem_start_mb"), use_container_width=True, hide_index=True)
+    return st.fragment(run)
+
+# LOAD & PREPARE DATA
+# loader disimpan lintas rerun & session; data di-fetch ulang setelah TTL (HR_DATA_TTL)
+# sumber data bisa diganti lewat HR_DATA_SOURCE (URL, file CSV atau Parquet)
+@st.cache_resource
+def get_loader():
+    return loader_from_env()
+
+# engine metrik (snapshot KPI per tahun, index masa kerja, cube turnover) + index
+# Employee Directory per versi dataset; versi baru di-patch dari delta loader kalau bisa
+@st.cache_resource
+def get_index_registry():
+    return IndexRegistry()
+
+# HR_SQLITE=<file>: tabel karyawan ada di file SQLite (sql_backend.py build), KPI, agregat
+# & directory dijawab dengan query; frame tidak dimuat. File dibangun ulang = engine baru
+@st.cache_resource(max_entries=1)
+def get_sql_engine(path, mtime):
+    return SQLEngine(path)
+
+sql_db = os.environ.get("HR_SQLITE")
+profiler.section("data.load")
+if sql_db:
+    engine = get_sql_engine(sql_db, os.path.getmtime(sql_db))
+    df, indexes = None, None
+    data_version = engine.version
+    total_rows = engine.rows
+    profiler.count(total_rows)
+else:
+    loader = get_loader()
+    df = loader.get()
+    data_version = loader.version
+    total_rows = len(df)
+    profiler.count(total_rows)
+
+    profiler.section("engine")
+    indexes = get_index_registry().get(df, loader.version, loader.last_delta,
+                                       loader.accumulator_for(loader.version))
+    engine = indexes.engine
+
+# model risiko keluar per versi dataset: dilatih di thread latar (tidak di request path),
+# disimpan di folder snapshot; risk = None selama model belum siap. HR_ATTRITION=0 mematikan
+@st.cache_resource
+def get_risk_models():
+    return RiskModels(model_dir=loader.snapshot_dir or None, retry_after=loader.ttl)
+
+show_attrition = not sql_db and os.environ.get("HR_ATTRITION", "1") != "0"
+risk_models = None if sql_db else get_risk_models()
+risk = None
+if show_attrition:
+    profiler.section("attrition.score")
+    risk = risk_models.get(df, loader.version)
+
+# cache agregat bersama semua session, kunci (versi dataset, tahun, nama agregat)
+@st.cache_resource
+def get_aggregate_cache():
+    return SharedCache(max_bytes=int(os.environ.get("HR_AGG_CACHE_MB", DEFAULT_MAX_MB)) * 2**20)
+
+aggregate_cache = get_aggregate_cache()
+
+def cached(name, compute, year=None):
+    return aggregate_cache.get_or_compute(data_version, year, name, compute)
+
+# figure Plotly yang sudah jadi (JSON), kunci (versi dataset, tahun, chart, periode);
+# HR_PREWARM_FIGURES=1 membuat semua chart untuk semua tahun di thread latar
+@st.cache_resource
+def get_figure_cache():
+    return charts.FigureCache(max_bytes=int(os.environ.get("HR_FIGURE_CACHE_MB", charts.DEFAULT_MAX_MB)) * 2**20)
+
+figure_cache = get_figure_cache()
+if os.environ.get("HR_PREWARM_FIGURES") == "1":
+    figure_cache.prewarm_async(engine, data_version)
+
+def figure(chart_id, build, year=None, period=None):
+    return figure_cache.get(data_version, chart_id, build, year, period)
+
+# export dua langkah: "Prepare" menulis chunk demi chunk ke file sementara (xlsx write-only,
+# csv, parquet), baru tombol download muncul. File per session disimpan di session_state
+# bersama signature (versi dataset, format, filter...). File dihapus setelah di-download,
+# saat signature berubah, atau oleh sweep kalau session-nya ditinggal (export.STALE_SECONDS)
+def discard_export(key):
+    prepared = st.session_state.pop(key, None)
+    if prepared:
+        export.discard(prepared[1])
+
+def export_controls(key, label, chunks, signature=(), prof=profiler):
+    col_format, col_prepare, col_download = st.columns([1, 1, 2])
+    with col_format:
+        fmt = st.selectbox("Export format:", list(export.FORMATS), key=f"{key}_format")
+    signature = (data_version, fmt) + tuple(signature)
+    with col_prepare:
+        st.write("")
+        if st.button(f"📦 Prepare {label}", key=f"{key}_prepare"):
+            discard_export(key)
+            export.sweep()
+            path = export.temp_path(fmt, key)
+            prof.section(f"export.{key}")
+            report = export.export(chunks(), fmt, path)
+            prof.count(report["rows"])
+            st.session_state[key] = (signature, path, report)
+    prepared = st.session_state.get(key)
+    if prepared and (prepared[0] != signature or not os.path.exists(prepared[1])):
+        discard_export(key)
+        prepared = None
+    with col_download:
+        if prepared:
+            _, path, report = prepared
+            st.write("")
+            # Streamlit membaca seluruh file ke memori (media store) selama tombol ini tampil
+            with open(path, "rb") as f:
+                st.download_button(f"⬇️ Download {label}", f, file_name=f"hr-{key}.{fmt}",
+                                   mime=export.FORMATS[fmt], key=f"{key}_download",
+                                   on_click=discard_export, args=(key,))
+            st.caption(f"{report['rows']:,} rows · {report['file_mb']} MB · "
+                       f"{report['rows_per_sec'] or 0:,} rows/sec")
 
 # ===============================
 # SIDEBAR FILTER
 # ===============================
 st.sidebar.header("📅 Filter Data")
-years = sorted(pd.concat([df["HireYear"], df["TermYear"]], ignore_index=True).dropna().astype(int).unique(),reverse=True)
+years = engine.years()
 selected_year = st.sidebar.selectbox("Select Year", years, index=0)
 prev_year = selected_year - 1
 
-# Karyawan aktif pada akhir tahun
-active_curr = df[
-    (df["HireYear"] <= selected_year) &
-    ((df["TermYear"].isna()) | (df["TermYear"] >= selected_year)) &
-    (df["EmploymentStatus"].str.lower() == "active")
-]
-
-# Karyawan aktif pada tahun sebelumnya
-active_prev = df[
-    (df["HireYear"] <= prev_year) &
-    ((df["TermYear"].isna()) | (df["TermYear"] >= prev_year)) &
-    (df["EmploymentStatus"].str.lower() == "active")
-]
-
-# karyawan yang keluar pada tahun itu
-term_curr = df[df["TermYear"] == selected_year]
-term_prev = df[df["TermYear"] == prev_year]
+# Karyawan aktif pada akhir tahun (None di mode SQL: agregat dihitung di database)
+profiler.section("active_employees")
+active_curr = engine.active_employees(selected_year)
+active_total = engine.active_count(selected_year, active_curr)
+profiler.count(active_total)
 
 st.sidebar.markdown(
     """
@@ -118,57 +230,118 @@ st.sidebar.markdown(
 )
 
 # KPI 
+profiler.section("kpis")
+kpis = engine.kpis(selected_year)
+
 # 1. Total tenaga kerja aktif
-active_curr_count = len(active_curr)
-active_prev_count = len(active_prev)
-active_change = ((active_curr_count - active_prev_count) / active_prev_count * 100) if active_prev_count > 0 else 0
+active_curr_count, active_prev_count, active_change = kpis["active"].values()
 
 # 2. Jumlah karyawan keluar
-term_curr_count = len(term_curr)
-term_prev_count = len(term_prev)
-term_change = ((term_curr_count - term_prev_count) / term_prev_count * 100) if term_prev_count > 0 else 0
+term_curr_count, term_prev_count, term_change = kpis["left"].values()
 
 # 3. Tingkat turnover
-def calc_turnover(df, year):
-    aktif_awal = df[(df["HireYear"] <= year) & ((df["TermYear"].isna()) | (df["TermYear"] >= year))]
-    keluar = df[df["TermYear"] == year]
-    rate = (len(keluar) / len(aktif_awal) * 100) if len(aktif_awal) > 0 else 0
-    return len(keluar), len(aktif_awal), round(rate, 2)
-
-term_curr_count, active_start_count, turnover_curr = calc_turnover(df, selected_year)
-term_prev_count, active_start_prev_count, turnover_prev = calc_turnover(df, prev_year)
-turnover_change = turnover_curr - turnover_prev
+turnover_curr, turnover_prev, turnover_change = kpis["turnover"].values()
 
 # 4. Rata-rata lama bekerja
-def active_tenure(df, year):
-    aktif = df[(df["HireYear"] <= year) & ((df["TermYear"].isna()) | (df["TermYear"] >= year))].copy()
-    aktif["TenureYears"] = aktif.apply(
-        lambda row: ((min(pd.Timestamp(year=year, month=12, day=31), row["DateofTermination"] if pd.notna(row["DateofTermination"]) else pd.Timestamp(year=year, month=12, day=31)) - row["DateofHire"]).days) / 365.25, axis=1)
-    return aktif["TenureYears"].mean() if not aktif.empty else 0
-
-avg_tenure_curr = active_tenure(df, selected_year)
-avg_tenure_prev = active_tenure(df, prev_year)
-tenure_change = ((avg_tenure_curr - avg_tenure_prev) / avg_tenure_prev * 100) if avg_tenure_prev > 0 else 0
+avg_tenure_curr, avg_tenure_prev, tenure_change = kpis["tenure"].values()
 
 # 5. Rata-rata gaji bulanan
-def avg_monthly_pay(df, year):
-    aktif = df[(df["HireYear"] <= year) & ((df["TermYear"].isna()) | (df["TermYear"] >= year))].copy()
-    # monthly pay 
-    return aktif["MonthlyPay"].mean() if not aktif.empty else 0
+avg_salary_curr, avg_salary_prev, salary_change = kpis["salary"].values()
 
-avg_salary_curr = avg_monthly_pay(df, selected_year)
-avg_salary_prev = avg_monthly_pay(df, prev_year)
-salary_change = ((avg_salary_curr - avg_salary_prev) / avg_salary_prev * 100) if avg_salary_prev > 0 else 0
+# ===============================
+# TAB
+# ===============================
+tab1, tab2, tab3 = st.tabs(["📊 HR Dashboard", "👥 Employee Details", "👨‍💼 Manager View"])
 
-# usia karyawan
-if "Age" not in df.columns:
-    df["Age"] = ((pd.to_datetime("today") - pd.to_datetime(df["DOB"], errors="coerce")).dt.days / 365.25).round(1)
+# ===============================
+# TURNOVER TREND SECTION
+# ===============================
+# fragment: pilihan periode hanya memicu rerun bagian ini
+@profiled_fragment
+def turnover_trend_section(prof):
+    st.markdown("<br>", unsafe_allow_html=True)
+    col_note, col_filter = st.columns([3, 1])
+
+    with col_note:
+        st.markdown("<h3>📈 Turnover Trend</h3>", unsafe_allow_html=True)
+        st.markdown("This filter exclusively modifies the Turnover Trend chart.", unsafe_allow_html=True)
+
+    with col_filter:
+        st.write("") 
+        period_options = list(PERIOD_OPTIONS)
+        period_option = st.selectbox("", period_options, index=0) 
+
+    # rollup per periode sudah dihitung di cube, ganti periode cukup ambil potongannya
+    prof.section("chart.turnover_trend")
+    turnover_trend = engine.turnover_trend(period_option)
+    prof.count(len(turnover_trend))
+
+    # Rata-rata turnover
+    avg_turnover = turnover_trend["Jumlah_Turnover"].mean()
+    fig_turnover = figure("turnover", lambda: charts.turnover_figure(turnover_trend, period_option),
+                          period=period_option)
+
+    st.plotly_chart(fig_turnover, use_container_width=True) 
+
+    # Insigt utama Turnover trend
+    with st.expander(f"📌 Quick Insight Turnover Trend ({period_option})"):
+        total_turnover = turnover_trend["Jumlah_Turnover"].sum()
+        max_turnover_row = turnover_trend.loc[turnover_trend["Jumlah_Turnover"].idxmax()]
+        min_turnover_row = turnover_trend.loc[turnover_trend["Jumlah_Turnover"].idxmin()]
+
+        def format_period(row):
+            if period_option == "Yearly":
+                return str(int(row["Year"]))
+            else:
+                return pd.to_datetime(row["TermDate"]).strftime("%Y-%m-%d")
+
+        st.write(f"📊 Total turnover: **{total_turnover} employees**")
+        st.write(f"📈 Average turnover: **{avg_turnover:.2f} employees**")
+        st.write(f"⬆️ Highest turnover: **{max_turnover_row['Jumlah_Turnover']}** employees on **{format_period(max_turnover_row)}**")
+        st.write(f"⬇️ Lowest turnover: **{min_turnover_row['Jumlah_Turnover']}** employees on **{format_period(min_turnover_row)}**")
 
 
 # ===============================
-# TAB
+# RETENTION & SURVIVAL SECTION
 # ===============================
-tab1, tab2 = st.tabs(["📊 HR Dashboard", "👥 Employee Details"])
+# fragment: pilihan pengelompokan hanya memicu rerun bagian ini
+@profiled_fragment
+def retention_section(prof):
+    st.markdown("<br>", unsafe_allow_html=True)
+    col_note, col_filter = st.columns([3, 1])
+
+    with col_note:
+        st.markdown("<h3>📉 Retention & Survival</h3>", unsafe_allow_html=True)
+        st.markdown("Share of employees still employed by months since hire (Kaplan–Meier, current employees counted until today), by hire cohort, department or position.", unsafe_allow_html=True)
+
+    with col_filter:
+        st.write("")
+        grouping = st.selectbox("Group by", list(GROUPINGS), index=0)
+    by = GROUPINGS[grouping]
+
+    # kurva semua grup dihitung sekali per versi dataset (satu pass vektor)
+    prof.section("chart.retention", total_rows)
+    curves = cached(f"survival_{by}", lambda: engine.survival_curves(by))
+    summary = cached(f"retention_{by}", lambda: engine.retention_summary(by))
+
+    if by == "HireYear":
+        fig_retention = figure("retention", lambda: charts.cohort_figure(curves), period=by)
+    else:
+        fig_retention = figure("retention", lambda: charts.survival_figure(curves), period=by)
+    st.plotly_chart(fig_retention, use_container_width=True)
+
+    with st.expander(f"📌 Quick Insight Retention ({grouping})"):
+        one_year = summary.dropna(subset=["Retention_12m"])
+        if not one_year.empty:
+            best = one_year["Retention_12m"].idxmax()
+            worst = one_year["Retention_12m"].idxmin()
+            st.write(f"⬆️ Best 1-year retention: **{one_year.at[best, by]}** ({one_year.at[best, 'Retention_12m']:.0%})")
+            st.write(f"⬇️ Lowest 1-year retention: **{one_year.at[worst, by]}** ({one_year.at[worst, 'Retention_12m']:.0%})")
+        table = summary.set_index(by)
+        st.dataframe(table.style.format({col: "{:.0%}" for col in table.columns if col.startswith("Retention_")}
+                                        | {"MedianMonths": "{:.0f}"}, na_rep="–"),
+                     use_container_width=True)
+
 
 # ===============================
 # A. TAB UTAMA (Executive Summary)
@@ -177,6 +350,7 @@ with tab1:
     # ===============================
     # 1. KPI SCORECARDS
     # ===============================
+    profiler.section("chart.kpi_cards")
     st.markdown("<h3>📊 KPI</h3>", unsafe_allow_html=True)
 
     # list data KPI
@@ -272,6 +446,10 @@ with tab1:
             </span>
         </div>
         """, unsafe_allow_html=True)
+
+    # KPI scorecard semua tahun (satu baris per tahun)
+    with st.expander("⬇️ Export KPI History"):
+        export_controls("kpis", "KPI history", lambda: [engine.kpi_table()])
     st.markdown("---")
     
     # ===============================
@@ -282,91 +460,55 @@ with tab1:
     col1, col2, col3 = st.columns(3, gap="medium")
 
     # 2.1 Gender
+    profiler.section("chart.gender", active_total)
     with col1:
         st.markdown("<h6 style='text-align:left'>⚥ Gender Distribution</h6>", unsafe_allow_html=True)
-        gender_counts = active_curr["Sex"].value_counts().reset_index()
-        gender_counts.columns = ["Gender", "Count"]
-
-        fig_gender = px.pie(
-            gender_counts,
-            names="Gender",
-            values="Count",
-            color="Gender",
-            color_discrete_map={"Male":"#1E3A8A","Female":"#3B82F6"},
-            hole=0.4
-        )
-        fig_gender.update_traces(textinfo="percent+label", hovertemplate="%{label}: %{value} employees")
-        fig_gender.update_layout(height=300, margin=dict(t=20,b=20,l=20,r=20))
+        demographics = cached("demographics", lambda: engine.demographics(selected_year, active_curr), selected_year)
+        gender_counts = demographics["gender"]
+
+        fig_gender = figure("gender", lambda: charts.gender_figure(gender_counts), selected_year)
         st.plotly_chart(fig_gender, use_container_width=True)
     
     # 2.1 Age distribution
+    profiler.section("chart.age", active_total)
     with col2:
         st.markdown("<h6 style='text-align:left'>⏳ Age Distribution</h6>", unsafe_allow_html=True)
-        active_curr['Age'] = selected_year - pd.to_datetime(active_curr['DOB']).dt.year
-        
-        # bins 
-        age_bins = list(range(20, 66, 5))
-        counts, edges = np.histogram(active_curr['Age'], bins=age_bins)
-        
-        max_idx = np.argmax(counts)
-        most_common_age_range = f"{int(edges[max_idx])}-{int(edges[max_idx+1]-1)}"
-        most_common_age_count = counts[max_idx]
+        age_dist = demographics["age"]
+        most_common_age_range = age_dist["most_common_range"]
+        most_common_age_count = age_dist["most_common_count"]
 
         # plot
-        fig_age = px.histogram(
-            active_curr, x="Age", nbins=len(age_bins)-1, color_discrete_sequence=["#1E3A8A"]
-        )
-        fig_age.update_layout(
-            xaxis_title="Age (Years)",
-            yaxis_title="Number of Employees",
-            height=350,
-            margin=dict(t=20,b=20,l=20,r=20)
-        )
+        fig_age = figure("age", lambda: charts.age_figure(age_dist), selected_year)
         st.plotly_chart(fig_age, use_container_width=True)
 
     # 2.3 Marital Status
+    profiler.section("chart.marital", active_total)
     with col3:
         st.markdown("<h6 style='text-align:left'>💍 Marital Status</h6>", unsafe_allow_html=True)
-        marital_counts = active_curr["MaritalDesc"].dropna().value_counts().reset_index()
-        marital_counts.columns = ["Marital Status", "Count"]
+        marital_counts = demographics["marital"]
         total_emp = marital_counts["Count"].sum()
 
-        palette = ["#1E3A8A", "#1E40AF", "#2563EB", "#3B82F6", "#60A5FA"][:len(marital_counts)]
-
-        fig_marital = px.bar(
-            marital_counts,
-            y="Marital Status",
-            x="Count",
-            color="Marital Status",
-            color_discrete_sequence=palette,
-            text="Count",
-            orientation='h'
-        )
-        fig_marital.update_traces(textposition="outside", width=0.6)
-        fig_marital.update_layout(
-            xaxis_title="Number of Employees",
-            yaxis_title="Marital Status",
-            height=350,
-            margin=dict(t=20,b=40,l=120,r=20),
-            showlegend=False,
-            xaxis=dict(range=[0, marital_counts["Count"].max()*1.2])
-        )
+        fig_marital = figure("marital", lambda: charts.marital_figure(marital_counts), selected_year)
         st.plotly_chart(fig_marital, use_container_width=True)
 
     # Insight utama  Workforce Demographic
     with st.expander(f"📌 Quick Insights Workforce Demographic ({selected_year})"):
-        # gender
-        gender_total = gender_counts["Count"].sum()
-        male_count = gender_counts.loc[gender_counts["Gender"]=="Male","Count"].sum()
-        female_count = gender_counts.loc[gender_counts["Gender"]=="Female","Count"].sum()
-        most_gender = "Male" if male_count > female_count else "Female"
-        most_gender_count = max(male_count, female_count)
-        st.write(f"⚥ Majority of employees are **{most_gender}** ({most_gender_count} employees)")
-        # age
-        st.write(f"⏳ Employees are mostly in the **{most_common_age_range}** age range ({most_common_age_count} employees)")
-        # marital Status
-        most_marital = marital_counts.loc[marital_counts["Count"].idxmax()]
-        st.write(f"💍 Most employees are **{most_marital['Marital Status']}** ({most_marital['Count']} employees)")
+        # tahun tanpa karyawan aktif: tidak ada mayoritas yang bisa disebut
+        if active_total == 0:
+            st.write(f"💡 There are no active employees in {selected_year}.")
+        else:
+            # gender
+            gender_total = gender_counts["Count"].sum()
+            male_count = gender_counts.loc[gender_counts["Gender"]=="Male","Count"].sum()
+            female_count = gender_counts.loc[gender_counts["Gender"]=="Female","Count"].sum()
+            most_gender = "Male" if male_count > female_count else "Female"
+            most_gender_count = max(male_count, female_count)
+            st.write(f"⚥ Majority of employees are **{most_gender}** ({most_gender_count} employees)")
+            # age
+            st.write(f"⏳ Employees are mostly in the **{most_common_age_range}** age range ({most_common_age_count} employees)")
+            # marital Status
+            most_marital = marital_counts.loc[marital_counts["Count"].idxmax()]
+            st.write(f"💍 Most employees are **{most_marital['Marital Status']}** ({most_marital['Count']} employees)")
 
     # ===============================
     # 3. Employee & Project Distribution by Department
@@ -376,140 +518,46 @@ with tab1:
     col1, col2 = st.columns(2, gap="medium")
 
     # 3.1 Employee Distribution
+    profiler.section("chart.departments", active_total)
     with col1:
         st.markdown("<h6 style='text-align:left; font-weight:bold;'>👔 Employee Distribution</h6>", unsafe_allow_html=True)
-        dept_counts = active_curr["Department"].value_counts().reset_index()
-        dept_counts.columns = ["Department","Count"]
-        dept_counts = dept_counts.sort_values("Count", ascending=True)
-
-        fig_dept = px.bar(
-            dept_counts,
-            x="Count", y="Department",
-            orientation="h",
-            text="Count",
-            color="Count",
-            color_continuous_scale=px.colors.sequential.Blues
-        )
-        fig_dept.update_traces(textposition="outside")
-        fig_dept.update_layout(
-            xaxis_title="Number of Employees",
-            yaxis_title=None,
-            height=350,
-            margin=dict(t=20,b=20,l=20,r=20),
-            coloraxis_showscale=False,
-            xaxis=dict(range=[0, dept_counts["Count"].max()*1.1])
-        )
+        departments = cached("departments", lambda: engine.departments(selected_year, active_curr), selected_year)
+        dept_counts = departments["employees"]
+
+        fig_dept = figure("dept", lambda: charts.dept_figure(dept_counts), selected_year)
         st.plotly_chart(fig_dept, use_container_width=True)
 
     # 3.2 Project Distribution
+    profiler.section("chart.projects", active_total)
     with col2:
         st.markdown("<h6 style='text-align:left; font-weight:bold;'>📁 Department Projects</h6>", unsafe_allow_html=True)
-        project_counts = active_curr.groupby("Department")["SpecialProjectsCount"].sum().reset_index()
-        project_counts = project_counts.sort_values("SpecialProjectsCount", ascending=True)
-
-        fig_project = px.bar(
-            project_counts,
-            x="SpecialProjectsCount", y="Department",
-            orientation="h",
-            text="SpecialProjectsCount",
-            color="SpecialProjectsCount",
-            color_continuous_scale=px.colors.sequential.Blues
-        )
-        fig_project.update_traces(textposition="outside")
-        fig_project.update_layout(
-            xaxis_title="Number of Projects",
-            yaxis_title=None,
-            height=350,
-            margin=dict(t=20,b=20,l=20,r=20),
-            coloraxis_showscale=False,
-            xaxis=dict(range=[0, project_counts["SpecialProjectsCount"].max()*1.1])
-        )
+        project_counts = departments["projects"]
+
+        fig_project = figure("project", lambda: charts.project_figure(project_counts), selected_year)
         st.plotly_chart(fig_project, use_container_width=True)
     
     # Insight utama Employee & Project Distribution by Department
     with st.expander(f"📌 Quick Insights Employee & Project Distribution by Department ({selected_year})"):
-        # employee dist
-        emp_max = dept_counts.loc[dept_counts["Count"].idxmax()]
-        emp_min = dept_counts.loc[dept_counts["Count"].idxmin()]
-        st.write(f"👔 Most employees: **{emp_max['Department']}** ({emp_max['Count']})")
-        st.write(f"👔 Least employees: **{emp_min['Department']}** ({emp_min['Count']})")
-        # project dist
-        proj_max = project_counts.loc[project_counts["SpecialProjectsCount"].idxmax()]
-        proj_min = project_counts.loc[project_counts["SpecialProjectsCount"].idxmin()]
-        st.write(f"📁 Most projects: **{proj_max['Department']}** ({proj_max['SpecialProjectsCount']})")
-        st.write(f"📁 Least projects: **{proj_min['Department']}** ({proj_min['SpecialProjectsCount']})")
+        if active_total == 0:
+            st.write(f"💡 There are no active employees in {selected_year}.")
+        else:
+            # employee dist
+            emp_max = dept_counts.loc[dept_counts["Count"].idxmax()]
+            emp_min = dept_counts.loc[dept_counts["Count"].idxmin()]
+            st.write(f"👔 Most employees: **{emp_max['Department']}** ({emp_max['Count']})")
+            st.write(f"👔 Least employees: **{emp_min['Department']}** ({emp_min['Count']})")
+            # project dist
+            proj_max = project_counts.loc[project_counts["SpecialProjectsCount"].idxmax()]
+            proj_min = project_counts.loc[project_counts["SpecialProjectsCount"].idxmin()]
+            st.write(f"📁 Most projects: **{proj_max['Department']}** ({proj_max['SpecialProjectsCount']})")
+            st.write(f"📁 Least projects: **{proj_min['Department']}** ({proj_min['SpecialProjectsCount']})")
     
     # ===============================
     # 4. Turnover Trend & Reason Term
     # ===============================
-    # 4.1 Turnover Trend
-    st.markdown("<br>", unsafe_allow_html=True)
-    col_note, col_filter = st.columns([3, 1])
-
-    with col_note:
-        st.markdown("<h3>📈 Turnover Trend</h3>", unsafe_allow_html=True)
-        st.markdown("This filter exclusively modifies the Turnover Trend chart.", unsafe_allow_html=True)
-
-    with col_filter:
-        st.write("") 
-        period_options = ["Weekly", "Monthly", "Yearly"]
-        period_option = st.selectbox("", period_options, index=0) 
-
-    turnover_df = df[df["DateofTermination"].notna()].copy()
-    turnover_df["TermDate"] = pd.to_datetime(turnover_df["DateofTermination"])
-    if period_option == "Weekly":
-        turnover_trend = turnover_df.groupby(turnover_df["TermDate"].dt.to_period("W")).size().reset_index(name="Jumlah_Turnover")
-        turnover_trend["TermDate"] = turnover_trend["TermDate"].dt.start_time
-    elif period_option == "Monthly":
-        turnover_trend = turnover_df.groupby(turnover_df["TermDate"].dt.to_period("M")).size().reset_index(name="Jumlah_Turnover")
-        turnover_trend["TermDate"] = turnover_trend["TermDate"].dt.to_timestamp()
-    elif period_option == "Yearly":
-        turnover_trend = turnover_df.groupby(turnover_df["TermDate"].dt.year).size().reset_index(name="Jumlah_Turnover")
-        turnover_trend.rename(columns={"TermDate":"Year"}, inplace=True)
-
-    # Rata-rata turnover
-    avg_turnover = turnover_trend["Jumlah_Turnover"].mean()
-    fig_turnover = px.line(
-        turnover_trend,
-        x="TermDate" if period_option != "Yearly" else "Year",
-        y="Jumlah_Turnover",
-        line_shape="linear"
-    )
-
-    fig_turnover.add_hline(
-        y=avg_turnover,
-        line_dash="dash",
-        line_color="darkorange",
-        annotation_text=f"Average: {avg_turnover:.2f}",
-        annotation_position="top left"
-    )
-
-    fig_turnover.update_layout(
-        xaxis_title="Date" if period_option != "Yearly" else "Year",
-        yaxis_title="Number of Employees Left",
-        height=400,
-        margin=dict(t=20, b=20, l=60, r=20),
-    )
-
-    st.plotly_chart(fig_turnover, use_container_width=True) 
+    # 4.1 Turnover Trend (fragment: ganti periode hanya merender ulang bagian ini)
+    turnover_trend_section()
 
-    # Insigt utama Turnover trend
-    with st.expander(f"📌 Quick Insight Turnover Trend ({period_option})"):
-        total_turnover = turnover_trend["Jumlah_Turnover"].sum()
-        max_turnover_row = turnover_trend.loc[turnover_trend["Jumlah_Turnover"].idxmax()]
-        min_turnover_row = turnover_trend.loc[turnover_trend["Jumlah_Turnover"].idxmin()]
-
-        def format_period(row):
-            if period_option == "Yearly":
-                return str(int(row["Year"]))
-            else:
-                return pd.to_datetime(row["TermDate"]).strftime("%Y-%m-%d")
-
-        st.write(f"📊 Total turnover: **{total_turnover} employees**")
-        st.write(f"📈 Average turnover: **{avg_turnover:.2f} employees**")
-        st.write(f"⬆️ Highest turnover: **{max_turnover_row['Jumlah_Turnover']}** employees on **{format_period(max_turnover_row)}**")
-        st.write(f"⬇️ Lowest turnover: **{min_turnover_row['Jumlah_Turnover']}** employees on **{format_period(min_turnover_row)}**")
-        
     # 4.1 Term Reason
     st.markdown("<br>", unsafe_allow_html=True)
     col_note, col_filter = st.columns([3, 1])
@@ -520,26 +568,10 @@ with tab1:
     with col_filter:
         st.write("")  
 
-    left_employees = df[df["TermYear"].notna()].copy()
-    term_reason_counts = left_employees["TermReason"].value_counts().reset_index()
-    term_reason_counts.columns = ["Reason", "Count"]
+    profiler.section("chart.term_reasons", total_rows)
+    term_reason_counts = cached("term_reason_counts", engine.term_reasons)
     
-    fig_tt = px.treemap(
-        term_reason_counts,
-        path=["Reason"],
-        values="Count",
-        color="Count",
-        color_continuous_scale="Blues",
-        title=""
-    )
-
-    fig_tt.update_layout(
-        width=500,
-        height=300,
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        margin=dict(t=20, b=20, l=20, r=20)
-    )
+    fig_tt = figure("term_reasons", lambda: charts.term_reason_figure(term_reason_counts))
     st.plotly_chart(fig_tt, use_container_width=True)
 
     # Insight utama Term Reason
@@ -559,111 +591,152 @@ with tab1:
     col1, col2, col3 = st.columns(3)
 
     # 5.1 Performance Score (1-4)
+    profiler.section("chart.performance", active_total)
     with col1:
         st.markdown("<h6 style='text-align:left; font-weight:bold;'>🎯 Performance Score</h6>", unsafe_allow_html=True)
-        perf_scores = np.round(active_curr['PerformanceScore']).astype(int)
-        perf_scores = perf_scores[(perf_scores >= 1) & (perf_scores <= 4)]
-        perf_counts = perf_scores.value_counts().sort_index()
-        fig_perf = px.bar(
-            x=perf_counts.index.astype(str),
-            y=perf_counts.values,
-            labels={'x': 'Performance Score', 'y': 'Number of Employees'},
-            color_discrete_sequence=['#1E3A8A']
-        )
+        scores = cached("scores", lambda: engine.scores(selected_year, active_curr), selected_year)
+        perf_dist = scores["PerformanceScore"]
+        perf_counts = perf_dist["counts"]
+        fig_perf = figure("perf", lambda: charts.score_figure(perf_counts, 'Performance Score', '#1E3A8A'), selected_year)
         st.plotly_chart(fig_perf, use_container_width=True)
 
     # 5.2 Engagement Survey (1-5)
+    profiler.section("chart.engagement", active_total)
     with col2:
         st.markdown("<h6 style='text-align:left; font-weight:bold;'>📈 Engagement Survey</h6>", unsafe_allow_html=True)
-        eng_scores = np.round(active_curr['EngagementSurvey']).astype(int)
-        eng_scores = eng_scores[(eng_scores >= 1) & (eng_scores <= 5)]
-        eng_counts = eng_scores.value_counts().sort_index()
-        fig_eng = px.bar(
-            x=eng_counts.index.astype(str),
-            y=eng_counts.values,
-            labels={'x': 'Engagement Survey', 'y': 'Number of Employees'},
-            color_discrete_sequence=['#3B82F6']
-        )
+        eng_dist = scores["EngagementSurvey"]
+        eng_counts = eng_dist["counts"]
+        fig_eng = figure("eng", lambda: charts.score_figure(eng_counts, 'Engagement Survey', '#3B82F6'), selected_year)
         st.plotly_chart(fig_eng, use_container_width=True)
 
     # 5.3 Employee Satisfaction (1-5)
+    profiler.section("chart.satisfaction", active_total)
     with col3:
         st.markdown("<h6 style='text-align:left; font-weight:bold;'>😃 Employee Satisfaction</h6>", unsafe_allow_html=True)
-        satis_scores = np.round(active_curr['EmpSatisfaction']).astype(int)
-        satis_scores = satis_scores[(satis_scores >= 1) & (satis_scores <= 5)]
-        satis_counts = satis_scores.value_counts().sort_index()
-        fig_satis = px.bar(
-            x=satis_counts.index.astype(str),
-            y=satis_counts.values,
-            labels={'x': 'Employee Satisfaction', 'y': 'Number of Employees'},
-            color_discrete_sequence=['#BFDBFE']
-        )
+        satis_dist = scores["EmpSatisfaction"]
+        satis_counts = satis_dist["counts"]
+        fig_satis = figure("satis", lambda: charts.score_figure(satis_counts, 'Employee Satisfaction', '#BFDBFE'), selected_year)
         st.plotly_chart(fig_satis, use_container_width=True)
 
     # Insight utama Workforce Score & Satisfaction
     with st.expander(f"📌 Quick Insight Workforce Score & Satisfaction ({selected_year})"):
-        st.write(f"💡 There are **{active_curr.shape[0]}** active employees in {selected_year}.")
-        # performance score
-        most_perf = perf_scores.mode()[0]
-        avg_perf = active_curr['PerformanceScore'].mean()
-        st.write(f"🎯 Average Performance Score is **{avg_perf:.2f}**, with the most common score being **{most_perf}**.")
-        # engagement survey
-        most_eng = eng_scores.mode()[0]
-        avg_eng = active_curr['EngagementSurvey'].mean()
-        st.write(f"📈 Average Engagement Survey score is **{avg_eng:.2f}**, with the most employees score being **{most_eng}**.")
-        # employee satisfaction
-        most_satis = satis_scores.mode()[0]
-        avg_satis = active_curr['EmpSatisfaction'].mean()
-        st.write(f"😃 Average Employee Satisfaction is **{avg_satis:.2f}**, with the most common score being **{most_satis}**.")
+        st.write(f"💡 There are **{active_total}** active employees in {selected_year}.")
+        # mode None / mean NaN kalau tidak ada karyawan aktif
+        if active_total > 0:
+            # performance score
+            most_perf = perf_dist["mode"]
+            avg_perf = perf_dist["mean"]
+            st.write(f"🎯 Average Performance Score is **{avg_perf:.2f}**, with the most common score being **{most_perf}**.")
+            # engagement survey
+            most_eng = eng_dist["mode"]
+            avg_eng = eng_dist["mean"]
+            st.write(f"📈 Average Engagement Survey score is **{avg_eng:.2f}**, with the most employees score being **{most_eng}**.")
+            # employee satisfaction
+            most_satis = satis_dist["mode"]
+            avg_satis = satis_dist["mean"]
+            st.write(f"😃 Average Employee Satisfaction is **{avg_satis:.2f}**, with the most common score being **{most_satis}**.")
+
+    # ===============================
+    # 6. Retention & Survival (fragment: ganti pengelompokan hanya merender ulang bagian ini)
+    # ===============================
+    if sql_db:
+        st.info("📉 Retention & Survival needs the in-memory dataset and is not available with HR_SQLITE.")
+    else:
+        retention_section()
+
+    # ===============================
+    # 7. Attrition Risk
+    # ===============================
+    if show_attrition:
+        st.markdown("<h3>🔮 Attrition Risk</h3>", unsafe_allow_html=True)
+        st.markdown("Predicted probability of leaving for current employees, trained on historical terminations (tenure, pay, scores, projects, department, manager).")
+        risk_error = risk_models.failed(loader.version) if risk is None else None
+        if risk_error:
+            st.warning(f"⚠️ Training the attrition-risk model failed ({risk_error}). "
+                       f"It is retried after {loader.ttl:.0f} s.")
+        elif risk is None:
+            st.info("⏳ The attrition-risk model is being trained in the background. Refresh in a moment.")
+        else:
+            profiler.section("chart.attrition", total_rows)
+            dept_risk = cached("department_risk", lambda: department_risk(df, risk))
+            fig_risk = figure("attrition", lambda: charts.attrition_figure(dept_risk))
+            st.plotly_chart(fig_risk, use_container_width=True)
+
+            with st.expander("📌 Quick Insight Attrition Risk"):
+                top_risk = dept_risk.iloc[0]
+                high_total = int(dept_risk["HighRisk"].sum())
+                st.write(f"⚠️ **{high_total:,}** of **{int(dept_risk['Employees'].sum()):,}** current employees have a risk of {HIGH_RISK:.0%} or more.")
+                st.write(f"🏢 Highest average risk: **{top_risk['Department']}** ({top_risk['AvgRisk']:.0%}, {int(top_risk['HighRisk'])} high risk)")
 
 # ===============================
 # B. EMPLOYEE DETAILS
 # ===============================
-with tab2:
+# fragment: filter, pencarian & paging di directory hanya menjalankan ulang tab ini,
+# bukan chart & agregat Tab 1
+@profiled_fragment
+def employee_directory(prof):
     st.markdown("### 👥 Employee Directory")
     st.markdown("This section provides an interactive overview of employee to explore key information about employee profiles.")
 
-    if "Age" not in df.columns:
-        df["Age"] = ((pd.to_datetime("today") - pd.to_datetime(df["DOB"], errors="coerce")).dt.days / 365.25).round(1)
+    prof.section("directory.filter")
+    # mode SQL: pilihan dropdown, jumlah, sort & halaman diambil lewat query
+    options = engine.options if sql_db else indexes.filter_index.options
 
     col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 1.2])
     # 1. Filter
     with col1:
-        employment_status_filter = st.selectbox("📊 Employment Status",["All"] + sorted(df["EmploymentStatus"].dropna().unique()))
+        employment_status_filter = st.selectbox("📊 Employment Status",["All"] + options("EmploymentStatus"))
     with col2:
-        dept_filter = st.selectbox("🏢 Department",["All"] + sorted(df["Department"].dropna().unique()))
+        dept_filter = st.selectbox("🏢 Department",["All"] + options("Department"))
     with col3:
-        pos_filter = st.selectbox("💼 Position",["All"] + sorted(df["Position"].dropna().unique()))
+        pos_filter = st.selectbox("💼 Position",["All"] + options("Position"))
     with col4:
-        manager_filter = st.selectbox("👨‍💼 Manager",["All"] + sorted(df["ManagerName"].dropna().unique()))
+        manager_filter = st.selectbox("👨‍💼 Manager",["All"] + options("ManagerName"))
     with col5:
         search_name = st.text_input("🔍 Search Employee Name", placeholder="Enter employee name...")
-        
-    detail_df = df.copy()
-
-    if employment_status_filter != "All":
-        detail_df = detail_df[detail_df["EmploymentStatus"] == employment_status_filter]
-    if dept_filter != "All":
-        detail_df = detail_df[detail_df["Department"] == dept_filter]
-    if pos_filter != "All":
-        detail_df = detail_df[detail_df["Position"] == pos_filter]
-    if manager_filter != "All":
-        detail_df = detail_df[detail_df["ManagerName"] == manager_filter]
-    if search_name:
-        detail_df = detail_df[
-            detail_df["Employee_Name"].str.contains(search_name, case=False, na=False)]
+    # data gabungan beberapa sheet (HR_DATA_SOURCES): filter tambahan per source
+    source_filter = "All"
+    if "Source" in (engine.columns if sql_db else indexes.filter_index.codes):
+        source_filter = st.selectbox("🏬 Source", ["All"] + options("Source"))
+
+    filters = {
+        "EmploymentStatus": employment_status_filter,
+        "Department": dept_filter,
+        "Position": pos_filter,
+        "ManagerName": manager_filter,
+        "Source": source_filter,
+    }
+    if sql_db:
+        detail_df = None
+        total = engine.directory_count(filters, search_name)
+        available = engine.columns
+    else:
+        # hasil pencarian nama di-intersect dengan filter lain lewat index (tanpa copy frame)
+        name_matches = indexes.name_index.search(search_name) if search_name else None
+        rows = indexes.filter_index.select(filters, within=name_matches)
+        detail_df = df if rows is None else df.iloc[rows]
+        total = len(detail_df)
+        available = detail_df.columns
+    prof.count(total)
 
     st.markdown("<br>", unsafe_allow_html=True)
 
     # 2. Tabel Detail informasi karyawan
+    prof.section("directory.table", total)
     with st.expander("📋 View Employees (Click)", expanded=False):
         columns_to_show = [
             "EmpID", "Employee_Name", "Position", "Department", "Employee Status", "Age", "Sex", "MaritalDesc",
             "RaceDesc", "State", "TenureYears", "DateofHire", "DateofTermination",
             "MonthlyPay", "ManagerName", "PerformanceScore", "EngagementSurvey", "EmpSatisfaction"]
         
-        columns_to_show = [col for col in columns_to_show if col in detail_df.columns]
-        table_df = detail_df[columns_to_show].copy()
+        columns_to_show = [col for col in columns_to_show if col in available]
+        if sql_db:
+            # hanya MAX_TABLE_ROWS baris pertama yang diambil dari database
+            table_df = engine.directory_rows(filters, search_name, limit=MAX_TABLE_ROWS, columns=columns_to_show)
+            if total > len(table_df):
+                st.caption(f"Showing the first {len(table_df):,} of {total:,} employees.")
+        else:
+            table_df = detail_df[columns_to_show].copy()
 
         table_df["Age"] = table_df["Age"].round(2)
         if "TenureYears" in table_df.columns:
@@ -682,24 +755,19 @@ with tab2:
     
     # 3. Card Employee
     
-    # mapping warna berdasarkan EmploymentStatus
-    status_colors = {
-        "Active": "#2ecc71",
-        "Leave of Absence": "#f6e05e",
-        "Voluntarily Terminated": "#feb2b2",
-        "Terminated for Cause": "#e53e3e",
-        "Future Start": "#63b3ed"}
     columns_to_show = [
         "EmpID", "Employee_Name", "Position", "Department", "Employee Status", "Age", "Sex", "MaritalDesc",
         "RaceDesc", "State", "TenureYears", "DateofHire", "DateofTermination",
         "MonthlyPay", "ManagerName", "PerformanceScore", "EngagementSurvey", "EmpSatisfaction"]
-    columns_to_show = [col for col in columns_to_show if col in detail_df.columns]
+    columns_to_show = [col for col in columns_to_show if col in available]
+    if risk is not None:
+        columns_to_show.append(RISK_COLUMN)
     
     # Employee Profile
     col_header, col_sort1, col_sort2 = st.columns([3, 1, 1])
     with col_header:
         st.markdown("### 🧾 Employee Profile")
-        st.markdown(f"**Total Employees Displayed:** {len(detail_df)}")
+        st.markdown(f"**Total Employees Displayed:** {total}")
     with col_sort1:
         sort_column = st.selectbox(
             "Sort By:",
@@ -710,43 +778,169 @@ with tab2:
             "Order:",
             options=["⬆️ Ascending", "⬇️ Descending"],
             index=0)
-    detail_df = detail_df.sort_values(
-        by=sort_column,
-        ascending=True if sort_order == "⬆️ Ascending" else False)
+    ascending = sort_order == "⬆️ Ascending"
+    # stable sort: karyawan dengan nilai sama tetap urut posisi baris (sama dengan mode SQL,
+    # yang mengurutkan di database saat mengambil halaman)
+    prof.section("directory.sort", total)
+    if not sql_db and sort_column == RISK_COLUMN:
+        # risiko tidak ada di df, urutkan lewat label baris
+        order = risk.reindex(detail_df.index).sort_values(ascending=ascending, kind="stable").index
+        detail_df = detail_df.loc[order]
+    elif not sql_db:
+        detail_df = detail_df.sort_values(by=sort_column, ascending=ascending, kind="stable")
+
+    # export semua baris hasil filter dengan urutan yang sama; mode SQL: di-stream dari cursor
+    def directory_export_chunks():
+        data_columns = [col for col in columns_to_show if col != RISK_COLUMN]
+        if sql_db:
+            return engine.directory_chunks(filters, search_name, sort_column, ascending, data_columns,
+                                           export.DEFAULT_CHUNKSIZE)
+        chunks = export.frame_chunks(detail_df[data_columns])
+        if risk is None:
+            return chunks
+        return (chunk.assign(**{RISK_COLUMN: risk.reindex(chunk.index)}) for chunk in chunks)
+
+    with st.expander(f"⬇️ Export {total:,} Employees"):
+        export_controls("directory", "employees", directory_export_chunks,
+                        (tuple(filters.items()), search_name, sort_column, ascending), prof)
+
+    # card hanya dibangun untuk halaman yang sedang dibuka
+    col_size, col_page, col_info = st.columns([1, 1, 3])
+    with col_size:
+        page_size = st.selectbox("Cards per page:", options=PAGE_SIZES, index=1)
+    total_pages = page_count(total, page_size)
+    with col_page:
+        page = st.number_input("Page:", min_value=1, max_value=total_pages, value=1, step=1)
+    if sql_db:
+        # sort & halaman di database: yang diambil hanya baris halaman ini
+        page_df = engine.directory_rows(filters, search_name, sort_column, ascending, limit=page_size,
+                                        offset=(page - 1) * page_size)
+    else:
+        page_df = page_slice(detail_df, page, page_size)
+    with col_info:
+        st.write("")
+        if total > 0:
+            first = (page - 1) * page_size + 1
+            st.markdown(f"Showing **{first}–{first + len(page_df) - 1}** of **{total}** employees (page {page} of {total_pages})")
+
+    if risk is not None:
+        page_df = page_df.assign(**{RISK_COLUMN: risk.reindex(page_df.index)})
+
+    prof.section("directory.cards", len(page_df))
+    st.markdown(render_cards(page_df), unsafe_allow_html=True)
 
-    for i, row in detail_df.iterrows():
-        status_color = status_colors.get(row["EmploymentStatus"], "#A0AEC0")
+with tab2:
+    employee_directory()
 
-        st.markdown(f"""
-        <div style="
-            border: 1px solid #ddd;
-            border-radius: 15px;
-            padding: 16px;
-            margin-bottom: 15px;
-            background-color: #fafafa;
-            box-shadow: 0px 2px 4px rgba(0,0,0,0.05);
-        ">
-            <div style="display: flex; justify-content: space-between; align-items: center;">
-                <h4 style="margin: 0;">👤 {row['Employee_Name']}</h4>
-                <span style="color: white; background-color: {status_color};
-                    padding: 5px 10px; border-radius: 8px; font-size: 12px;">
-                    {row['EmploymentStatus']}
-                </span>
-            </div>
-            <p style="margin: 5px 0 10px 0; font-weight: 500; color: #555;">{row['Position']} - {row['Department']}</p>
-            <div style="display: flex; flex-wrap: wrap; gap: 12px; font-size: 14px; color: #333;">
-                <div>📅 <b>Tenure:</b> {row['TenureYears']:.1f} Years</div>
-                <div>💰 <b>Salary:</b> ${row['MonthlyPay']:,.0f}</div>
-                <div>👨‍💼 <b>Manager:</b> {row['ManagerName']}</div>
-                <div>🎯 <b>Performance:</b> {row['PerformanceScore']}</div>
-            </div>
-            <hr style="margin: 10px 0; border: none; border-top: 1px solid #eee;">
-            <div style="font-size: 13px; color: #555;">
-                🧠 <b>Gender:</b> {row['Sex']} &nbsp;&nbsp;|&nbsp;&nbsp;
-                🎂 <b>Age:</b> {row['Age']} &nbsp;&nbsp;|&nbsp;&nbsp;
-                💍 <b>Marital Status:</b> {row['MaritalDesc']} &nbsp;&nbsp;|&nbsp;&nbsp;
-                🌏 <b>Race:</b> {row['RaceDesc']} &nbsp;&nbsp;|&nbsp;&nbsp;
-                📍 <b>State:</b> {row['State']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+# ===============================
+# C. MANAGER VIEW
+# ===============================
+# KPI tim per manager sudah dihitung untuk semua tahun di ManagerIndex; ganti tahun,
+# peringkat atau tim = lookup, tanpa scan frame
+MANAGER_RANKINGS = {
+    "Turnover Rate": ("TurnoverRate", "Turnover Rate (%)"),
+    "Team Size": ("Headcount", "Employees in Team"),
+    "Avg Tenure": ("AvgTenure", "Average Tenure (Years)"),
+    "Monthly Pay": ("AvgMonthlyPay", "Average Monthly Pay ($)"),
+    "Performance Score": ("AvgPerformance", "Average Performance Score"),
+    "Engagement Survey": ("AvgEngagement", "Average Engagement Survey"),
+    "Employee Satisfaction": ("AvgSatisfaction", "Average Employee Satisfaction"),
+}
+
+
+@profiled_fragment
+def manager_view(prof):
+    st.markdown("### 👨‍💼 Manager View")
+    st.markdown(f"Team KPIs per manager (direct reports) in {selected_year}. Teams follow the current manager of each employee.")
+
+    prof.section("managers.index")
+    manager_index = engine.manager_index
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rank_label = st.selectbox("🏆 Rank by", list(MANAGER_RANKINGS))
+    with col2:
+        rank_order = st.selectbox("Order:", ["⬇️ Descending", "⬆️ Ascending"], key="manager_order")
+    with col3:
+        min_team = st.number_input("Min. team size", min_value=1, value=1, step=1)
+    rank_column, rank_axis = MANAGER_RANKINGS[rank_label]
+    ascending = rank_order == "⬆️ Ascending"
+
+    prof.section("managers.ranking")
+    ranking = manager_index.ranking(selected_year, rank_column, ascending, min_team)
+    prof.count(len(ranking))
+    if ranking.empty:
+        st.info(f"No team has at least {min_team} employees in {selected_year}.")
+        return
+
+    st.markdown(f"<h6 style='text-align:left; font-weight:bold;'>Top 15 managers by {rank_label}</h6>", unsafe_allow_html=True)
+    fig_manager = figure("manager_ranking", lambda: charts.manager_figure(ranking.head(15), rank_column, rank_axis),
+                         selected_year, period=(rank_column, ascending, min_team))
+    st.plotly_chart(fig_manager, use_container_width=True)
+
+    with st.expander(f"📋 All Managers ({len(ranking):,})", expanded=False):
+        st.dataframe(ranking.round(2), use_container_width=True, height=300)
+
+    # drill-down satu tim
+    st.markdown("### 🔎 Team Detail")
+    manager = st.selectbox("👨‍💼 Team of", ranking.index.tolist(), key="manager_team")
+    prof.section("managers.team")
+    team_kpis = engine.team_kpis(manager, selected_year)
+    cols = st.columns(5)
+    for col, (name, label, fmt, inverse) in zip(cols, [
+        ("Headcount", "👥 Team Size", "{:,.0f}", False),
+        ("TurnoverRate", "🔄 Turnover Rate", "{:.2f}%", True),
+        ("AvgTenure", "⏳ Avg Tenure", "{:.2f} year", False),
+        ("AvgMonthlyPay", "💰 Monthly Pay", "${:,.0f}", False),
+        ("AvgPerformance", "🎯 Performance", "{:.2f}", False),
+    ]):
+        curr, prev = team_kpis.loc[name, "curr"], team_kpis.loc[name, "prev"]
+        delta = None if pd.isna(curr) or pd.isna(prev) else f"{curr - prev:+,.2f} vs {selected_year - 1}"
+        col.metric(label, fmt.format(curr) if pd.notna(curr) else "–", delta,
+                   delta_color="inverse" if inverse else "normal")
+
+    team = engine.team(manager)
+    prof.count(len(team))
+    team_columns = [col for col in ["EmpID", "Employee_Name", "Position", "Department", "EmploymentStatus",
+                                    "DateofHire", "DateofTermination", "TenureYears", "MonthlyPay",
+                                    "PerformanceScore", "EngagementSurvey", "EmpSatisfaction"] if col in team.columns]
+    team_df = team[team_columns].copy()
+    if risk is not None:
+        team_df[RISK_COLUMN] = risk.reindex(team_df.index).round(2)
+    st.markdown(f"**Direct reports:** {len(team_df)}")
+    st.dataframe(team_df.round({col: 2 for col in team_df.select_dtypes("number")}), use_container_width=True, height=300, hide_index=True)
+
+with tab3:
+    if sql_db:
+        st.info("👨‍💼 The Manager View needs the in-memory dataset and is not available with HR_SQLITE.")
+    else:
+        manager_view()
+
+# ===============================
+# DEBUG PANEL
+# ===============================
+if profiler.enabled:
+    profiler.end()
+    with st.sidebar.expander("🛠️ Debug: Profiling", expanded=True):
+        st.markdown(f"**Total run:** {profiler.total_ms():,.1f} ms")
+        st.dataframe(profiler.summary().drop(columns="mem_start_mb"), use_container_width=True, hide_index=True)
+        if sql_db:
+            st.markdown("**SQLite backend**")
+            st.json({key: engine.meta[key] for key in ["version", "rows", "today", "built_at"]})
+        else:
+            st.markdown("**Data loader**")
+            st.json(loader.stats)
+        if not sql_db and loader.changelog:
+            st.markdown("**Data changelog**")
+            st.json(list(loader.changelog)[::-1])
+        st.markdown("**Aggregate cache**")
+        st.json(aggregate_cache.summary())
+        st.markdown("**Figure cache**")
+        st.json(figure_cache.summary())
+        if risk_models is not None:
+            st.markdown("**Attrition model**")
+            st.json(risk_models.summary())
+        st.download_button("⬇️ Profile (JSON)", profiler.to_json(), file_name="hr-profile.json",
+                           mime="application/json")
+        st.download_button("⬇️ Chrome trace", profiler.to_chrome_trace(), file_name="hr-trace.json",
+                           mime="application/json")
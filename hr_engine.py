@@ -0,0 +1,332 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import hr_metrics
+from employment_index import EmploymentIndex
+from manager_index import ManagerIndex
+from survival import GROUPINGS, SurvivalEngine
+from turnover_cube import PERIOD_OPTIONS, TurnoverCube
+
+SCORE_COLUMNS = {
+    "PerformanceScore": (1, 4),
+    "EngagementSurvey": (1, 5),
+    "EmpSatisfaction": (1, 5),
+}
+
+
+def pct_change(curr, prev):
+    return ((curr - prev) / prev * 100) if prev > 0 else 0
+
+
+# ===============================
+# METRICS ENGINE
+# ===============================
+# semua angka dashboard tanpa Streamlit. Struktur berat (snapshot per tahun,
+# index masa kerja, cube turnover) dibangun sekali per frame dan dipakai ulang.
+class MetricsEngine:
+    def __init__(self, df, version=None, accumulator=None):
+        self.df = df
+        self.version = version
+        # accumulator dari ingest per chunk (mode streaming) dipakai langsung, tidak dihitung ulang
+        self._accumulator = accumulator
+        self._year_snapshot = None
+        self._employment_index = None
+        # posisi index masa kerja -> baris df; None = sama (index dibangun dari df ini)
+        self._index_rows = None
+        self._turnover_cube = None
+        self._survival = None
+        self._manager_index = None
+
+    @property
+    def accumulator(self):
+        if self._accumulator is None:
+            self._accumulator = hr_metrics.YearAccumulator().add(self.df)
+        return self._accumulator
+
+    @property
+    def year_snapshot(self):
+        if self._year_snapshot is None:
+            self._year_snapshot = self.accumulator.snapshot()
+        return self._year_snapshot
+
+    @property
+    def employment_index(self):
+        if self._employment_index is None:
+            self._employment_index = EmploymentIndex.from_frame(self.df)
+        return self._employment_index
+
+    @property
+    def turnover_cube(self):
+        if self._turnover_cube is None:
+            self._turnover_cube = TurnoverCube.from_frame(self.df)
+        return self._turnover_cube
+
+    @property
+    def survival(self):
+        if self._survival is None:
+            self._survival = SurvivalEngine.from_frame(self.df)
+        return self._survival
+
+    # manager -> anak buah langsung + KPI tim per tahun (dibangun sekali per versi dataset)
+    @property
+    def manager_index(self):
+        if self._manager_index is None:
+            self._manager_index = ManagerIndex.from_frame(self.df, self.years())
+        return self._manager_index
+
+    def years(self):
+        return sorted(self.year_snapshot.index[1:], reverse=True)
+
+    # KPI scorecard semua tahun data (satu baris per tahun), untuk export
+    def kpi_table(self):
+        return self.year_snapshot.loc[sorted(self.years())].reset_index()
+
+    # karyawan berstatus Active yang bekerja di tahun tsb
+    def active_employees(self, year):
+        positions = self.employment_index.active_positions(year, "Y")
+        if self._index_rows is not None:
+            positions = np.sort(self._index_rows[positions])
+        active = self.df.iloc[positions]
+        return active[active["EmploymentStatus"].str.lower() == "active"]
+
+    def active_count(self, year, active=None):
+        active = self.active_employees(year) if active is None else active
+        return len(active)
+
+    # ===============================
+    # INCREMENTAL PATCH
+    # ===============================
+    # engine untuk frame df = frame lama + delta (lihat incremental.py). Struktur yang sudah
+    # dibangun disalin lalu di-patch dengan baris yang berubah saja; yang belum dibangun
+    # tetap lazy. Engine lama tidak diubah.
+    def patched(self, delta, df, version=None):
+        other = MetricsEngine(df, version)
+        if self._accumulator is not None:
+            other._accumulator = self._accumulator.copy().remove(delta.old_rows).add(delta.new_rows)
+        if self._employment_index is not None:
+            index = self._employment_index.copy()
+            for key in delta.removed:
+                index.remove(key)
+            for key, hire, term in zip(delta.new_rows["EmpID"], delta.new_rows["DateofHire"],
+                                       delta.new_rows["DateofTermination"]):
+                index.upsert(key, hire, term)
+            other._employment_index = index
+            other._index_rows = pd.Index(df["EmpID"]).get_indexer(pd.Index(index.keys))
+        if self._turnover_cube is not None:
+            other._turnover_cube = self._turnover_cube.copy().remove(delta.old_rows).append(delta.new_rows)
+        return other
+
+    # ===============================
+    # KPI
+    # ===============================
+    def kpis(self, year):
+        curr = hr_metrics.year_kpis(self.year_snapshot, year)
+        prev = hr_metrics.year_kpis(self.year_snapshot, year - 1)
+
+        active = (int(curr["ActiveCount"]), int(prev["ActiveCount"]))
+        left = (int(curr["Leavers"]), int(prev["Leavers"]))
+        turnover = (curr["TurnoverRate"], prev["TurnoverRate"])
+        tenure = (curr["AvgTenure"], prev["AvgTenure"])
+        salary = (curr["AvgMonthlyPay"], prev["AvgMonthlyPay"])
+        return {
+            "active": {"curr": active[0], "prev": active[1], "change": pct_change(*active)},
+            "left": {"curr": left[0], "prev": left[1], "change": pct_change(*left)},
+            # turnover: selisih poin persen, bukan persentase perubahan
+            "turnover": {"curr": turnover[0], "prev": turnover[1], "change": turnover[0] - turnover[1]},
+            "tenure": {"curr": tenure[0], "prev": tenure[1], "change": pct_change(*tenure)},
+            "salary": {"curr": salary[0], "prev": salary[1], "change": pct_change(*salary)},
+        }
+
+    # ===============================
+    # TAB 1 AGGREGATES
+    # ===============================
+    def demographics(self, year, active=None):
+        active = self.active_employees(year) if active is None else active
+        return {
+            "gender": hr_metrics.gender_counts(active),
+            "age": hr_metrics.age_distribution(active, year),
+            "marital": hr_metrics.marital_counts(active),
+        }
+
+    def departments(self, year, active=None):
+        active = self.active_employees(year) if active is None else active
+        return {
+            "employees": hr_metrics.dept_counts(active),
+            "projects": hr_metrics.project_counts(active),
+        }
+
+    def scores(self, year, active=None):
+        active = self.active_employees(year) if active is None else active
+        return {col: hr_metrics.score_distribution(active, col, low, high)
+                for col, (low, high) in SCORE_COLUMNS.items()}
+
+    def turnover_trend(self, period_option):
+        return self.turnover_cube.trend(period_option)
+
+    def term_reasons(self):
+        return hr_metrics.term_reason_counts(self.df)
+
+    # ===============================
+    # RETENTION & SURVIVAL
+    # ===============================
+    def _group_values(self, by):
+        values = self.df[by]
+        # HireYear bisa float32 (ada hire kosong): label cohort tetap integer
+        return values.astype("Int64") if by == "HireYear" else values.astype(object)
+
+    # matriks cohort HireYear x bulan sejak hire (Kaplan-Meier per cohort)
+    def cohort_retention(self, max_months=None):
+        return self.survival_curves("HireYear", max_months)
+
+    def survival_curves(self, by, max_months=None):
+        return self.survival.curves(self._group_values(by), max_months).rename_axis(by)
+
+    # bentuk panjang (grup, bulan, at risk, events, survival)
+    def survival_table(self, by):
+        return self.survival.table(self._group_values(by), by)
+
+    def retention_summary(self, by):
+        return self.survival.summary(self._group_values(by), by)
+
+    # ===============================
+    # MANAGER VIEW
+    # ===============================
+    def manager_kpis(self, year):
+        return self.manager_index.year_table(year)
+
+    def manager_ranking(self, year, by="TurnoverRate", ascending=False, min_headcount=1):
+        return self.manager_index.ranking(year, by, ascending, min_headcount)
+
+    # anak buah langsung satu manager (baris df)
+    def team(self, manager):
+        return self.df.iloc[self.manager_index.team_rows(manager)]
+
+    def team_kpis(self, manager, year):
+        curr = self.manager_index.team_kpis(manager, year)
+        prev = self.manager_index.team_kpis(manager, year - 1)
+        return pd.DataFrame({"curr": curr, "prev": prev})
+
+    def compute_year(self, year):
+        active = self.active_employees(year)
+        return {
+            "kpis": self.kpis(year),
+            "demographics": self.demographics(year, active),
+            "departments": self.departments(year, active),
+            "scores": self.scores(year, active),
+        }
+
+    def compute_all(self, years=None):
+        years = self.years() if years is None else years
+        return {
+            "version": self.version,
+            "years": {int(year): self.compute_year(year) for year in years},
+            "turnover_trend": {option: self.turnover_trend(option) for option in PERIOD_OPTIONS},
+            "term_reasons": self.term_reasons(),
+            "retention": {by: self.retention_summary(by) for by in GROUPINGS.values()},
+        }
+
+
+# ===============================
+# EXPORT
+# ===============================
+def _jsonable(value):
+    if isinstance(value, pd.DataFrame):
+        return json.loads(value.to_json(orient="records", date_format="iso"))
+    if isinstance(value, pd.Series):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    return value
+
+
+# tabel long-format (kolom Year) per agregat, untuk ditulis ke Parquet
+def to_tables(results):
+    tables = {}
+
+    def add(name, frame, year=None):
+        frame = frame.copy()
+        if year is not None:
+            frame.insert(0, "Year", year)
+        tables.setdefault(name, []).append(frame)
+
+    for year, res in results["years"].items():
+        kpis = pd.DataFrame(res["kpis"]).T.rename_axis("KPI").reset_index()
+        add("kpis", kpis, year)
+        add("gender", res["demographics"]["gender"], year)
+        add("marital", res["demographics"]["marital"], year)
+        add("age", res["demographics"]["age"]["ages"]["Age"].value_counts().sort_index()
+            .rename_axis("Age").reset_index(name="Count"), year)
+        add("departments", res["departments"]["employees"], year)
+        add("projects", res["departments"]["projects"], year)
+        for col, dist in res["scores"].items():
+            counts = dist["counts"].rename_axis("Score").reset_index(name="Count")
+            counts.insert(0, "Metric", col)
+            add("scores", counts, year)
+    for option, trend in results["turnover_trend"].items():
+        trend = trend.copy()
+        trend.insert(0, "Period", option)
+        add("turnover_trend", trend)
+    add("term_reasons", results["term_reasons"])
+    for by, summary in results.get("retention", {}).items():
+        summary = summary.rename(columns={by: "Group"})
+        summary["Group"] = summary["Group"].astype(str)
+        summary.insert(0, "Dimension", by)
+        add("retention", summary)
+    return {name: pd.concat(frames, ignore_index=True) for name, frames in tables.items()}
+
+
+def write_results(results, out_dir, fmt="json"):
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt == "json":
+        payload = _jsonable(results)
+        # data umur per karyawan tidak perlu di JSON, cukup histogramnya
+        for res in payload["years"].values():
+            res["demographics"]["age"].pop("ages", None)
+        path = os.path.join(out_dir, "metrics.json")
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2, default=str)
+        return [path]
+    paths = []
+    for name, table in to_tables(results).items():
+        path = os.path.join(out_dir, f"{name}.parquet")
+        table.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    from data_loader import CSV_URL, DataLoader, make_source
+
+    parser = argparse.ArgumentParser(description="Compute all dashboard metrics without Streamlit")
+    parser.add_argument("--source", default=os.environ.get("HR_DATA_SOURCE", CSV_URL))
+    parser.add_argument("--years", type=int, nargs=2, metavar=("FROM", "TO"),
+                        help="year range (default: every year in the data)")
+    parser.add_argument("--out", default="metrics_out")
+    parser.add_argument("--format", choices=["json", "parquet"], default="json")
+    args = parser.parse_args()
+
+    loader = DataLoader(make_source(args.source), snapshot_dir=os.environ.get("HR_SNAPSHOT_DIR") or None)
+    df = loader.get()
+
+    start = time.perf_counter()
+    engine = MetricsEngine(df, loader.version, loader.accumulator_for(loader.version))
+    years = list(range(args.years[0], args.years[1] + 1)) if args.years else None
+    results = engine.compute_all(years)
+    paths = write_results(results, args.out, args.format)
+    print(json.dumps({
+        "version": loader.version,
+        "years": len(results["years"]),
+        "seconds": round(time.perf_counter() - start, 3),
+        "files": paths,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
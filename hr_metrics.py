@@ -0,0 +1,331 @@
+import numpy as np
+import pandas as pd
+
+
+# ===============================
+# KPI PER TAHUN (serial, satu tahun sekali scan)
+# ===============================
+# karyawan yang masih bekerja di awal tahun
+def active_mask(df, year):
+    return (df["HireYear"] <= year) & ((df["TermYear"].isna()) | (df["TermYear"] >= year))
+
+
+# 3. Tingkat turnover
+# (cukup hitung mask, tanpa membuat salinan frame)
+def calc_turnover(df, year):
+    aktif_awal = int(active_mask(df, year).sum())
+    keluar = int((df["TermYear"] == year).sum())
+    rate = (keluar / aktif_awal * 100) if aktif_awal > 0 else 0
+    return keluar, aktif_awal, round(rate, 2)
+
+
+# 4. Rata-rata lama bekerja
+def active_tenure(df, year):
+    tenure = tenure_matrix(df, [year])[0]
+    tenure = tenure[~np.isnan(tenure)]
+    return tenure.mean() if tenure.size else 0
+
+
+# 5. Rata-rata gaji bulanan
+def avg_monthly_pay(df, year):
+    # monthly pay, hanya kolom yang dibutuhkan yang di-filter; rata-rata dalam float64
+    pay = df["MonthlyPay"].to_numpy(dtype="float64")[active_mask(df, year).to_numpy()]
+    return pay.mean() if pay.size else 0
+
+
+# ===============================
+# TENURE ENGINE
+# ===============================
+# masa kerja per akhir tahun: (min(31 Des, tanggal keluar) - tanggal masuk) / 365.25
+def _tenure_arrays(df):
+    hire_year = df["HireYear"].to_numpy(dtype="float64")
+    term_year = df["TermYear"].to_numpy(dtype="float64")
+    hire_days = df["DateofHire"].to_numpy(dtype="datetime64[D]").astype("int64")
+    term_days = df["DateofTermination"].to_numpy(dtype="datetime64[D]").astype("int64")
+    return hire_year, term_year, hire_days, term_days
+
+
+def _year_end_days(years):
+    return np.array([f"{int(y)}-12-31" for y in years], dtype="datetime64[D]").astype("int64")
+
+
+# matriks tahun x karyawan, NaN untuk karyawan yang tidak aktif di tahun tsb
+def tenure_matrix(df, years):
+    hire_year, term_year, hire_days, term_days = _tenure_arrays(df)
+    years = np.asarray(years, dtype="float64")[:, None]
+    year_end = _year_end_days(years[:, 0])[:, None]
+
+    aktif = (hire_year <= years) & (np.isnan(term_year) | (term_year >= years))
+    end = np.where(np.isnan(term_year), year_end, np.minimum(term_days, year_end))
+    return np.where(aktif, (end - hire_days) / 365.25, np.nan)
+
+
+# rata-rata masa kerja untuk banyak tahun sekaligus tanpa matriks tahun x karyawan.
+# karyawan aktif di tahun y dibagi dua:
+#   - keluar di tahun y        -> tenure = term - hire
+#   - keluar setelah y / aktif -> tenure = 31 Des y - hire
+# kelompok kedua dihitung dari cumulative sum atas hire/term year yang sudah diurutkan
+def avg_tenure_by_year(df, years):
+    hire_year, term_year, hire_days, term_days = _tenure_arrays(df)
+    years = np.asarray(years, dtype="float64")
+    year_end = _year_end_days(years)
+
+    valid = ~np.isnan(hire_year)
+    hire_year, term_year = hire_year[valid], term_year[valid]
+    hire_days, term_days = hire_days[valid], term_days[valid]
+    still = np.isnan(term_year) | (term_year > hire_year)
+
+    # kelompok 1: keluar di tahun y
+    leavers = ~np.isnan(term_year) & (hire_year <= term_year)
+    leave_year = term_year[leavers]
+    leave_tenure = (term_days[leavers] - hire_days[leavers]).astype("float64")
+    order = np.argsort(leave_year, kind="stable")
+    leave_year, leave_tenure = leave_year[order], leave_tenure[order]
+    lo = np.searchsorted(leave_year, years, side="left")
+    hi = np.searchsorted(leave_year, years, side="right")
+    csum = np.concatenate([[0.0], np.cumsum(leave_tenure)])
+    count1 = hi - lo
+    sum1 = csum[hi] - csum[lo]
+
+    # kelompok 2: masuk <= y < keluar
+    h_year, h_days = hire_year[still], hire_days[still].astype("float64")
+    order = np.argsort(h_year, kind="stable")
+    h_year, h_csum = h_year[order], np.concatenate([[0.0], np.cumsum(h_days[order])])
+    t_mask = ~np.isnan(term_year[still])
+    t_year, t_days = term_year[still][t_mask], hire_days[still][t_mask].astype("float64")
+    order = np.argsort(t_year, kind="stable")
+    t_year, t_csum = t_year[order], np.concatenate([[0.0], np.cumsum(t_days[order])])
+
+    h_idx = np.searchsorted(h_year, years, side="right")
+    t_idx = np.searchsorted(t_year, years, side="right")
+    count2 = h_idx - t_idx
+    sum2 = count2 * year_end - (h_csum[h_idx] - t_csum[t_idx])
+
+    count = count1 + count2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sum1 + sum2) / count / 365.25
+    return pd.Series(np.where(count > 0, mean, 0.0), index=years.astype(int), name="AvgTenure")
+
+
+# ===============================
+# YEAR SNAPSHOT TABLE
+# ===============================
+def data_years(df):
+    return sorted(pd.concat([df["HireYear"], df["TermYear"]], ignore_index=True).dropna().astype(int).unique(), reverse=True)
+
+
+# ===============================
+# YEAR ACCUMULATOR
+# ===============================
+# histogram per tahun (hire year / term year) yang bisa dijumlah antar potongan data.
+# KPI tahun y didapat dari cumulative sum:
+#   headcount(y) = #(hire <= y) - #(term < y)
+#   tenure      = keluar di y: term - hire, sisanya: 31 Des y - hire
+YEAR_MIN, YEAR_MAX = 1900, 2100
+_N_YEARS = YEAR_MAX - YEAR_MIN + 1
+
+
+class YearAccumulator:
+    FIELDS = ["hire", "term", "leavers", "pay_hire", "pay_term", "act_hire", "act_term",
+              "days_hire", "days_term", "tenure_leave"]
+
+    def __init__(self):
+        self.hist = {name: np.zeros(_N_YEARS + 1) for name in self.FIELDS}
+        self.rows = 0
+        # jumlah kemunculan per tahun (hire + term), supaya remove() bisa menghapus tahun
+        self.year_counts = {}
+        self._sign = 1
+
+    @property
+    def years(self):
+        return {year for year, count in self.year_counts.items() if count > 0}
+
+    def copy(self):
+        other = YearAccumulator()
+        other.hist = {name: values.copy() for name, values in self.hist.items()}
+        other.rows = self.rows
+        other.year_counts = dict(self.year_counts)
+        return other
+
+    def _add(self, name, year, weights=None):
+        idx = np.clip(year - YEAR_MIN, 0, _N_YEARS).astype("int64")
+        self.hist[name] += self._sign * np.bincount(idx, weights=weights, minlength=_N_YEARS + 1)
+
+    def _count_years(self, years):
+        values, counts = np.unique(years[~np.isnan(years)].astype(int), return_counts=True)
+        for year, count in zip(values.tolist(), counts.tolist()):
+            self.year_counts[year] = self.year_counts.get(year, 0) + self._sign * count
+
+    # kebalikan add(): baris yang sama dikurangkan dari semua histogram
+    def remove(self, df):
+        self._sign = -1
+        try:
+            return self.add(df)
+        finally:
+            self._sign = 1
+
+    def add(self, df):
+        hire_year = df["HireYear"].to_numpy(dtype="float64")
+        term_year = df["TermYear"].to_numpy(dtype="float64")
+        hire_days = df["DateofHire"].to_numpy(dtype="datetime64[D]").astype("int64").astype("float64")
+        term_days = df["DateofTermination"].to_numpy(dtype="datetime64[D]").astype("int64").astype("float64")
+        pay = df["MonthlyPay"].to_numpy(dtype="float64")
+        is_active = (df["EmploymentStatus"].astype(str).str.lower() == "active").to_numpy()
+
+        self.rows += self._sign * len(df)
+        self._count_years(hire_year)
+        self._count_years(term_year)
+        self._add("leavers", term_year[~np.isnan(term_year)])
+
+        # baris yang pernah aktif (punya hire date, keluar tidak sebelum tahun masuk)
+        span = ~np.isnan(hire_year) & (np.isnan(term_year) | (term_year >= hire_year))
+        left = span & ~np.isnan(term_year)
+        self._add("hire", hire_year[span])
+        self._add("term", term_year[left])
+        self._add("pay_hire", hire_year[span], pay[span])
+        self._add("pay_term", term_year[left], pay[left])
+        self._add("act_hire", hire_year[span & is_active])
+        self._add("act_term", term_year[left & is_active])
+        self._add("days_hire", hire_year[span], hire_days[span])
+        self._add("days_term", term_year[left], hire_days[left])
+        self._add("tenure_leave", term_year[left], term_days[left] - hire_days[left])
+        return self
+
+    def snapshot(self, years=None):
+        if years is None:
+            years = sorted(self.years)
+        years = sorted(set(int(y) for y in years))
+        if years:
+            # tahun sebelumnya dipakai untuk delta "vs prev year"
+            years = [years[0] - 1] + years
+        idx = np.clip(np.asarray(years, dtype="int64") - YEAR_MIN, 0, _N_YEARS)
+
+        cum = {name: np.cumsum(values) for name, values in self.hist.items()}
+
+        def upto(name):
+            return cum[name][idx]
+
+        def before(name):
+            return np.where(idx > 0, cum[name][np.maximum(idx - 1, 0)], 0.0)
+
+        headcount = upto("hire") - before("term")
+        leavers = self.hist["leavers"][idx]
+        pay_sum = upto("pay_hire") - before("pay_term")
+        active_count = upto("act_hire") - before("act_term")
+        # masih bekerja setelah tahun y
+        staying = upto("hire") - upto("term")
+        tenure_sum = (self.hist["tenure_leave"][idx]
+                      + staying * _year_end_days(years) - (upto("days_hire") - upto("days_term")))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_pay = np.where(headcount > 0, pay_sum / headcount, 0)
+            avg_tenure = np.where(headcount > 0, tenure_sum / headcount / 365.25, 0)
+        turnover = [round(l / h * 100, 2) if h > 0 else 0 for l, h in zip(leavers, headcount)]
+
+        return pd.DataFrame({
+            "Year": years,
+            "Headcount": headcount.round().astype(int),
+            "Leavers": leavers.round().astype(int),
+            "TurnoverRate": turnover,
+            "AvgTenure": avg_tenure,
+            "AvgMonthlyPay": avg_pay,
+            "ActiveCount": active_count.round().astype(int),
+        }).set_index("Year")
+
+
+# tabel KPI per tahun, dihitung sekali per versi dataset supaya ganti tahun
+# di sidebar cukup lookup snapshot.loc[year]
+def build_year_snapshot(df, years=None):
+    if years is None:
+        years = data_years(df)
+    return YearAccumulator().add(df).snapshot(years)
+
+
+def year_kpis(snapshot, year):
+    if year in snapshot.index:
+        return snapshot.loc[year]
+    # tahun di luar data: semua KPI nol
+    return pd.Series(0, index=snapshot.columns)
+
+
+# ===============================
+# TAB 1 AGGREGATES
+# ===============================
+# semua fungsi di bawah menerima karyawan aktif tahun terpilih (active_curr)
+# dan mengembalikan frame baru, jadi aman disimpan di cache bersama
+# value_counts seperti kolom teks biasa: kategori yang tidak muncul tidak ikut
+def _value_counts(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(values.cat.categories.dtype)
+    return values.value_counts()
+
+
+def gender_counts(active):
+    return count_table(_value_counts(active["Sex"]), ["Gender", "Count"])
+
+
+AGE_BINS = list(range(20, 66, 5))
+
+
+def age_distribution(active, year):
+    return age_summary(pd.DataFrame({"Age": year - pd.to_datetime(active["DOB"]).dt.year}))
+
+
+def marital_counts(active):
+    return count_table(_value_counts(active["MaritalDesc"].dropna()), ["Marital Status", "Count"])
+
+
+def dept_counts(active):
+    return dept_table(active["Department"].value_counts())
+
+
+def project_counts(active):
+    return project_table(active.groupby("Department", observed=True)["SpecialProjectsCount"].sum())
+
+
+def term_reason_counts(df):
+    left_employees = df.loc[df["TermYear"].notna(), ["TermReason"]]
+    return count_table(_value_counts(left_employees["TermReason"]), ["Reason", "Count"])
+
+
+# bentuk akhir agregat dari hasil hitungan (value_counts / groupby); dipakai juga oleh
+# backend SQL (sql_backend.py) supaya urutan & bentuk tabel sama persis
+def count_table(counts, columns):
+    counts = counts.reset_index()
+    counts.columns = columns
+    return counts
+
+
+def age_summary(ages):
+    counts, edges = np.histogram(ages["Age"], bins=AGE_BINS)
+    max_idx = np.argmax(counts)
+    return {
+        "ages": ages,
+        "most_common_range": f"{int(edges[max_idx])}-{int(edges[max_idx+1]-1)}",
+        "most_common_count": counts[max_idx],
+    }
+
+
+def dept_table(counts):
+    counts = count_table(counts, ["Department", "Count"])
+    counts = counts[counts["Count"] > 0]
+    return counts.sort_values("Count", ascending=True, kind="stable")
+
+
+# stable: departemen dengan total sama tetap urut kategori (quicksort numpy tidak stabil
+# untuk int32/int64, jadi urutan tie bisa beda antar dtype / engine)
+def project_table(sums):
+    return sums.reset_index().sort_values("SpecialProjectsCount", ascending=True, kind="stable")
+
+
+# distribusi skor bulat dalam rentang [low, high] + modus dan rata-rata skor asli
+def score_distribution(active, column, low, high):
+    scores = np.round(active[column]).astype(int)
+    scores = scores[(scores >= low) & (scores <= high)]
+    modes = scores.mode()
+    # tahun tanpa karyawan aktif: counts kosong, mode None, mean NaN
+    return {
+        "counts": scores.value_counts().sort_index(),
+        "mode": modes.iloc[0] if len(modes) else None,
+        "mean": active[column].mean(),
+    }
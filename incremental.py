@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import compaction
+from data_loader import CATEGORY_COLUMNS, prepare_data
+from ingest import concat_chunks
+
+KEY_COLUMN = "EmpID"
+# di atas fraksi ini patch tidak lebih murah dari rebuild penuh
+MAX_DELTA_FRACTION = 0.2
+SAMPLE_IDS = 5
+
+
+# hash per baris mentah (semua kolom), index = EmpID; None kalau key tidak ada / tidak unik
+def row_hashes(raw_df, key=KEY_COLUMN):
+    if key not in raw_df.columns or not raw_df[key].is_unique:
+        return None
+    return pd.Series(pd.util.hash_pandas_object(raw_df, index=False).to_numpy(), index=pd.Index(raw_df[key]))
+
+
+# id baru, id yang isinya berubah dan id yang hilang dari extract
+def diff_rows(old, new):
+    pos = old.index.get_indexer(new.index)
+    both = pos >= 0
+    added = new.index[~both]
+    changed = new.index[both][old.to_numpy()[pos[both]] != new.to_numpy()[both]]
+    removed = old.index[~old.index.isin(new.index)]
+    return added.tolist(), changed.tolist(), removed.tolist()
+
+
+# ===============================
+# DELTA
+# ===============================
+# perubahan antara dua versi dataset: old_rows = baris lama (sudah disiapkan) yang
+# diubah/dihapus, new_rows = baris baru/diubah hasil prepare_data. Dipakai untuk
+# mem-patch agregat & index tanpa membangun ulang dari seluruh frame.
+class Delta:
+    def __init__(self, base_version, version, added, changed, removed, old_rows, new_rows, seconds=0.0):
+        self.base_version = base_version
+        self.version = version
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.old_rows = old_rows
+        self.new_rows = new_rows
+        self.seconds = seconds
+
+    @property
+    def stale_ids(self):
+        return self.changed + self.removed
+
+    def __len__(self):
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def summary(self):
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "sample": {name: [str(i) for i in ids[:SAMPLE_IDS]]
+                       for name, ids in [("added", self.added), ("changed", self.changed), ("removed", self.removed)]
+                       if ids},
+        }
+
+
+# frame baru = baris lama yang tidak berubah + baris baru/diubah yang disiapkan ulang,
+# diurutkan sesuai extract baru. Hasilnya sama dengan prepare_data(raw_df) pada hari yang sama.
+# Return None kalau perubahannya terlalu besar (rebuild penuh lebih murah).
+def patch_frame(old_df, old_hashes, raw_df, new_hashes, base_version=None, version=None,
+                today=None, key=KEY_COLUMN, max_fraction=MAX_DELTA_FRACTION):
+    start = time.perf_counter()
+    added, changed, removed = diff_rows(old_hashes, new_hashes)
+    if len(added) + len(changed) + len(removed) > max_fraction * max(len(raw_df), 1):
+        return None, None
+
+    fresh_ids = changed + added
+    raw_ids = pd.Index(raw_df[key])
+    new_rows = prepare_data(raw_df.iloc[np.sort(raw_ids.get_indexer(fresh_ids))], today)
+    stale = pd.Index(old_df[key]).isin(changed + removed)
+    old_rows = old_df[stale]
+
+    combined = concat_chunks([old_df[~stale], new_rows.copy()])
+    df = combined.iloc[pd.Index(combined[key]).get_indexer(raw_ids)].reset_index(drop=True)
+    # kategori diurutkan seperti astype("category") di prepare_data, tipe numerik
+    # disamakan lagi dengan skema (mis. kolom skor yang tidak lagi punya nilai kosong)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    compaction.compact(df)
+
+    delta = Delta(base_version, version, added, changed, removed, old_rows, new_rows,
+                  time.perf_counter() - start)
+    return df, delta
+
+
+# ===============================
+# INDEX REGISTRY
+# ===============================
+# engine metrik + index Employee Directory per versi dataset. Versi baru yang datang
+# bersama Delta dari versi terakhir di-patch (copy-on-write: session yang masih memakai
+# versi lama tidak terganggu); selain itu dibangun ulang secara lazy.
+class IndexSet:
+    def __init__(self, df, version, engine, name_index=None):
+        self.df = df
+        self.version = version
+        self.engine = engine
+        self._name_index = name_index
+        self._filter_index = None
+
+    @property
+    def name_index(self):
+        if self._name_index is None:
+            from directory import NameSearchIndex
+
+            self._name_index = NameSearchIndex.from_frame(self.df)
+        return self._name_index
+
+    # FilterIndex cukup dibangun ulang: satu factorize + argsort vektor per kolom
+    @property
+    def filter_index(self):
+        if self._filter_index is None:
+            from directory import FilterIndex
+
+            self._filter_index = FilterIndex(self.df, [col for col in CATEGORY_COLUMNS if col in self.df.columns])
+        return self._filter_index
+
+
+class IndexRegistry:
+    def __init__(self, max_entries=2):
+        self.max_entries = max_entries
+        self._sets = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"full": 0, "incremental": 0, "last_seconds": 0.0}
+
+    def get(self, df, version, delta=None, accumulator=None):
+        from hr_engine import MetricsEngine
+
+        with self._lock:
+            if version in self._sets:
+                self._sets.move_to_end(version)
+                return self._sets[version]
+            start = time.perf_counter()
+            base = self._sets.get(delta.base_version) if delta is not None and delta.version == version else None
+            if base is not None:
+                engine = base.engine.patched(delta, df, version)
+                name_index = (base._name_index.patched(df, delta.stale_ids, delta.new_rows)
+                              if base._name_index is not None else None)
+                self.stats["incremental"] += 1
+            else:
+                engine, name_index = MetricsEngine(df, version, accumulator), None
+                self.stats["full"] += 1
+            self.stats["last_seconds"] = time.perf_counter() - start
+            self._sets[version] = IndexSet(df, version, engine, name_index)
+            while len(self._sets) > self.max_entries:
+                self._sets.popitem(last=False)
+            return self._sets[version]
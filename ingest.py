@@ -0,0 +1,106 @@
+import argparse
+import json
+import time
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from data_loader import prepare_data
+from hr_metrics import YearAccumulator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# kolom yang benar-benar dipakai dashboard; kolom lain tidak dibaca sama sekali
+USED_COLUMNS = [
+    "Employee_Name", "EmpID", "Position", "Department", "EmploymentStatus", "ManagerName",
+    "PayRate", "DOB", "Sex", "MaritalDesc", "RaceDesc", "State", "DateofHire",
+    "DateofTermination", "TermReason", "PerformanceScore", "EngagementSurvey",
+    "EmpSatisfaction", "SpecialProjectsCount",
+]
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss dalam KB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# gabung potongan frame; categorical digabung dengan union supaya tidak jadi object
+def concat_chunks(chunks):
+    if not chunks:
+        return pd.DataFrame(columns=USED_COLUMNS)
+    categorical = [col for col in chunks[0].columns
+                   if isinstance(chunks[0][col].dtype, pd.CategoricalDtype)]
+    for col in categorical:
+        merged = union_categoricals([chunk[col] for chunk in chunks], ignore_order=True)
+        for chunk in chunks:
+            chunk[col] = pd.Categorical(chunk[col], categories=merged.categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+# ===============================
+# STREAMING INGESTION
+# ===============================
+# source dibaca per chunk: hanya kolom yang dipakai, tanggal di-parse per chunk,
+# tipe kolom dipadatkan (compaction.py). Setiap chunk langsung dilipat ke YearAccumulator (KPI per tahun)
+# dan, kalau keep_rows=True, disimpan sebagai potongan directory store.
+def read_chunks(source, chunksize=DEFAULT_CHUNKSIZE, fmt="csv"):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(source)
+        columns = [col for col in parquet.schema_arrow.names if col in USED_COLUMNS]
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize, usecols=lambda col: col in USED_COLUMNS)
+
+
+def ingest(source, chunksize=DEFAULT_CHUNKSIZE, keep_rows=True, fmt="csv", today=None):
+    start = time.perf_counter()
+    today = pd.Timestamp.today() if today is None else pd.Timestamp(today)
+    accumulator = YearAccumulator()
+    chunks = []
+    n_chunks = 0
+
+    for chunk in read_chunks(source, chunksize, fmt):
+        chunk = prepare_data(chunk, today=today)
+        accumulator.add(chunk)
+        if keep_rows:
+            chunks.append(chunk)
+        n_chunks += 1
+
+    df = concat_chunks(chunks) if keep_rows else None
+
+    report = {
+        "rows": accumulator.rows,
+        "chunks": n_chunks,
+        "chunksize": chunksize,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1) if df is not None else None,
+    }
+    return df, accumulator, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest an HR extract in chunks and report memory use")
+    parser.add_argument("source", help="path or URL of the CSV / Parquet extract")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--aggregates-only", action="store_true",
+                        help="only fold the per-year KPIs, do not keep the employee rows")
+    args = parser.parse_args()
+
+    fmt = "parquet" if args.source.split("?")[0].endswith(".parquet") else "csv"
+    _, accumulator, report = ingest(args.source, args.chunksize, keep_rows=not args.aggregates_only, fmt=fmt)
+    print(accumulator.snapshot().tail(5).to_string())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
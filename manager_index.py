@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from hr_metrics import _year_end_days, data_years
+
+MANAGER_COLUMN = "ManagerName"
+SCORE_MEANS = {"PerformanceScore": "AvgPerformance", "EngagementSurvey": "AvgEngagement",
+               "EmpSatisfaction": "AvgSatisfaction"}
+KPI_COLUMNS = ["Headcount", "ActiveCount", "Leavers", "TurnoverRate", "AvgTenure", "AvgMonthlyPay",
+               *SCORE_MEANS.values()]
+
+
+# ===============================
+# TEAM KPI PER TAHUN
+# ===============================
+# rumus yang sama dengan YearAccumulator (hr_metrics), tapi histogram-nya 2 dimensi:
+# manager x tahun. Satu bincount per besaran atas (kode manager, tahun), lalu cumsum
+# sepanjang sumbu tahun; histogram diproses satu per satu supaya memori tetap
+# manager x tahun, bukan manager x tahun x jumlah besaran.
+def team_year_kpis(df, codes, n_groups, years=None):
+    years = sorted(data_years(df) if years is None else years)
+    if not years or not n_groups:
+        return pd.DataFrame(columns=["Group", "Year", *KPI_COLUMNS])
+    # sumbu tahun: satu tahun sebelum data (untuk "vs prev year") sampai tahun terakhir
+    first, last = int(years[0]) - 1, int(years[-1])
+    width = last - first + 1
+    axis_years = np.arange(first, last + 1)
+
+    hire_year = df["HireYear"].to_numpy(dtype="float64")
+    term_year = df["TermYear"].to_numpy(dtype="float64")
+    hire_days = df["DateofHire"].to_numpy(dtype="datetime64[D]").astype("int64").astype("float64")
+    term_days = df["DateofTermination"].to_numpy(dtype="datetime64[D]").astype("int64").astype("float64")
+    pay = df["MonthlyPay"].to_numpy(dtype="float64")
+    is_active = (df["EmploymentStatus"].astype(str).str.lower() == "active").to_numpy()
+    has_group = codes >= 0
+
+    span = has_group & ~np.isnan(hire_year) & (np.isnan(term_year) | (term_year >= hire_year))
+    left = span & ~np.isnan(term_year)
+
+    def hist(year, mask, weights=None):
+        idx = np.clip(year[mask] - first, 0, width - 1).astype("int64")
+        cells = codes[mask].astype("int64") * width + idx
+        weights = None if weights is None else weights[mask]
+        return np.bincount(cells, weights=weights, minlength=n_groups * width).reshape(n_groups, width)
+
+    # jumlah s/d tahun y dan s/d tahun y-1
+    def upto(year, mask, weights=None):
+        return hist(year, mask, weights).cumsum(axis=1)
+
+    def before(year, mask, weights=None):
+        cum = upto(year, mask, weights)
+        return np.concatenate([np.zeros((n_groups, 1)), cum[:, :-1]], axis=1)
+
+    # aktif di tahun y (sumber rata-rata): masuk <= y dan tidak keluar sebelum y
+    def in_year(weights=None):
+        return upto(hire_year, span, weights) - before(term_year, left, weights)
+
+    headcount = in_year()
+    leavers = hist(term_year, has_group & ~np.isnan(term_year))
+    active_count = upto(hire_year, span & is_active) - before(term_year, left & is_active)
+    staying = upto(hire_year, span) - upto(term_year, left)
+    tenure_sum = (hist(term_year, left, term_days - hire_days)
+                  + staying * _year_end_days(axis_years)
+                  - (upto(hire_year, span, hire_days) - upto(term_year, left, hire_days)))
+
+    columns = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        columns["Headcount"] = headcount
+        columns["ActiveCount"] = active_count
+        columns["Leavers"] = leavers
+        columns["TurnoverRate"] = np.where(headcount > 0, np.round(leavers / headcount * 100, 2), 0)
+        columns["AvgTenure"] = np.where(headcount > 0, tenure_sum / headcount / 365.25, 0)
+        columns["AvgMonthlyPay"] = np.where(headcount > 0, in_year(pay) / headcount, 0)
+        for col, name in SCORE_MEANS.items():
+            values = df[col].to_numpy(dtype="float64") if col in df.columns else np.full(len(df), np.nan)
+            scored = ~np.isnan(values)
+            count = (upto(hire_year, span & scored) - before(term_year, left & scored))
+            total = (upto(hire_year, span & scored, np.nan_to_num(values))
+                     - before(term_year, left & scored, np.nan_to_num(values)))
+            columns[name] = np.where(count > 0, total / count, np.nan)
+
+    table = pd.DataFrame({
+        "Group": np.repeat(np.arange(n_groups), width),
+        "Year": np.tile(axis_years, n_groups),
+        **{name: values.ravel() for name, values in columns.items()},
+    })
+    for col in ["Headcount", "ActiveCount", "Leavers"]:
+        table[col] = table[col].round().astype("int64")
+    # manager x tahun tanpa anggota tim maupun yang keluar tidak disimpan
+    return table[(table["Headcount"] > 0) | (table["Leavers"] > 0)].reset_index(drop=True)
+
+
+# ===============================
+# MANAGER INDEX
+# ===============================
+# dibangun sekali per versi dataset: manager -> posisi baris anak buah langsung, dan
+# tabel KPI tim per tahun yang sudah dipecah per tahun. Ganti tahun = lookup dict,
+# buka satu tim = lookup dict + iloc, tanpa scan frame.
+# ManagerName adalah nilai saat ini, jadi KPI tahun lalu memakai susunan tim sekarang.
+class ManagerIndex:
+    def __init__(self, df, years=None, column=MANAGER_COLUMN):
+        values = df[column].astype(object) if column in df.columns else pd.Series(np.nan, index=df.index)
+        codes, managers = pd.factorize(values.reset_index(drop=True), sort=True)
+        self.managers = pd.Index(managers, name=column)
+        self._codes = {name: code for code, name in enumerate(self.managers)}
+
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(self.managers) + 1))
+        self.rows = [order[bounds[k]:bounds[k + 1]] for k in range(len(self.managers))]
+        self.direct_reports = pd.Series(np.diff(bounds), index=self.managers, name="DirectReports")
+
+        table = team_year_kpis(df, codes, len(self.managers), years)
+        table.insert(0, column, self.managers.to_numpy()[table.pop("Group").to_numpy()])
+        self.by_year = {int(year): frame.drop(columns="Year").set_index(column).join(self.direct_reports)
+                        for year, frame in table.groupby("Year", sort=True)}
+        self._empty = pd.DataFrame(columns=KPI_COLUMNS + ["DirectReports"], index=self.managers[:0])
+
+    @classmethod
+    def from_frame(cls, df, years=None, column=MANAGER_COLUMN):
+        return cls(df, years, column)
+
+    def __len__(self):
+        return len(self.managers)
+
+    # posisi baris (df) anak buah langsung satu manager
+    def team_rows(self, manager):
+        code = self._codes.get(manager)
+        return self.rows[code] if code is not None else np.empty(0, dtype="int64")
+
+    # KPI semua tim di satu tahun (index = manager)
+    def year_table(self, year):
+        return self.by_year.get(int(year), self._empty)
+
+    # tahun tanpa tim (atau di luar data) = NaN, bukan 0, supaya delta tidak dihitung dari 0
+    def team_kpis(self, manager, year):
+        table = self.year_table(year)
+        if manager in table.index:
+            return table.loc[manager, KPI_COLUMNS]
+        return pd.Series(np.nan, index=KPI_COLUMNS, dtype="float64")
+
+    # peringkat manager di satu tahun; min_headcount membuang tim yang terlalu kecil
+    def ranking(self, year, by="TurnoverRate", ascending=False, min_headcount=1):
+        table = self.year_table(year)
+        table = table[table["Headcount"] >= min_headcount]
+        return table.sort_values([by, "Headcount"], ascending=[ascending, False])
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from data_loader import FileSource, UrlSource, read_raw
+
+SOURCE_COLUMN = "Source"
+# kolom yang wajib ada di setiap sheet (dipakai KPI, chart dan directory)
+REQUIRED_COLUMNS = ["Employee_Name", "EmpID", "Position", "Department", "EmploymentStatus",
+                    "ManagerName", "PayRate", "DateofHire", "DateofTermination"]
+NUMERIC_COLUMNS = ["PayRate", "EmpID"]
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class SourceError(RuntimeError):
+    pass
+
+
+# "North=https://...;South=/data/south.csv" -> {"North": "https://...", "South": "/data/south.csv"}
+# nama dipisah di "=" pertama, jadi query string di URL tetap utuh
+def parse_sources_spec(spec):
+    sources = {}
+    for item in spec.replace("\n", ";").split(";"):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, location = item.partition("=")
+        if not sep or not name.strip() or not location.strip():
+            raise ValueError(f"expected NAME=LOCATION, got {item!r}")
+        sources[name.strip()] = location.strip()
+    return sources
+
+
+def check_schema(frames):
+    problems = []
+    for name, frame in frames.items():
+        missing = [col for col in REQUIRED_COLUMNS if col not in frame.columns]
+        if "DOB" not in frame.columns and "Age" not in frame.columns:
+            missing.append("DOB/Age")
+        if missing:
+            problems.append(f"{name}: missing {', '.join(missing)}")
+        bad_types = [col for col in NUMERIC_COLUMNS
+                     if col in frame.columns and not pd.api.types.is_numeric_dtype(frame[col])]
+        if bad_types:
+            problems.append(f"{name}: non-numeric {', '.join(bad_types)}")
+    if problems:
+        raise SchemaError("incompatible sources: " + "; ".join(problems))
+
+
+# ===============================
+# MULTI SOURCE
+# ===============================
+# beberapa sheet (per unit bisnis) di-fetch bersamaan lewat asyncio: tiap source punya
+# timeout & retry sendiri, koneksi HTTP dipakai ulang lewat satu requests.Session.
+# Interface fetch() sama dengan UrlSource/FileSource sehingga DataLoader (TTL, snapshot)
+# tetap dipakai; raw = list (nama, bytes) dan parse() menggabungkan hasilnya.
+class MultiSource:
+    format = "multi"
+
+    def __init__(self, sources, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 max_connections=8, parse_workers=None, allow_partial=False):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.parse_workers = parse_workers or min(len(sources), os.cpu_count() or 1)
+        self.allow_partial = allow_partial
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.sources = {name: self._make(location) for name, location in sources.items()}
+        # validator & bytes terakhir per source, untuk conditional request dan allow_partial
+        self._validators = {name: (None, None) for name in self.sources}
+        self._raw = {}
+        self.report = {}
+
+    def _make(self, location):
+        if str(location).startswith(("http://", "https://")):
+            return UrlSource(location, timeout=self.timeout, session=self.session)
+        return FileSource(location)
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_connections,
+                                                        pool_maxsize=self.max_connections)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def __repr__(self):
+        return f"MultiSource({list(self.sources)!r})"
+
+    # ===============================
+    # FETCH
+    # ===============================
+    async def _fetch_one(self, name, source, pool, conditional):
+        loop = asyncio.get_running_loop()
+        etag, last_modified = self._validators[name] if conditional else (None, None)
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                raw, etag, last_modified = await asyncio.wait_for(
+                    loop.run_in_executor(pool, source.fetch, etag, last_modified), self.timeout)
+                self._validators[name] = (etag, last_modified)
+                self.report[name] = {"attempts": attempt + 1, "seconds": round(time.perf_counter() - start, 3),
+                                     "changed": raw is not None, "error": None}
+                return name, raw
+            except Exception as e:
+                error = e
+                if attempt < self.retries:
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+        self.report[name] = {"attempts": self.retries + 1, "seconds": round(time.perf_counter() - start, 3),
+                             "changed": False, "error": f"{type(error).__name__}: {error}"}
+        return name, error
+
+    async def fetch_async(self, conditional=True):
+        pool = ThreadPoolExecutor(max_workers=self.max_connections)
+        try:
+            results = await asyncio.gather(*(self._fetch_one(name, source, pool, conditional)
+                                             for name, source in self.sources.items()))
+        finally:
+            # thread yang kena timeout tidak ditunggu, supaya startup tetap dibatasi timeout
+            pool.shutdown(wait=False, cancel_futures=True)
+        changed, failed = False, []
+        for name, result in results:
+            if isinstance(result, Exception):
+                failed.append(name)
+            elif result is not None:
+                self._raw[name] = result
+                changed = True
+        if failed and not (self.allow_partial and len(failed) < len(self.sources)):
+            errors = "; ".join(f"{name}: {self.report[name]['error']}" for name in failed)
+            raise SourceError(f"failed to fetch {len(failed)} source(s): {errors}")
+        return changed
+
+    def fetch(self, etag=None, last_modified=None):
+        # etag dari DataLoader = gabungan validator semua source; None berarti fetch penuh
+        changed = asyncio.run(self.fetch_async(conditional=etag is not None))
+        combined = self._combined_etag()
+        if not changed and etag is not None and etag == combined:
+            return None, etag, None
+        parts = [(name, self._raw[name]) for name in self.sources if name in self._raw]
+        return parts, combined, None
+
+    def _combined_etag(self):
+        tags = "|".join(f"{name}:{tag}:{modified}" for name, (tag, modified) in self._validators.items())
+        return hashlib.sha1(tags.encode()).hexdigest()
+
+    # ===============================
+    # PARSE
+    # ===============================
+    def parse(self, parts):
+        names = [name for name, _ in parts]
+        with ThreadPoolExecutor(max_workers=self.parse_workers) as pool:
+            frames = dict(zip(names, pool.map(
+                lambda part: read_raw(part[1], self.sources[part[0]].format), parts)))
+        check_schema(frames)
+        for name, frame in frames.items():
+            frame.insert(0, SOURCE_COLUMN, name)
+        return pd.concat(frames.values(), ignore_index=True, sort=False)
+
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# RSS saat ini (MB); /proc di Linux, selain itu peak RSS dari resource
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def count(self, rows):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, profiler, name, rows):
+        self.profiler = profiler
+        self.record = {"name": name, "rows": rows}
+
+    def __enter__(self):
+        self.profiler._open(self.record)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._close(self.record)
+        return False
+
+    def count(self, rows):
+        self.record["rows"] = rows
+
+
+# ===============================
+# PROFILER
+# ===============================
+# span waktu bernama + jumlah baris + selisih RSS per bagian dashboard.
+# section() menutup bagian sebelumnya lalu membuka yang baru (urut atas-bawah seperti
+# script Streamlit); span() untuk blok bersarang. Kalau enabled=False semua method
+# langsung return, jadi biayanya cuma satu pemanggilan fungsi.
+class Profiler:
+    def __init__(self, enabled=False, track_memory=True):
+        self.enabled = enabled
+        self.track_memory = track_memory
+        self.records = []
+        self._origin = time.perf_counter()
+        self._stack = []
+        self._section = None
+        self.ended = False
+
+    def span(self, name, rows=None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, rows)
+
+    def section(self, name, rows=None):
+        if not self.enabled:
+            return
+        if self._section is not None:
+            self._close(self._section)
+        self._section = {"name": name, "rows": rows}
+        self._open(self._section)
+
+    # jumlah baris yang diproses bagian yang sedang terbuka
+    def count(self, rows):
+        if not self.enabled:
+            return
+        if self._stack:
+            self._stack[-1]["rows"] = rows
+
+    def end(self):
+        if not self.enabled:
+            return
+        while self._stack:
+            self._close(self._stack[-1])
+        self._section = None
+        self.ended = True
+
+    def _open(self, record):
+        record["depth"] = len(self._stack)
+        record["thread"] = threading.get_ident()
+        record["mem_start_mb"] = current_rss_mb() if self.track_memory else float("nan")
+        record["start"] = time.perf_counter()
+        record["start_ms"] = (record["start"] - self._origin) * 1000
+        self._stack.append(record)
+
+    def _close(self, record):
+        end = time.perf_counter()
+        if not any(r is record for r in self._stack):
+            return
+        # span anak yang belum ditutup ikut ditutup
+        while self._stack:
+            top = self._stack.pop()
+            top["duration_ms"] = (end - top.pop("start")) * 1000
+            mem_end = current_rss_mb() if self.track_memory else float("nan")
+            top["mem_delta_mb"] = mem_end - top["mem_start_mb"]
+            self.records.append(top)
+            if top is record:
+                break
+        if record is self._section:
+            self._section = None
+
+    # ===============================
+    # EXPORT
+    # ===============================
+    def summary(self):
+        columns = ["name", "depth", "start_ms", "duration_ms", "rows", "mem_start_mb", "mem_delta_mb"]
+        frame = pd.DataFrame(self.records, columns=columns + ["thread"])[columns]
+        return frame.sort_values("start_ms", kind="stable").reset_index(drop=True).round(3)
+
+    def total_ms(self):
+        return sum(r["duration_ms"] for r in self.records if r["depth"] == 0)
+
+    def to_json(self):
+        return json.dumps({
+            "total_ms": round(self.total_ms(), 3),
+            "spans": self.summary().to_dict(orient="records"),
+        }, indent=2, default=str)
+
+    # format trace_event Chrome (buka lewat chrome://tracing atau Perfetto)
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        events = [{
+            "name": r["name"],
+            "ph": "X",
+            "ts": round(r["start_ms"] * 1000, 1),
+            "dur": round(r["duration_ms"] * 1000, 1),
+            "pid": pid,
+            "tid": r["thread"],
+            "args": {"rows": r["rows"], "mem_delta_mb": round(r["mem_delta_mb"], 3)},
+        } for r in self.records]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
@@ -0,0 +1,98 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_MB = 256
+
+
+# perkiraan ukuran objek di memori (frame, series, array, dict/list berisi itu)
+def sizeof(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# ===============================
+# SHARED LRU CACHE
+# ===============================
+# satu instance per proses (lewat st.cache_resource) dipakai semua session.
+# kunci = (versi dataset, tahun, nama agregat). Begitu versi dataset berubah,
+# semua entry versi lama dibuang; sisanya dievict LRU kalau melewati batas memori.
+class SharedCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 2**20, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = None
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get_or_compute(self, version, year, name, compute):
+        key = (version, year, name)
+        with self._lock:
+            if version != self.version:
+                self._invalidate(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._entries[key][0]
+            self.stats["misses"] += 1
+
+        # dihitung di luar lock supaya session lain tidak menunggu
+        value = compute()
+        size = sizeof(value)
+        with self._lock:
+            if version == self.version and key not in self._entries:
+                self._entries[key] = (value, size)
+                self.bytes += size
+                self._evict()
+        return value
+
+    def _invalidate(self, version):
+        if self._entries:
+            self.stats["invalidations"] += 1
+        self._entries.clear()
+        self.bytes = 0
+        self.version = version
+
+    def _evict(self):
+        while self._entries and (
+            self.bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def summary(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "mb": round(self.bytes / 2**20, 2),
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,110 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+import pandas as pd
+
+# naikkan kalau prepare_data berubah supaya snapshot lama tidak dipakai
+SNAPSHOT_FORMAT = 2
+DEFAULT_SNAPSHOT_DIR = ".hr_cache"
+
+
+# ===============================
+# ARROW SNAPSHOT
+# ===============================
+# frame yang sudah disiapkan disimpan sebagai file Arrow IPC (tanpa kompresi) supaya
+# bisa dibuka lewat memory-map. Kunci = hash isi source + tanggal (TenureYears dan Age
+# dihitung terhadap hari ini) + versi format.
+def snapshot_path(snapshot_dir, version, today=None):
+    day = (pd.to_datetime("today") if today is None else pd.Timestamp(today)).strftime("%Y%m%d")
+    return os.path.join(snapshot_dir, f"hr-{version}-{day}-v{SNAPSHOT_FORMAT}.arrow")
+
+
+def save_snapshot(df, snapshot_dir, version, today=None):
+    import pyarrow as pa
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = snapshot_path(snapshot_dir, version, today)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    prune_snapshots(snapshot_dir, keep=path)
+    return path
+
+
+def load_snapshot(snapshot_dir, version, today=None):
+    path = snapshot_path(snapshot_dir, version, today)
+    if not os.path.exists(path):
+        return None
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+# hapus snapshot lain (versi data / tanggal lama)
+def prune_snapshots(snapshot_dir, keep):
+    for path in glob.glob(os.path.join(snapshot_dir, "hr-*.arrow")):
+        if os.path.abspath(path) != os.path.abspath(keep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# ===============================
+# CLI
+# ===============================
+def build(args):
+    from data_loader import DataLoader, make_source
+
+    loader = DataLoader(make_source(args.source), snapshot_dir=args.dir)
+    start = time.perf_counter()
+    df = loader.get()
+    print(json.dumps({
+        "snapshot": snapshot_path(args.dir, loader.version),
+        "rows": len(df),
+        "seconds": round(time.perf_counter() - start, 3),
+    }, indent=2))
+
+
+# cold start: parse CSV + prepare vs buka snapshot
+def bench(args):
+    from data_loader import DataLoader, make_source
+
+    # pastikan snapshot sudah ada sebelum diukur
+    DataLoader(make_source(args.source), snapshot_dir=args.dir).get()
+
+    timings = {}
+    for label, snapshot_dir in [("csv_parse", None), ("snapshot", args.dir)]:
+        runs = []
+        for _ in range(args.repeat):
+            loader = DataLoader(make_source(args.source), snapshot_dir=snapshot_dir)
+            start = time.perf_counter()
+            loader.get()
+            runs.append(time.perf_counter() - start)
+        timings[label] = round(min(runs), 4)
+    timings["speedup"] = round(timings["csv_parse"] / timings["snapshot"], 1)
+    print(json.dumps(timings, indent=2))
+
+
+def main():
+    from data_loader import CSV_URL
+
+    parser = argparse.ArgumentParser(description="Build or benchmark the prepared-frame snapshot cache")
+    parser.add_argument("command", choices=["build", "bench"])
+    parser.add_argument("--source", default=os.environ.get("HR_DATA_SOURCE", CSV_URL))
+    parser.add_argument("--dir", default=os.environ.get("HR_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (bench)")
+    args = parser.parse_args()
+    {"build": build, "bench": bench}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
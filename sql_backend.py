@@ -0,0 +1,587 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import hr_metrics
+from data_loader import prepare_data
+from directory import normalize_name
+from employment_index import period_bounds
+from hr_engine import SCORE_COLUMNS, MetricsEngine
+from hr_metrics import _N_YEARS, YEAR_MIN, YearAccumulator
+from ingest import DEFAULT_CHUNKSIZE, peak_rss_mb, read_chunks
+from turnover_cube import DIMENSIONS, TurnoverCube
+
+# naikkan kalau skema tabel berubah supaya file lama dibangun ulang
+DB_FORMAT = 1
+TABLE = "employees"
+# kolom filter Employee Directory (diberi index)
+FILTER_COLUMNS = ["EmploymentStatus", "Department", "Position", "ManagerName", "Source"]
+# index covering untuk query karyawan aktif per tahun (Tab 1): yang dibaca hanya entri
+# index baris Active dalam rentang hire_day, tanpa membuka baris tabel yang lebar
+ACTIVE_INDEX = ["is_active", "hire_day", "term_day", "Sex", "MaritalDesc", "dob_year", "Department",
+                "SpecialProjectsCount", "PerformanceScore", "EngagementSurvey", "EmpSatisfaction"]
+# batas baris tabel "View Employees" yang diambil sekaligus
+MAX_TABLE_ROWS = 10_000
+# kolom turunan untuk query: posisi baris, tanggal dalam hari, nama ternormalisasi, dst.
+DERIVED = {
+    "row_id": "INTEGER PRIMARY KEY",
+    "hire_day": "INTEGER",
+    "term_day": "INTEGER",
+    "is_active": "INTEGER",
+    "dob_year": "INTEGER",
+    "name_key": "TEXT",
+}
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+# ===============================
+# BUILD
+# ===============================
+# extract dibaca per chunk (ingest.read_chunks), disiapkan dengan prepare_data yang sama
+# dengan jalur pandas, lalu ditulis ke file SQLite. Memori = satu chunk, berapapun besar
+# extract-nya. Tanggal disimpan sebagai integer (unit asli + hari), categorical sebagai TEXT;
+# tipe kolom frame dicatat di tabel meta supaya hasil query bisa dikembalikan ke tipe aslinya.
+def _sql_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "INTEGER"
+    return "TEXT"
+
+
+def _days(values):
+    days = values.to_numpy(dtype="datetime64[D]")
+    out = days.astype("int64").astype(object)
+    out[np.isnat(days)] = None
+    return out
+
+
+def _table_frame(chunk, offset):
+    frame = pd.DataFrame(index=chunk.index)
+    for col in chunk.columns:
+        values = chunk[col]
+        if pd.api.types.is_datetime64_dtype(values.dtype):
+            ints = values.to_numpy().astype("int64").astype(object)
+            ints[values.isna().to_numpy()] = None
+            frame[col] = ints
+        elif isinstance(values.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(values.dtype):
+            frame[col] = values.astype(object).where(values.notna(), None)
+        else:
+            frame[col] = values
+    frame["row_id"] = np.arange(offset, offset + len(chunk))
+    frame["hire_day"] = _days(chunk["DateofHire"])
+    frame["term_day"] = _days(chunk["DateofTermination"])
+    frame["is_active"] = (chunk["EmploymentStatus"].astype(str).str.lower() == "active").astype("int8")
+    # sama dengan hr_metrics.age_distribution: tahun lahir dari DOB
+    frame["dob_year"] = pd.to_datetime(chunk["DOB"], errors="coerce").dt.year.astype("Int64").astype(object)
+    frame["dob_year"] = frame["dob_year"].where(frame["dob_year"].notna(), None)
+    frame["name_key"] = [normalize_name(n) if pd.notna(n) else "" for n in chunk["Employee_Name"]]
+    return frame
+
+
+# tipe kolom gabungan semua chunk: integer + float (chunk dengan nilai kosong) = float32,
+# sama dengan compaction frame utuh
+def _merge_schema(schema, chunk):
+    for col, dtype in chunk.dtypes.items():
+        dtype, old = str(dtype), schema.get(col)
+        if old is None or old == dtype:
+            schema[col] = dtype
+        elif "float32" in (old, dtype) and all(d.startswith(("int", "float")) for d in (old, dtype)):
+            schema[col] = "float32"
+        elif "category" in (old, dtype):
+            schema[col] = "category"
+        else:
+            schema[col] = "object"
+    return schema
+
+
+def file_version(source):
+    if os.path.exists(source):
+        # sama dengan data_loader.content_version untuk satu file, tanpa memuat isinya
+        sha = hashlib.sha1()
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(2**20), b""):
+                sha.update(block)
+        return sha.hexdigest()[:12]
+    return hashlib.sha1(f"{source}{time.time()}".encode()).hexdigest()[:12]
+
+
+def build(source, db_path, chunksize=DEFAULT_CHUNKSIZE, fmt="csv", today=None):
+    start = time.perf_counter()
+    today = pd.Timestamp("today") if today is None else pd.Timestamp(today)
+    tmp_path = f"{db_path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    schema, rows, n_chunks = {}, 0, 0
+    try:
+        for chunk in read_chunks(source, chunksize, fmt):
+            chunk = prepare_data(chunk, today=today)
+            schema = _merge_schema(schema, chunk)
+            frame = _table_frame(chunk, rows)
+            if not n_chunks:
+                columns = [f"{_quote(col)} {DERIVED.get(col) or _sql_type(chunk[col].dtype)}" for col in frame.columns]
+                conn.execute(f"CREATE TABLE {TABLE} ({', '.join(columns)})")
+            placeholders = ", ".join("?" * len(frame.columns))
+            conn.executemany(f"INSERT INTO {TABLE} VALUES ({placeholders})",
+                             frame.itertuples(index=False, name=None))
+            rows += len(chunk)
+            n_chunks += 1
+        if not n_chunks:
+            raise ValueError(f"{source}: no rows")
+
+        # index untuk filter directory dan query per tahun / tanggal
+        for col in ["HireYear", "TermYear", "hire_day", "term_day", *FILTER_COLUMNS]:
+            if col in schema or col in DERIVED:
+                conn.execute(f"CREATE INDEX idx_{col} ON {TABLE} ({_quote(col)})")
+        active_columns = ", ".join(_quote(col) for col in ACTIVE_INDEX if col in schema or col in DERIVED)
+        conn.execute(f"CREATE INDEX idx_active ON {TABLE} ({active_columns})")
+        meta = {
+            "format": DB_FORMAT,
+            "version": file_version(source),
+            "rows": rows,
+            "schema": schema,
+            "today": today.isoformat(),
+            "built_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        }
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [(k, json.dumps(v)) for k, v in meta.items()])
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return {
+        "db": db_path,
+        "version": meta["version"],
+        "rows": rows,
+        "chunks": n_chunks,
+        "chunksize": chunksize,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "db_mb": round(os.path.getsize(db_path) / 2**20, 1),
+    }
+
+
+# ===============================
+# SQL ENGINE
+# ===============================
+# MetricsEngine yang datanya ada di file SQLite, bukan di frame: KPI, agregat Tab 1 dan
+# Employee Directory dijawab dengan GROUP BY / WHERE / ORDER BY ... LIMIT, yang dibawa ke
+# Python hanya baris hasilnya. Hitungan per grup diproses dengan fungsi akhir yang sama
+# dengan jalur pandas (hr_metrics.count_table, dept_table, ...), jadi urutan & isi tabel
+# sama; rata-rata float bisa beda di digit terakhir karena urutan penjumlahan.
+# Retention, Manager View dan attrition butuh frame utuh dan tidak didukung di sini.
+class SQLEngine(MetricsEngine):
+    def __init__(self, db_path):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"{db_path}: build it first with `python sql_backend.py build`")
+        self.db_path = db_path
+        self._local = threading.local()
+        meta = dict(self.query("SELECT key, value FROM meta"))
+        meta = {key: json.loads(value) for key, value in meta.items()}
+        if meta.get("format") != DB_FORMAT:
+            raise ValueError(f"{db_path}: database format {meta.get('format')}, expected {DB_FORMAT}; rebuild it")
+        super().__init__(None, meta["version"])
+        self.meta = meta
+        self.rows = meta["rows"]
+        self.schema = meta["schema"]
+        self.columns = list(self.schema)
+
+    # satu koneksi read-only per thread (session Streamlit jalan di thread berbeda)
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.db_path)}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def query(self, sql, params=()):
+        return self._conn().execute(sql, params).fetchall()
+
+    # baris hasil query -> frame dengan tipe kolom seperti frame hasil prepare_data
+    def frame(self, sql, params=(), columns=None):
+        cursor = self._conn().execute(sql, params)
+        frame = self._restore(cursor.fetchall(), [d[0] for d in cursor.description])
+        return frame if columns is None else frame[columns]
+
+    # hasil query besar per potongan (fetchmany), memori = satu chunk
+    def frames(self, sql, params=(), chunksize=DEFAULT_CHUNKSIZE):
+        cursor = self._conn().execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        try:
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    return
+                yield self._restore(rows, names)
+        finally:
+            cursor.close()
+
+    def _restore(self, rows, names):
+        frame = pd.DataFrame(rows, columns=names)
+        if "row_id" in frame.columns:
+            frame = frame.set_index("row_id").rename_axis(None)
+        for col in frame.columns:
+            dtype = self.schema.get(col)
+            if dtype is None or dtype == "object":
+                continue
+            if dtype.startswith("datetime64"):
+                values = pd.to_numeric(frame[col]).to_numpy(dtype="float64")
+                unit = dtype[dtype.index("[") + 1:-1]
+                frame[col] = pd.Series(pd.to_datetime(values, unit=unit), index=frame.index).astype(dtype)
+            else:
+                frame[col] = frame[col].astype(dtype)
+        return frame
+
+    @property
+    def survival(self):
+        raise NotImplementedError("retention curves need the pandas frame (HR_SQLITE is not supported)")
+
+    @property
+    def manager_index(self):
+        raise NotImplementedError("the manager index needs the pandas frame (HR_SQLITE is not supported)")
+
+    # ===============================
+    # KPI
+    # ===============================
+    # histogram YearAccumulator diisi dari GROUP BY HireYear / TermYear; snapshot, kpis()
+    # dan years() lalu jalan tanpa perubahan
+    @property
+    def accumulator(self):
+        if self._accumulator is None:
+            self._accumulator = self._year_accumulator()
+        return self._accumulator
+
+    def _year_accumulator(self):
+        accumulator = YearAccumulator()
+        accumulator.rows = self.rows
+        span = "HireYear IS NOT NULL AND (TermYear IS NULL OR TermYear >= HireYear)"
+
+        def fill(sql, fields):
+            rows = self.query(sql)
+            if not rows:
+                return np.empty((0, len(fields) + 1))
+            data = np.array(rows, dtype="float64")
+            idx = np.clip(data[:, 0] - YEAR_MIN, 0, _N_YEARS).astype("int64")
+            for k, name in enumerate(fields, 1):
+                if name:
+                    np.add.at(accumulator.hist[name], idx, data[:, k])
+            return data
+
+        fill(f"SELECT HireYear, COUNT(*), TOTAL(MonthlyPay), SUM(is_active), SUM(hire_day) "
+             f"FROM {TABLE} WHERE {span} GROUP BY HireYear", ["hire", "pay_hire", "act_hire", "days_hire"])
+        fill(f"SELECT TermYear, COUNT(*), TOTAL(MonthlyPay), SUM(is_active), SUM(hire_day), "
+             f"SUM(term_day - hire_day) FROM {TABLE} WHERE {span} AND TermYear IS NOT NULL GROUP BY TermYear",
+             ["term", "pay_term", "act_term", "days_term", "tenure_leave"])
+        leavers = fill(f"SELECT TermYear, COUNT(*) FROM {TABLE} WHERE TermYear IS NOT NULL GROUP BY TermYear",
+                       ["leavers"])
+        hires = fill(f"SELECT HireYear, COUNT(*) FROM {TABLE} WHERE HireYear IS NOT NULL GROUP BY HireYear", [None])
+        for year, count in np.concatenate([hires, leavers])[:, :2]:
+            accumulator.year_counts[int(year)] = accumulator.year_counts.get(int(year), 0) + int(count)
+        return accumulator
+
+    @property
+    def turnover_cube(self):
+        if self._turnover_cube is None:
+            dims = [dim for dim in DIMENSIONS if dim in self.schema]
+            keys = ", ".join(f"COALESCE({_quote(dim)}, '(none)')" for dim in dims)
+            rows = self.query(f"SELECT term_day, {keys}, COUNT(*) FROM {TABLE} WHERE term_day IS NOT NULL "
+                              f"GROUP BY 1, {', '.join(str(k) for k in range(2, len(dims) + 2))}")
+            daily = pd.DataFrame(rows, columns=["TermDate", *dims, "Count"])
+            daily["TermDate"] = pd.to_datetime(daily["TermDate"].to_numpy(dtype="int64"), unit="D").astype(
+                self.schema["DateofTermination"])
+            self._turnover_cube = TurnoverCube.from_daily(
+                daily.set_index(["TermDate", *dims])["Count"].astype("int64").sort_index())
+        return self._turnover_cube
+
+    # ===============================
+    # TAB 1 AGGREGATES
+    # ===============================
+    # sama dengan EmploymentIndex.active_positions(year, "Y") + status Active
+    def _active_where(self, year):
+        start, end = period_bounds(int(year), "Y")
+        where = ("is_active = 1 AND hire_day IS NOT NULL AND hire_day <= :end AND "
+                 "(term_day IS NULL OR term_day >= :start)")
+        return where, {"start": start, "end": end}
+
+    # frame tidak dibawa ke Python: agregat dihitung langsung dari filter tahun
+    def active_employees(self, year):
+        return None
+
+    def active_count(self, year, active=None):
+        where, params = self._active_where(year)
+        return self.query(f"SELECT COUNT(*) FROM {TABLE} WHERE {where}", params)[0][0]
+
+    # seperti value_counts(): hitungan per nilai dalam urutan kemunculan pertama, lalu stable sort
+    def _value_counts(self, column, where, params):
+        rows = self.query(f"SELECT {_quote(column)}, COUNT(*) FROM {TABLE} WHERE {where} "
+                          f"AND {_quote(column)} IS NOT NULL GROUP BY 1 ORDER BY MIN(row_id)", params)
+        values, counts = zip(*rows) if rows else ((), ())
+        index = pd.Index(values, dtype="str" if self.schema.get(column) != "object" else object, name=column)
+        return pd.Series(counts, index=index, dtype="int64", name="count").sort_values(ascending=False, kind="stable")
+
+    def categories(self, column):
+        if column not in self.schema:
+            return []
+        return [value for (value,) in self.query(
+            f"SELECT DISTINCT {_quote(column)} FROM {TABLE} WHERE {_quote(column)} IS NOT NULL ORDER BY 1")]
+
+    def demographics(self, year, active=None):
+        where, params = self._active_where(year)
+        rows = self.query(f"SELECT dob_year, COUNT(*) FROM {TABLE} WHERE {where} GROUP BY 1 ORDER BY 1", params)
+        born = np.array([np.nan if y is None else y for y, _ in rows], dtype="float64")
+        counts = np.array([c for _, c in rows], dtype="int64")
+        ages = np.repeat(year - born, counts)
+        ages = ages.astype("int32") if not np.isnan(ages).any() else ages
+        return {
+            "gender": hr_metrics.count_table(self._value_counts("Sex", where, params), ["Gender", "Count"]),
+            "age": hr_metrics.age_summary(pd.DataFrame({"Age": ages})),
+            "marital": hr_metrics.count_table(self._value_counts("MaritalDesc", where, params),
+                                              ["Marital Status", "Count"]),
+        }
+
+    def departments(self, year, active=None):
+        where, params = self._active_where(year)
+        categories = pd.CategoricalIndex(self.categories("Department"), name="Department")
+        rows = dict(self.query(f"SELECT Department, COUNT(*) FROM {TABLE} WHERE {where} "
+                               f"AND Department IS NOT NULL GROUP BY 1", params))
+        employees = pd.Series([rows.get(dept, 0) for dept in categories], index=categories,
+                              dtype="int64", name="count").sort_values(ascending=False, kind="stable")
+
+        # urutan kategori seperti groupby(observed=True): hanya departemen yang punya karyawan aktif
+        totals = dict(self.query(f"SELECT Department, COALESCE(SUM(SpecialProjectsCount), 0) FROM {TABLE} "
+                                 f"WHERE {where} AND Department IS NOT NULL GROUP BY 1", params))
+        names = [dept for dept in categories if dept in totals]
+        dtype = "int64" if self.schema.get("SpecialProjectsCount", "").startswith("int") else "float64"
+        projects = pd.Series([totals[dept] for dept in names], dtype=dtype, name="SpecialProjectsCount",
+                             index=pd.CategoricalIndex(names, categories=categories.categories, name="Department"))
+        return {
+            "employees": hr_metrics.dept_table(employees),
+            "projects": hr_metrics.project_table(projects),
+        }
+
+    # nilai skor asli per grup, dibulatkan di Python seperti score_distribution; rata-rata
+    # dari nilai x jumlah per grup (satu query per skor)
+    def scores(self, year, active=None):
+        where, params = self._active_where(year)
+        result = {}
+        for col, (low, high) in SCORE_COLUMNS.items():
+            rows = self.query(f"SELECT {_quote(col)}, COUNT(*) FROM {TABLE} WHERE {where} GROUP BY 1", params)
+            values = np.array([np.nan if v is None else v for v, _ in rows], dtype="float64")
+            counts = np.array([c for _, c in rows], dtype="int64")
+            rounded = np.round(values).astype(int)
+            keep = (rounded >= low) & (rounded <= high)
+            dist = pd.Series(counts[keep]).groupby(rounded[keep]).sum().sort_index()
+            dist = dist.rename_axis(col).rename("count")
+            scored = ~np.isnan(values)
+            total = counts[scored].sum()
+            result[col] = {
+                "counts": dist,
+                "mode": dist.index[dist.to_numpy().argmax()] if len(dist) else None,
+                "mean": (values[scored] * counts[scored]).sum() / total if total else np.nan,
+            }
+        return result
+
+    def term_reasons(self):
+        counts = self._value_counts("TermReason", "TermYear IS NOT NULL", {})
+        return hr_metrics.count_table(counts, ["Reason", "Count"])
+
+    # ===============================
+    # EMPLOYEE DIRECTORY
+    # ===============================
+    # filter dropdown (nilai "All" = tanpa filter) + pencarian nama (substring, case-insensitive,
+    # sama dengan NameSearchIndex.search) jadi satu WHERE
+    def _directory_where(self, filters, search=""):
+        clauses, params = [], []
+        for col, value in filters.items():
+            if value == "All":
+                continue
+            if col not in self.schema:
+                return "0", []
+            clauses.append(f"{_quote(col)} = ?")
+            params.append(value)
+        query = normalize_name(search) if search else ""
+        if query:
+            clauses.append("instr(name_key, ?) > 0")
+            params.append(query)
+        return " AND ".join(clauses) or "1", params
+
+    def options(self, column):
+        return self.categories(column)
+
+    def directory_count(self, filters, search=""):
+        where, params = self._directory_where(filters, search)
+        return self.query(f"SELECT COUNT(*) FROM {TABLE} WHERE {where}", params)[0][0]
+
+    # satu halaman hasil filter; urutan = sort_values(kind="stable"): nilai kosong di akhir,
+    # nilai sama tetap urut posisi baris
+    def _directory_sql(self, filters, search, sort_column, ascending, columns):
+        where, params = self._directory_where(filters, search)
+        order = "row_id"
+        if sort_column is not None:
+            col = _quote(sort_column)
+            order = f"{col} IS NULL, {col} {'ASC' if ascending else 'DESC'}, row_id"
+        select = ", ".join(["row_id", *(_quote(col) for col in (columns or self.columns))])
+        return f"SELECT {select} FROM {TABLE} WHERE {where} ORDER BY {order}", params
+
+    def directory_rows(self, filters, search="", sort_column=None, ascending=True, limit=MAX_TABLE_ROWS,
+                       offset=0, columns=None):
+        sql, params = self._directory_sql(filters, search, sort_column, ascending, columns)
+        return self.frame(f"{sql} LIMIT ? OFFSET ?", [*params, int(limit), int(offset)])
+
+    # seluruh hasil filter dengan urutan yang sama, per chunk (untuk export.py)
+    def directory_chunks(self, filters, search="", sort_column=None, ascending=True, columns=None,
+                         chunksize=DEFAULT_CHUNKSIZE):
+        sql, params = self._directory_sql(filters, search, sort_column, ascending, columns)
+        return self.frames(sql, params, chunksize)
+
+
+# ===============================
+# VERIFY
+# ===============================
+# bandingkan semua angka SQLEngine dengan MetricsEngine di frame pandas yang sama
+def _compare(name, left, right, problems):
+    try:
+        if isinstance(left, pd.DataFrame):
+            pd.testing.assert_frame_equal(left.reset_index(drop=True), right.reset_index(drop=True),
+                                          check_dtype=False, check_index_type=False, check_categorical=False,
+                                          check_column_type=False, rtol=1e-6)
+        elif isinstance(left, pd.Series):
+            pd.testing.assert_series_equal(left, right, check_dtype=False, check_index_type=False,
+                                           check_categorical=False, check_names=False, rtol=1e-6)
+        elif isinstance(left, dict):
+            for key in left:
+                _compare(f"{name}.{key}", left[key], right[key], problems)
+        elif isinstance(left, (float, np.floating)):
+            np.testing.assert_allclose(left, right, rtol=1e-6)
+        else:
+            assert left == right, f"{left!r} != {right!r}"
+    except AssertionError as exc:
+        problems.append(f"{name}: {str(exc).strip().splitlines()[0]}")
+
+
+def verify(sql_engine, df, sample_pages=3, page_size=24):
+    pandas_engine = MetricsEngine(df)
+    problems = []
+    _compare("years", pandas_engine.years(), sql_engine.years(), problems)
+    for year in pandas_engine.years():
+        active = pandas_engine.active_employees(year)
+        _compare(f"{year}.active", len(active), sql_engine.active_count(year), problems)
+        _compare(f"{year}.kpis", pandas_engine.kpis(year), sql_engine.kpis(year), problems)
+        expected, actual = pandas_engine.demographics(year, active), sql_engine.demographics(year)
+        _compare(f"{year}.gender", expected["gender"], actual["gender"], problems)
+        _compare(f"{year}.marital", expected["marital"], actual["marital"], problems)
+        _compare(f"{year}.age", expected["age"]["ages"]["Age"].sort_values(ignore_index=True),
+                 actual["age"]["ages"]["Age"].sort_values(ignore_index=True), problems)
+        _compare(f"{year}.age_range", expected["age"]["most_common_range"], actual["age"]["most_common_range"],
+                 problems)
+        _compare(f"{year}.departments", pandas_engine.departments(year, active), sql_engine.departments(year),
+                 problems)
+        _compare(f"{year}.scores", pandas_engine.scores(year, active), sql_engine.scores(year), problems)
+    for option in ["Weekly", "Monthly", "Quarterly", "Yearly"]:
+        _compare(f"trend.{option}", pandas_engine.turnover_trend(option), sql_engine.turnover_trend(option),
+                 problems)
+    _compare("term_reasons", pandas_engine.term_reasons(), sql_engine.term_reasons(), problems)
+
+    # directory: setiap nilai filter, satu pencarian nama, setiap kolom sort dua arah
+    cases = [{}]
+    for col in FILTER_COLUMNS:
+        if col in df.columns:
+            cases += [{col: value} for value in sql_engine.options(col)[:5]]
+    names = df["Employee_Name"].dropna()
+    search = str(names.iloc[len(names) // 2]).split()[0][:4] if len(names) else ""
+    columns = [col for col in ["EmpID", "Employee_Name", "Position", "Department", "Age", "TenureYears",
+                               "DateofHire", "DateofTermination", "MonthlyPay", "PerformanceScore",
+                               "EngagementSurvey"] if col in df.columns]
+    for filters in cases:
+        for query in ["", search]:
+            mask = pd.Series(True, index=df.index)
+            for col, value in filters.items():
+                mask &= df[col] == value
+            if query:
+                mask &= df["Employee_Name"].map(lambda n: normalize_name(query) in normalize_name(n)
+                                                if pd.notna(n) else False)
+            detail_df = df[mask]
+            label = f"directory{filters}{'+search' if query else ''}"
+            _compare(f"{label}.count", len(detail_df), sql_engine.directory_count(filters, query), problems)
+            for sort_column in columns:
+                for ascending in [True, False]:
+                    expected = detail_df.sort_values(sort_column, ascending=ascending, kind="stable")
+                    for page in range(min(sample_pages, -(-len(expected) // page_size))):
+                        rows = sql_engine.directory_rows(filters, query, sort_column, ascending, page_size,
+                                                         page * page_size)
+                        _compare(f"{label}.{sort_column}.{ascending}.page{page + 1}",
+                                 expected.index[page * page_size:(page + 1) * page_size].tolist(),
+                                 rows.index.tolist(), problems)
+    return problems
+
+
+# ===============================
+# CLI
+# ===============================
+def _format(source):
+    return "parquet" if source.split("?")[0].endswith(".parquet") else "csv"
+
+
+def build_command(args):
+    print(json.dumps(build(args.source, args.db, args.chunksize, _format(args.source)), indent=2))
+
+
+# angka dari SQLite dulu (memori proses = hasil query saja), baru frame pandas pembanding
+def verify_command(args):
+    engine = SQLEngine(args.db)
+    start = time.perf_counter()
+    years = engine.years()
+    for year in years:
+        engine.kpis(year)
+        engine.demographics(year)
+        engine.departments(year)
+        engine.scores(year)
+    engine.term_reasons()
+    page = engine.directory_rows({}, "", "MonthlyPay", False, 24)
+    sql_seconds = time.perf_counter() - start
+    sql_rss = peak_rss_mb()
+
+    df = prepare_data(pd.read_csv(args.source) if _format(args.source) == "csv" else pd.read_parquet(args.source),
+                      today=engine.meta["today"])
+    problems = verify(engine, df)
+    print(json.dumps({
+        "db": args.db,
+        "rows": engine.rows,
+        "years": len(years),
+        "sql_seconds_all_years": round(sql_seconds, 3),
+        "sql_peak_rss_mb": sql_rss,
+        "page_rows": len(page),
+        "mismatches": len(problems),
+        "problems": problems[:20],
+    }, indent=2))
+    return 1 if problems else 0
+
+
+def main():
+    from data_loader import CSV_URL
+
+    parser = argparse.ArgumentParser(description="Build or verify the SQLite storage backend (HR_SQLITE)")
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("--source", default=os.environ.get("HR_DATA_SOURCE", CSV_URL))
+    parser.add_argument("--db", default=os.environ.get("HR_SQLITE", "hr.sqlite"))
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+    return {"build": build_command, "verify": verify_command}[args.command](args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
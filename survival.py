@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# dimensi kurva retensi yang ditampilkan di dashboard
+GROUPINGS = {"Hire Cohort": "HireYear", "Department": "Department", "Position": "Position"}
+# titik retensi (bulan sejak hire) untuk tabel ringkasan / export
+MILESTONES = [12, 24, 36, 60, 120]
+
+
+# bulan penuh antara dua tanggal (hire -> keluar / tanggal acuan), vektor
+def months_between(start, end):
+    start, end = pd.DatetimeIndex(start), pd.DatetimeIndex(end)
+    months = (end.year - start.year) * 12 + (end.month - start.month)
+    return np.asarray(months - (end.day < start.day), dtype="float64")
+
+
+# ===============================
+# SURVIVAL ENGINE
+# ===============================
+# Kaplan-Meier per grup (cohort HireYear, Department, Position, ...) dengan resolusi bulan.
+# Durasi (bulan sejak hire) & event (keluar / masih bekerja = censored di tanggal acuan)
+# dihitung sekali per frame. Kurva semua grup sekaligus: satu bincount atas
+# (kode grup, bulan) lalu cumsum / cumprod per baris matriks, tanpa loop per grup.
+class SurvivalEngine:
+    def __init__(self, hire, term, as_of=None):
+        as_of = pd.Timestamp("today").normalize() if as_of is None else pd.Timestamp(as_of)
+        hire = pd.to_datetime(pd.Series(hire).reset_index(drop=True), errors="coerce")
+        term = pd.to_datetime(pd.Series(term).reset_index(drop=True), errors="coerce")
+        # keluar setelah tanggal acuan = masih bekerja pada tanggal acuan
+        event = (term.notna() & (term <= as_of)).to_numpy()
+        end = term.where(event, as_of)
+        durations = months_between(hire, end)
+        # hire kosong, hire di masa depan atau keluar sebelum hire tidak ikut dihitung
+        self.valid = ~np.isnan(durations) & (durations >= 0)
+        self.durations = np.where(self.valid, durations, 0).astype("int64")
+        self.event = event & self.valid
+        self.as_of = as_of
+        self.max_months = int(self.durations[self.valid].max()) if self.valid.any() else 0
+
+    @classmethod
+    def from_frame(cls, df, as_of=None):
+        return cls(df["DateofHire"], df["DateofTermination"], as_of)
+
+    # ===============================
+    # CURVES
+    # ===============================
+    # matriks grup x bulan: at_risk (masih bekerja di awal bulan m), events (keluar di
+    # bulan m) dan survival S(m) = peluang masih bekerja setelah m bulan
+    def _matrices(self, codes, n_groups):
+        width = self.max_months + 1
+        keep = self.valid & (codes >= 0)
+        cells = codes[keep] * width + self.durations[keep]
+        exits = np.bincount(cells, minlength=n_groups * width).reshape(n_groups, width)
+        events = np.bincount(cells, weights=self.event[keep], minlength=n_groups * width).reshape(n_groups, width)
+        # at risk di bulan m = semua yang durasinya >= m (cumsum dari kanan)
+        at_risk = exits[:, ::-1].cumsum(axis=1)[:, ::-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+        survival = np.cumprod(1.0 - hazard, axis=1)
+        # setelah tidak ada lagi yang diamati, kurva tidak terdefinisi
+        survival[at_risk == 0] = np.nan
+        return at_risk, events.astype("int64"), survival
+
+    def _codes(self, values):
+        if values is None:
+            return np.zeros(len(self.durations), dtype="int64"), pd.Index(["All"])
+        codes, groups = pd.factorize(pd.Series(values).reset_index(drop=True), sort=True)
+        return codes.astype("int64"), pd.Index(groups)
+
+    # survival per grup: DataFrame index = grup, kolom = bulan sejak hire (0..max)
+    def curves(self, values=None, max_months=None):
+        codes, groups = self._codes(values)
+        _, _, survival = self._matrices(codes, len(groups))
+        curves = pd.DataFrame(survival, index=groups, columns=pd.RangeIndex(self.max_months + 1, name="Months"))
+        if max_months is not None:
+            curves = curves.loc[:, :max_months]
+        return curves
+
+    # bentuk panjang (grup, bulan, at risk, events, survival) untuk export / tabel
+    def table(self, values=None, name="Group"):
+        codes, groups = self._codes(values)
+        at_risk, events, survival = self._matrices(codes, len(groups))
+        width = self.max_months + 1
+        table = pd.DataFrame({
+            name: np.repeat(groups.to_numpy(), width),
+            "Months": np.tile(np.arange(width), len(groups)),
+            "AtRisk": at_risk.ravel(),
+            "Events": events.ravel(),
+            "Survival": survival.ravel(),
+        })
+        return table[table["AtRisk"] > 0].reset_index(drop=True)
+
+    # retensi di bulan-bulan tertentu + median masa kerja (bulan saat S turun ke <= 50%)
+    def summary(self, values=None, name="Group", milestones=MILESTONES):
+        codes, groups = self._codes(values)
+        at_risk, _, survival = self._matrices(codes, len(groups))
+        summary = pd.DataFrame({name: groups, "Employees": at_risk[:, 0]})
+        for month in milestones:
+            summary[f"Retention_{month}m"] = survival[:, month] if month <= self.max_months else np.nan
+        below = np.nan_to_num(survival, nan=1.0) <= 0.5
+        summary["MedianMonths"] = np.where(below.any(axis=1), below.argmax(axis=1), np.nan)
+        return summary
+
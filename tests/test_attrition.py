@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from attrition import RiskModels  # noqa: E402
+from data_loader import prepare_data  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+def _frames():
+    df = prepare_data(make_hr_frame(300, seed=0))
+    # tanpa karyawan yang keluar model tidak bisa dilatih
+    return df, df.assign(DateofTermination=None)
+
+
+# versi yang gagal menampilkan error dan tidak dilatih ulang sebelum retry_after habis
+def test_failed_version_waits_for_retry():
+    df, bad = _frames()
+    models = RiskModels(retry_after=3600)
+    models.train_async(bad, "v1").join()
+    assert "v1" in models.failed("v1")
+    assert models.get(bad, "v1") is None
+    assert models.train_async(df, "v1") is None
+    assert models.failed("v2") is None
+
+
+def test_failed_version_retried_after_window():
+    df, bad = _frames()
+    models = RiskModels(retry_after=0)
+    models.train_async(bad, "v1").join()
+    models.train_async(df, "v1").join()
+    assert models.failed("v1") is None
+    assert models.get(df, "v1") is not None
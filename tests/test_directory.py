@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import numpy as np  # noqa: E402
+
+from attrition import RISK_COLUMN  # noqa: E402
+from data_loader import prepare_data  # noqa: E402
+from directory import render_cards  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+def _page():
+    df = prepare_data(make_hr_frame(200, seed=0))
+    return df[df["DateofTermination"].notna()].head(12)
+
+
+# karyawan yang sudah keluar tidak di-skor: satu halaman penuh tanpa risiko tetap dirender
+def test_render_cards_page_without_scores():
+    page = _page().assign(**{RISK_COLUMN: np.nan})
+    html = render_cards(page)
+    assert html.count("Attrition Risk") == 0
+    assert all(name in html for name in page["Employee_Name"].astype(str))
+
+
+def test_render_cards_mixed_scores():
+    page = _page().assign(**{RISK_COLUMN: np.nan})
+    page.iloc[0, page.columns.get_loc(RISK_COLUMN)] = 0.9
+    assert render_cards(page).count("Attrition Risk") == 1
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from data_loader import prepare_data  # noqa: E402
+from manager_index import ManagerIndex  # noqa: E402
+from synthetic import make_hr_frame  # noqa: E402
+
+
+# tahun sebelum tim ada: KPI NaN (delta tidak ditampilkan), bukan 0
+def test_team_kpis_missing_year_is_nan():
+    index = ManagerIndex(prepare_data(make_hr_frame(500, seed=0)))
+    manager = index.managers[0]
+    first_year = min(index.by_year)
+    assert index.team_kpis(manager, first_year - 1).isna().all()
+    assert index.team_kpis("No Such Manager", first_year).isna().all()
+    assert index.team_kpis(manager, max(index.by_year)).notna().any()
@@ -0,0 +1,106 @@
+import copy
+
+import pandas as pd
+
+# granularitas yang didukung; Y disimpan sebagai angka tahun, sisanya pandas Period
+FREQS = ["D", "W", "M", "Q", "Y"]
+PERIOD_OPTIONS = {"Weekly": "W", "Monthly": "M", "Quarterly": "Q", "Yearly": "Y"}
+DIMENSIONS = ["Department", "TermReason"]
+
+
+# ===============================
+# TURNOVER CUBE
+# ===============================
+# jumlah karyawan keluar per hari x Department x TermReason, plus rollup total per
+# minggu/bulan/kuartal/tahun. Ganti granularitas = ambil rollup yang sudah ada;
+# data termination baru cukup ditambahkan lewat append().
+class TurnoverCube:
+    def __init__(self, terminations, dimensions=DIMENSIONS):
+        self.dimensions = [dim for dim in dimensions if dim in terminations.columns]
+        self.daily = self._daily_counts(terminations)
+        self.rollups = {freq: self._rollup(self.daily, freq) for freq in FREQS}
+
+    @classmethod
+    def from_frame(cls, df, dimensions=DIMENSIONS):
+        return cls(df[df["DateofTermination"].notna()], dimensions)
+
+    # cube dari hitungan harian yang sudah jadi (Series index TermDate + dimensi, mis. hasil
+    # GROUP BY di sql_backend.py), tanpa frame termination
+    @classmethod
+    def from_daily(cls, daily):
+        cube = cls.__new__(cls)
+        cube.dimensions = [name for name in daily.index.names if name != "TermDate"]
+        cube.daily = daily.rename("Count")
+        cube.rollups = {freq: cls._rollup(cube.daily, freq) for freq in FREQS}
+        return cube
+
+    def _daily_counts(self, terminations):
+        frame = pd.DataFrame({"TermDate": pd.to_datetime(terminations["DateofTermination"]).dt.normalize()})
+        for dim in self.dimensions:
+            frame[dim] = terminations[dim].astype(object).fillna("(none)").to_numpy()
+        frame = frame[frame["TermDate"].notna()]
+        return frame.groupby(["TermDate"] + self.dimensions).size().rename("Count")
+
+    @staticmethod
+    def _rollup(daily, freq):
+        dates = daily.index.get_level_values("TermDate")
+        key = dates.year if freq == "Y" else dates.to_period(freq)
+        return daily.groupby(key).sum().rename("Count")
+
+    # ===============================
+    # QUERY
+    # ===============================
+    # series jumlah keluar per periode; filter dimensi dihitung dari cube harian
+    def counts(self, freq, **filters):
+        if not filters:
+            return self.rollups[freq]
+        daily = self.daily
+        for dim, value in filters.items():
+            daily = daily[daily.index.get_level_values(dim) == value]
+        return self._rollup(daily, freq)
+
+    # bentuk tabel yang dipakai chart Turnover Trend di dashboard
+    def trend(self, period_option, **filters):
+        freq = PERIOD_OPTIONS[period_option]
+        counts = self.counts(freq, **filters)
+        if freq == "Y":
+            trend = pd.DataFrame({"Year": counts.index.astype(int), "Jumlah_Turnover": counts.to_numpy()})
+        else:
+            trend = pd.DataFrame({"TermDate": counts.index.start_time, "Jumlah_Turnover": counts.to_numpy()})
+        return trend
+
+    def breakdown(self, freq, dimension):
+        dates = self.daily.index.get_level_values("TermDate")
+        key = dates.year if freq == "Y" else dates.to_period(freq)
+        return self.daily.groupby([key, self.daily.index.get_level_values(dimension)]).sum().unstack(fill_value=0)
+
+    # ===============================
+    # INCREMENTAL APPEND
+    # ===============================
+    def append(self, terminations):
+        return self._merge(terminations, 1)
+
+    # termination yang dibatalkan / diubah: dikurangkan, periode yang jadi nol dibuang
+    def remove(self, terminations):
+        return self._merge(terminations, -1)
+
+    def _merge(self, terminations, sign):
+        terminations = terminations[terminations["DateofTermination"].notna()]
+        if terminations.empty:
+            return self
+        new_daily = self._daily_counts(terminations) * sign
+        self.daily = self._combine(self.daily, new_daily)
+        for freq in FREQS:
+            self.rollups[freq] = self._combine(self.rollups[freq], self._rollup(new_daily, freq))
+        return self
+
+    @staticmethod
+    def _combine(current, delta):
+        merged = current.add(delta, fill_value=0).astype("int64")
+        return merged[merged != 0].sort_index().rename("Count")
+
+    # salinan dangkal: append/remove mengganti Series, bukan mengubah isinya
+    def copy(self):
+        other = copy.copy(self)
+        other.rollups = dict(self.rollups)
+        return other